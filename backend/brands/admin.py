@@ -1,8 +1,24 @@
 from django.contrib import admin
-from .models import Brand
+from .models import Brand, BrandDeletion, FetchJob
 
 @admin.register(Brand)
 class BrandAdmin(admin.ModelAdmin):
-    list_display = ['name', 'category', 'website', 'created_at']
+    list_display = ['name', 'category', 'website', 'created_at', 'deleted_at']
     list_filter = ['category', 'created_at']
     search_fields = ['name', 'website']
+    
+    def get_queryset(self, request):
+        # Include deleted brands that are still being purged
+        return Brand.all_objects.all()
+
+@admin.register(FetchJob)
+class FetchJobAdmin(admin.ModelAdmin):
+    list_display = ['brand', 'status', 'attempts', 'max_attempts', 'run_after', 'worker', 'finished_at']
+    list_filter = ['status']
+    search_fields = ['brand__name']
+
+@admin.register(BrandDeletion)
+class BrandDeletionAdmin(admin.ModelAdmin):
+    list_display = ['brand_name', 'brand_id', 'status', 'created_at', 'finished_at']
+    list_filter = ['status']
+    search_fields = ['brand_name']
@@ -3,10 +3,13 @@ Auto-fetch service for new brands.
 Automatically fetches real data from the internet when a brand is created.
 """
 from datetime import date
-from integrations.services import SerpAPIService
+from django.db import transaction
+from integrations.concurrency import provider_slot, run_concurrently
+from integrations.scheduler import SerpAPICreditScheduler
 from rankings.models import SearchRanking
 from citations.models import AICitation
 from reviews.models import Review
+from socialbooster.bulk import upsert_rows
 
 
 # Category to keyword mapping for generating relevant search terms
@@ -41,7 +44,7 @@ def generate_keywords(brand_name: str, category: str) -> list:
     category_terms = CATEGORY_KEYWORDS.get(category, CATEGORY_KEYWORDS['other'])
     
     # Combine brand name with category terms
-    for term in category_terms[:2]:  # Limit to 2 category terms to save API credits
+    for term in category_terms:
         keywords.append(f"{brand_name} {term}")
     
     # Add "best" query for competitive analysis
@@ -55,57 +58,31 @@ def auto_fetch_rankings(brand):
     """
     Fetch real Google search rankings for a brand.
     
+    The brand's keywords are registered with the SerpAPI credit scheduler,
+    which searches as many of them now as the budget allows (in parallel,
+    within the SerpAPI concurrency limit). The rest are picked up by the
+    scheduled `run_ranking_scheduler` command.
+    
     Args:
         brand: Brand model instance
         
     Returns:
         dict with results summary
     """
-    service = SerpAPIService()
+    scheduler = SerpAPICreditScheduler()
     keywords = generate_keywords(brand.name, brand.category)
-    results = []
     
-    for keyword in keywords:
-        try:
-            result = service.check_brand_position(brand.name, keyword)
-            
-            if result.get('found') and result.get('position'):
-                # Save the ranking
-                SearchRanking.objects.update_or_create(
-                    brand=brand,
-                    keyword=keyword,
-                    date=date.today(),
-                    defaults={'position': result['position']}
-                )
-                results.append({
-                    'keyword': keyword,
-                    'position': result['position'],
-                    'success': True
-                })
-            else:
-                # Brand not found in top results, save with high position
-                SearchRanking.objects.update_or_create(
-                    brand=brand,
-                    keyword=keyword,
-                    date=date.today(),
-                    defaults={'position': 100}  # Not in top 100
-                )
-                results.append({
-                    'keyword': keyword,
-                    'position': None,
-                    'success': True,
-                    'note': 'Brand not found in top 100 results'
-                })
-        except Exception as e:
-            results.append({
-                'keyword': keyword,
-                'success': False,
-                'error': str(e)
-            })
+    # The brand name itself matters most; category phrases come after it
+    scheduler.track(brand, keywords[:1], importance=2)
+    scheduler.track(brand, keywords[1:])
+    
+    summary = scheduler.run(brand_ids=[brand.id])
+    results = [r for r in summary['results'] if r['brand_id'] == brand.id]
     
     return {
         'rankings_fetched': len([r for r in results if r.get('success')]),
         'total_keywords': len(keywords),
+        'queued_keywords': len(keywords) - len(results),
         'results': results
     }
 
@@ -120,9 +97,11 @@ def auto_fetch_citations(brand):
     Returns:
         dict with results summary
     """
+    from integrations.brand_matcher import BrandMatcher
     from integrations.gemini_service import GeminiService
     
     gemini_service = GeminiService()
+    matcher = BrandMatcher.for_brand(brand)
     
     # Query templates to check if the brand is mentioned
     query_templates = [
@@ -133,59 +112,65 @@ def auto_fetch_citations(brand):
     citations_created = 0
     mentions_found = 0
     
-    for query in query_templates:
+    def check(query):
         try:
-            # Check with Gemini API
-            result = gemini_service.check_brand_citation(brand.name, query)
-            
-            mentioned = result.get('mentioned', False)
-            context = result.get('citation_context', 'Unable to check')
-            
-            if mentioned:
-                mentions_found += 1
-            
-            # Save the citation result for Gemini
-            AICitation.objects.update_or_create(
-                brand=brand,
-                ai_model='gemini',
-                query=query,
-                date=date.today(),
-                defaults={
-                    'mentioned': mentioned,
-                    'citation_context': context
-                }
-            )
-            citations_created += 1
-            
+            # Ambiguous answers are verified in one batch below
+            return gemini_service.check_brand_citation(brand.name, query, matcher=matcher, defer_verify=True)
         except Exception as e:
-            # Create a placeholder entry on error
-            AICitation.objects.update_or_create(
-                brand=brand,
-                ai_model='gemini',
-                query=query,
-                date=date.today(),
-                defaults={
-                    'mentioned': False,
-                    'citation_context': f'Error checking: {str(e)}'
-                }
-            )
-            citations_created += 1
-    
-    # Create placeholder entries for other AI models (not implemented yet)
+            return {'mentioned': False, 'citation_context': f'Error checking: {str(e)}'}
+    
+    # Prompts are independent: ask them in parallel within the Gemini concurrency limit
+    results = run_concurrently([lambda query=query: check(query) for query in query_templates], provider='gemini')
+    checks = list(zip(query_templates, results))
+    
+    try:
+        with provider_slot('gemini'):
+            gemini_service.resolve_verifications([(brand.name, result) for _, result in checks])
+    except Exception as e:
+        for _, result in checks:
+            if result.get('needs_verification'):
+                result.update(mentioned=False, citation_context=f'Error checking: {str(e)}')
+    
+    rows = []
+    for query, result in checks:
+        mentioned = result.get('mentioned', False)
+        context = result.get('citation_context', 'Unable to check')
+        
+        if mentioned:
+            mentions_found += 1
+        
+        # Save the citation result for Gemini
+        rows.append({
+            'brand_id': brand.id,
+            'ai_model': 'gemini',
+            'query': query,
+            'mentioned': mentioned,
+            'citation_context': context,
+            'date': date.today(),
+        })
+    citations_created += len(rows)
+    
+    # Create placeholder entries for other AI models (not implemented yet);
+    # ignore_conflicts keeps any real results already stored for today
     other_models = ['chatgpt', 'perplexity']
-    for ai_model in other_models:
-        for query in query_templates:
-            AICitation.objects.get_or_create(
-                brand=brand,
-                ai_model=ai_model,
-                query=query,
-                date=date.today(),
-                defaults={
-                    'mentioned': False,
-                    'citation_context': f'Pending - {ai_model.upper()} API not configured'
-                }
-            )
-            citations_created += 1
+    placeholders = [
+        {
+            'brand_id': brand.id,
+            'ai_model': ai_model,
+            'query': query,
+            'mentioned': False,
+            'citation_context': f'Pending - {ai_model.upper()} API not configured',
+            'date': date.today(),
+        }
+        for ai_model in other_models
+        for query in query_templates
+    ]
+    citations_created += len(placeholders)
+    
+    # All of the stage's rows land together
+    with transaction.atomic():
+        upsert_rows(AICitation, rows)
+        upsert_rows(AICitation, placeholders, ignore_conflicts=True)
     
     return {
         'citations_created': citations_created,
@@ -206,42 +191,21 @@ def auto_fetch_reviews(brand):
         dict with results summary
     """
     platforms = ['google', 'trustpilot', 'g2']
-    reviews_created = 0
-    
-    for platform in platforms:
-        Review.objects.get_or_create(
-            brand=brand,
-            platform=platform,
-            date=date.today(),
-            defaults={
-                'rating': 0.0,  # Will be updated when actually scraped
-                'review_count': 0
-            }
-        )
-        reviews_created += 1
+    
+    # Placeholders never overwrite a review already recorded for today
+    upsert_rows(Review, [
+        {
+            'brand_id': brand.id,
+            'platform': platform,
+            'rating': 0.0,  # Will be updated when actually scraped
+            'review_count': 0,
+            'date': date.today(),
+        }
+        for platform in platforms
+    ], ignore_conflicts=True)
+    reviews_created = len(platforms)
     
     return {
         'reviews_created': reviews_created,
         'platforms_added': len(platforms)
     }
-
-
-def auto_fetch_brand_data(brand):
-    """
-    Orchestrate all data fetching for a new brand.
-    
-    Args:
-        brand: Brand model instance
-        
-    Returns:
-        dict with all results
-    """
-    results = {
-        'brand_id': brand.id,
-        'brand_name': brand.name,
-        'rankings': auto_fetch_rankings(brand),
-        'citations': auto_fetch_citations(brand),
-        'reviews': auto_fetch_reviews(brand),
-    }
-    
-    return results
@@ -0,0 +1,157 @@
+"""
+Bulk brand import for POST /api/brands/import/.
+
+Rows arrive as CSV or a JSON array and are handled in chunks: each chunk is
+validated in one pass, deduplicated by (name, website) against the file and
+the database, inserted with one bulk_create, and its enrichment jobs are
+queued with staggered start times so a large import drains as a paced
+backlog. import_brands yields one result per row, so results can be
+streamed back while later chunks are still being written.
+"""
+import csv
+import io
+import json
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import Lower
+from rest_framework.parsers import BaseParser
+from .jobs import enqueue_fetches
+from .models import Brand
+from .serializers import BrandSerializer
+
+CHUNK_SIZE = 500
+
+
+class BrandImportError(ValueError):
+    """The payload could not be read as a list of brand rows."""
+
+
+class CSVParser(BaseParser):
+    """Accepts a raw text/csv request body; request.data is the decoded text."""
+    media_type = 'text/csv'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream.read().decode('utf-8-sig') if stream else ''
+
+
+def parse_rows(content, fmt: str) -> list:
+    """
+    Read an uploaded file or request body into a list of row dicts.
+
+    Args:
+        content: str or bytes, or JSON the request parser already decoded
+        fmt: 'csv' or 'json'
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+    if isinstance(content, (list, dict)):
+        rows = content  # Already parsed by the JSON parser
+    elif fmt == 'csv':
+        reader = csv.DictReader(io.StringIO(content))
+        if not reader.fieldnames or 'name' not in reader.fieldnames:
+            raise BrandImportError('CSV needs a header row with at least a "name" column')
+        # Blank cells mean "not given", so model defaults apply
+        return [{key: value for key, value in row.items() if key and value not in (None, '')} for row in reader]
+    else:
+        try:
+            rows = json.loads(content)
+        except json.JSONDecodeError as e:
+            raise BrandImportError(f'Invalid JSON: {e}')
+    if isinstance(rows, dict):
+        rows = rows.get('brands') or rows.get('rows')
+    if not isinstance(rows, list):
+        raise BrandImportError('Expected a JSON array of brands')
+    return rows
+
+
+def normalize_website(url: str) -> str:
+    """Compare websites without scheme, www. or a trailing slash."""
+    url = (url or '').strip().lower()
+    for prefix in ('https://', 'http://', 'www.'):
+        if url.startswith(prefix):
+            url = url[len(prefix):]
+    return url.rstrip('/')
+
+
+def dedupe_key(name: str, website: str) -> tuple:
+    return (' '.join(name.lower().split()), normalize_website(website))
+
+
+def _existing(keys: set) -> dict:
+    """Ids of brands already stored under any of the given (name, website) keys."""
+    found = {}
+    brands = Brand.objects.annotate(lower_name=Lower('name')).filter(
+        lower_name__in={name for name, _ in keys}
+    ).order_by('id').values_list('id', 'name', 'website')
+    for brand_id, name, website in brands:
+        found.setdefault(dedupe_key(name, website), brand_id)
+    return found
+
+
+def import_brands(rows: list, fetch: bool = True, spacing: float = None):
+    """
+    Validate, dedupe and insert brand rows, chunk by chunk.
+
+    Args:
+        rows: Row dicts (name, category, website, aliases)
+        fetch: Queue auto-fetch jobs for the new brands
+        spacing: Seconds between queued jobs' start times
+            (default: settings.FETCH_IMPORT_SPACING_SECONDS)
+
+    Yields:
+        One result dict per row, in order: {'index', 'status', ...} where
+        status is created, exists (already stored), duplicate (repeats an
+        earlier row) or error
+    """
+    spacing = settings.FETCH_IMPORT_SPACING_SECONDS if spacing is None else spacing
+    seen = {}  # dedupe key -> index of the first row with it
+    queued = 0
+
+    for start in range(0, len(rows), CHUNK_SIZE):
+        chunk = rows[start:start + CHUNK_SIZE]
+        results = {}
+        pending = []  # (index, key, validated data)
+
+        for index, row in enumerate(chunk, start=start):
+            if not isinstance(row, dict):
+                results[index] = {'index': index, 'status': 'error', 'errors': {'row': ['Expected an object']}}
+                continue
+            serializer = BrandSerializer(data=row)
+            if not serializer.is_valid():
+                results[index] = {'index': index, 'status': 'error', 'errors': serializer.errors}
+            else:
+                data = serializer.validated_data
+                key = dedupe_key(data['name'], data.get('website', ''))
+                if key in seen:
+                    results[index] = {'index': index, 'status': 'duplicate', 'duplicate_of': seen[key]}
+                else:
+                    seen[key] = index
+                    pending.append((index, key, data))
+
+        existing = _existing({key for _, key, _ in pending}) if pending else {}
+        new = []
+        for index, key, data in pending:
+            if key in existing:
+                results[index] = {'index': index, 'status': 'exists', 'id': existing[key]}
+            else:
+                new.append((index, Brand(**data)))
+
+        with transaction.atomic():
+            brands = Brand.objects.bulk_create([brand for _, brand in new])
+            jobs = enqueue_fetches(brands, spacing=spacing, offset=queued * spacing) if fetch else []
+        queued += len(jobs)
+
+        for position, (index, brand) in enumerate(new):
+            results[index] = {'index': index, 'status': 'created', 'id': brand.id}
+            if jobs:
+                results[index]['fetch_job_id'] = jobs[position].id
+
+        for index in range(start, start + len(chunk)):
+            yield results[index]
+
+
+def summarize(results: list) -> dict:
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    return {'total': len(results), 'counts': counts}
@@ -0,0 +1,272 @@
+"""
+Background executor for brand onboarding auto-fetch.
+
+Every new brand gets a FetchJob row. A fixed-size thread pool per process
+runs jobs; each job runs its rankings, citations and reviews stages
+concurrently and records each stage's outcome on the row, so progress
+survives the process. Failed stages are retried with exponential backoff.
+Jobs orphaned by a recycled worker (stale heartbeat) and jobs that were
+never started are picked up by the `run_fetch_jobs` command.
+"""
+import heapq
+import itertools
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from functools import partial
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from integrations import metrics
+from integrations.concurrency import run_in_thread
+from .auto_fetch import auto_fetch_rankings, auto_fetch_citations, auto_fetch_reviews
+from .models import FetchJob
+
+logger = logging.getLogger(__name__)
+
+# Stage name -> fetch function, in the order they run
+STAGES = {
+    'rankings': auto_fetch_rankings,
+    'citations': auto_fetch_citations,
+    'reviews': auto_fetch_reviews,
+}
+
+
+def worker_name() -> str:
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+class FetchExecutor:
+    """
+    Per-process pool of FETCH_WORKERS threads plus one timer thread.
+
+    Runs fetch jobs and other onboarding housekeeping (brand purges).
+    Delayed submissions (retry backoff, paced imports) wait in a heap on
+    the timer thread instead of holding a pool thread or a Timer each.
+    """
+
+    def __init__(self, max_workers: int):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fetch-job')
+        self._delayed = []
+        self._sequence = itertools.count()
+        self._wakeup = threading.Condition()
+        self._timer = None
+
+    def submit(self, job_id: int, delay: float = 0):
+        """Run a fetch job now, or once `delay` seconds have passed."""
+        return self.submit_call(partial(run_job_in_thread, job_id), delay)
+
+    def submit_call(self, call, delay: float = 0):
+        """Run a zero-argument callable on the pool, now or after `delay` seconds."""
+        if delay <= 0:
+            return self.pool.submit(call)
+        with self._wakeup:
+            heapq.heappush(self._delayed, (time.monotonic() + delay, next(self._sequence), call))
+            if self._timer is None:
+                self._timer = threading.Thread(target=self._release_due, name='fetch-job-timer', daemon=True)
+                self._timer.start()
+            self._wakeup.notify()
+        return None
+
+    def _release_due(self):
+        with self._wakeup:
+            while True:
+                while self._delayed and self._delayed[0][0] <= time.monotonic():
+                    _, _, call = heapq.heappop(self._delayed)
+                    self.pool.submit(call)
+                timeout = self._delayed[0][0] - time.monotonic() if self._delayed else None
+                self._wakeup.wait(timeout)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> FetchExecutor:
+    """The process-wide executor, created on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = FetchExecutor(settings.FETCH_WORKERS)
+        return _executor
+
+
+def enqueue_fetch(brand, delay: float = 0) -> FetchJob:
+    """
+    Persist an auto-fetch job for a brand and hand it to this process's executor.
+
+    The job is submitted once the surrounding transaction commits, so the
+    worker always sees the row. With FETCH_JOBS_AUTO_START off the job just
+    waits for `run_fetch_jobs`.
+    """
+    return enqueue_fetches([brand], offset=delay)[0]
+
+
+def enqueue_fetches(brands: list, spacing: float = 0, offset: float = 0) -> list:
+    """
+    Queue auto-fetch jobs for many brands at once, as a paced backlog.
+
+    The i-th job becomes due `offset + i * spacing` seconds from now, so a
+    large import is enriched a few brands at a time instead of all at once.
+
+    Returns:
+        The created FetchJob rows, in the order of `brands`
+    """
+    now = timezone.now()
+    delays = [offset + i * spacing for i in range(len(brands))]
+    jobs = FetchJob.objects.bulk_create([
+        FetchJob(
+            brand=brand,
+            run_after=now + timedelta(seconds=delay),
+            max_attempts=settings.FETCH_JOB_MAX_ATTEMPTS,
+            stages={name: {'status': FetchJob.PENDING} for name in STAGES},
+        )
+        for brand, delay in zip(brands, delays)
+    ])
+    if jobs:
+        metrics.incr('fetch_jobs.enqueued', len(jobs))
+    if jobs and settings.FETCH_JOBS_AUTO_START:
+        def submit():
+            executor = get_executor()
+            for job, delay in zip(jobs, delays):
+                executor.submit(job.id, delay)
+        transaction.on_commit(submit)
+    return jobs
+
+
+def run_job_in_thread(job_id: int):
+    """run_job for pool threads: logs crashes and closes the thread's DB connection."""
+    try:
+        return run_job(job_id)
+    except Exception:
+        logger.exception('Fetch job %s crashed', job_id)
+    finally:
+        # Pool threads outlive the request; don't leave their connections open
+        connection.close()
+
+
+def _save_stage(job: FetchJob, name: str, **state):
+    job.stages[name] = {**job.stages.get(name, {}), **state}
+    FetchJob.objects.filter(id=job.id).update(stages=job.stages, heartbeat_at=timezone.now())
+
+
+def _stage_summary(result) -> dict:
+    # Per-keyword detail stays out of the job row
+    return {key: value for key, value in (result or {}).items() if key != 'results'}
+
+
+def run_job(job_id: int):
+    """
+    Claim a due pending job and run its unfinished stages.
+
+    Unfinished stages run concurrently; ones that already succeeded on an
+    earlier attempt are skipped.
+
+    Returns:
+        The job's new status, or None if it wasn't claimable (already taken,
+        not due yet, finished or deleted)
+    """
+    now = timezone.now()
+    claimed = FetchJob.objects.filter(id=job_id, status=FetchJob.PENDING, run_after__lte=now).update(
+        status=FetchJob.RUNNING, attempts=F('attempts') + 1, worker=worker_name(),
+        started_at=now, heartbeat_at=now,
+    )
+    if not claimed:
+        return None
+
+    job = FetchJob.objects.select_related('brand').get(id=job_id)
+    if job.brand.deleted_at:
+        # Deleted while queued; its purge removes this job too
+        FetchJob.objects.filter(id=job.id).update(
+            status=FetchJob.FAILED, last_error='Brand was deleted', finished_at=timezone.now()
+        )
+        return FetchJob.FAILED
+    pending = [name for name in STAGES if job.stages.get(name, {}).get('status') != FetchJob.SUCCEEDED]
+    started = timezone.now().isoformat()
+    for name in pending:
+        _save_stage(job, name, status=FetchJob.RUNNING, started_at=started)
+
+    # Stages are independent and run concurrently; progress is recorded from this thread as each one ends
+    with ThreadPoolExecutor(max_workers=len(pending) or 1, thread_name_prefix='fetch-stage') as executor:
+        futures = {executor.submit(run_in_thread, partial(STAGES[name], job.brand)): name for name in pending}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.warning('Fetch job %s: %s stage failed: %s', job.id, name, e)
+                _save_stage(job, name, status=FetchJob.FAILED, error=str(e), finished_at=timezone.now().isoformat())
+            else:
+                _save_stage(
+                    job, name, status=FetchJob.SUCCEEDED, result=_stage_summary(result), error='',
+                    finished_at=timezone.now().isoformat(),
+                )
+
+    return _finish(job)
+
+
+def _finish(job: FetchJob) -> str:
+    errors = [
+        f"{name}: {state.get('error', '')}"
+        for name, state in job.stages.items() if state.get('status') != FetchJob.SUCCEEDED
+    ]
+    now = timezone.now()
+    update = {'last_error': '; '.join(errors), 'heartbeat_at': now}
+
+    if not errors:
+        update.update(status=FetchJob.SUCCEEDED, finished_at=now)
+    elif job.attempts < job.max_attempts:
+        delay = settings.FETCH_RETRY_BASE_SECONDS * 2 ** (job.attempts - 1)
+        update.update(status=FetchJob.PENDING, run_after=now + timedelta(seconds=delay))
+    else:
+        update.update(status=FetchJob.FAILED, finished_at=now)
+
+    FetchJob.objects.filter(id=job.id).update(**update)
+    if update['status'] == FetchJob.PENDING:
+        metrics.incr('fetch_jobs.retried')
+        if settings.FETCH_JOBS_AUTO_START:
+            get_executor().submit(job.id, delay)
+    else:
+        metrics.incr(f"fetch_jobs.{update['status']}")
+    return update['status']
+
+
+def recover_stale_jobs() -> int:
+    """Requeue running jobs whose worker stopped heartbeating (e.g. a recycled gunicorn worker)."""
+    cutoff = timezone.now() - timedelta(seconds=settings.FETCH_JOB_STALE_SECONDS)
+    return FetchJob.objects.filter(status=FetchJob.RUNNING, heartbeat_at__lt=cutoff).update(
+        status=FetchJob.PENDING, run_after=timezone.now(), worker=''
+    )
+
+
+def due_jobs(limit: int = None) -> list:
+    """Ids of pending jobs whose run_after has passed, oldest first."""
+    ids = FetchJob.objects.filter(
+        status=FetchJob.PENDING, run_after__lte=timezone.now()
+    ).order_by('run_after', 'id').values_list('id', flat=True)
+    return list(ids[:limit] if limit else ids)
+
+
+def job_status(job: FetchJob) -> dict:
+    """Progress report for GET /api/brands/<id>/fetch-status/."""
+    stages = {name: job.stages.get(name, {'status': FetchJob.PENDING}) for name in STAGES}
+    done = sum(1 for state in stages.values() if state.get('status') == FetchJob.SUCCEEDED)
+    return {
+        'job_id': job.id,
+        'brand_id': job.brand_id,
+        'status': job.status,
+        'progress': f'{done}/{len(stages)}',
+        'stages': stages,
+        'attempts': job.attempts,
+        'max_attempts': job.max_attempts,
+        'last_error': job.last_error,
+        'next_attempt_at': job.run_after if job.status == FetchJob.PENDING else None,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+    }
@@ -0,0 +1,66 @@
+"""
+Management command reporting what API response compression buys and costs.
+Each endpoint is rendered once, then compressed with every available
+encoding (gzip, and brotli when installed); the report shows compressed
+size, bytes saved and CPU milliseconds per response. Load data first with
+generate_load_data.
+"""
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.urls import resolve
+from brands.models import Brand
+from socialbooster.middleware.compression import available_encodings, compress
+
+
+class Command(BaseCommand):
+    help = 'Benchmark gzip/brotli compression of API responses: bytes saved and CPU cost'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--paths', type=str, default='',
+            help='Comma-separated API paths (default: citations, rankings trends, dashboard export)',
+        )
+        parser.add_argument('--gzip-level', type=int, default=None, help='gzip level (default: GZIP_LEVEL)')
+        parser.add_argument('--brotli-quality', type=int, default=None, help='brotli quality (default: BROTLI_QUALITY)')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per encoding; the best is kept (default: 5)')
+
+    def handle(self, *args, **options):
+        paths = [path.strip() for path in options['paths'].split(',') if path.strip()]
+        if not paths:
+            brand = Brand.objects.order_by('id').first()
+            if brand is None:
+                raise CommandError('No brands to benchmark; run generate_load_data first')
+            paths = ['/api/citations/', f'/api/rankings/trends/{brand.id}/', f'/api/dashboard/export/?brand={brand.id}']
+        levels = {'gzip': options['gzip_level'], 'br': options['brotli_quality']}
+
+        self.stdout.write(f'{"path":<40} {"encoding":<8} {"bytes":>12} {"saved":>7} {"cpu ms":>8}')
+        for path in paths:
+            content = self._render(path)
+            self.stdout.write(f'{path:<40} {"identity":<8} {len(content):>12,}')
+            for encoding in available_encodings():
+                compressed, cpu = self._best(content, encoding, levels[encoding], options['repeat'])
+                saved = 1 - len(compressed) / len(content) if content else 0
+                self.stdout.write(f'{"":<40} {encoding:<8} {len(compressed):>12,} {saved:>7.1%} {cpu * 1000:>8.2f}')
+
+    def _render(self, path: str) -> bytes:
+        # Paginated responses build absolute links, so use a host the site accepts
+        host = next((host for host in settings.ALLOWED_HOSTS if host not in ('', '*') and host[0] != '.'), 'localhost')
+        request = RequestFactory().get(path, HTTP_HOST=host)
+        match = resolve(request.path)
+        response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        if response.status_code != 200:
+            raise CommandError(f'{path} returned {response.status_code}')
+        return response.content
+
+    def _best(self, content: bytes, encoding: str, level, repeat: int):
+        best = None
+        for _ in range(max(1, repeat)):
+            started = time.process_time()
+            compressed = compress(content, encoding, level)
+            elapsed = time.process_time() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return compressed, best
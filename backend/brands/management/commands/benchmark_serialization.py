@@ -0,0 +1,74 @@
+"""
+Management command comparing list serialization speed before and after the
+fast read path (socialbooster.serialization). Each endpoint's queryset is
+serialized both ways, the outputs are checked to be byte-identical, and
+throughput is reported in rows/s. Load data first with generate_load_data.
+"""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from citations.views import AICitationViewSet
+from rankings.views import SearchRankingViewSet
+from reviews.views import ReviewViewSet
+from socialbooster.serialization import dumps, fast_plan
+
+VIEWSETS = {
+    'rankings': SearchRankingViewSet,
+    'citations': AICitationViewSet,
+    'reviews': ReviewViewSet,
+}
+
+
+class Command(BaseCommand):
+    help = 'Benchmark list serialization: DRF serializers vs the values()/orjson fast path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Rows per page (default: 500)')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per path; the best is kept (default: 5)')
+        parser.add_argument(
+            '--endpoints', type=str, default=','.join(VIEWSETS),
+            help=f'Comma-separated endpoints to benchmark (default: {",".join(VIEWSETS)})',
+        )
+
+    def handle(self, *args, **options):
+        endpoints = [name.strip() for name in options['endpoints'].split(',') if name.strip()]
+        unknown = set(endpoints) - set(VIEWSETS)
+        if unknown:
+            raise CommandError(f'Unknown endpoints: {", ".join(sorted(unknown))}')
+
+        for name in endpoints:
+            viewset = VIEWSETS[name]
+            queryset = viewset.queryset.all()
+            serializer_class = viewset.serializer_class
+            plan = fast_plan(serializer_class)
+            rows = options['rows']
+
+            def standard():
+                return JSONRenderer().render(serializer_class(queryset[:rows], many=True).data)
+
+            def fast():
+                return dumps(plan.represent(queryset.values(*plan.columns)[:rows]))
+
+            count = len(queryset[:rows])
+            if not count:
+                raise CommandError(f'No {name} to serialize; run generate_load_data first')
+            before, before_time = self._best(standard, options['repeat'])
+            after, after_time = self._best(fast, options['repeat'])
+            if before != after:
+                raise CommandError(f'{name}: fast output differs from the serializer output')
+
+            self.stdout.write(
+                f'{name:<10} {count} rows  serializer {count / before_time:>10,.0f} rows/s  '
+                f'fast {count / after_time:>10,.0f} rows/s  ({before_time / after_time:.1f}x)'
+            )
+
+        self.stdout.write(self.style.SUCCESS('✓ Outputs are byte-identical'))
+
+    def _best(self, run, repeat: int):
+        best = None
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            output = run()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return output, max(best, 1e-9)
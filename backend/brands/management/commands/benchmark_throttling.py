@@ -0,0 +1,63 @@
+"""
+Management command comparing per-request throttle overhead of DRF's
+timestamp-history SimpleRateThrottle and the GCRA throttles
+(socialbooster.throttling). A simulated client sends requests exactly at the
+allowed rate, so each check sees a full window and is admitted; the report
+shows microseconds per request and the size of the cached state per client.
+"""
+import pickle
+import time
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.request import Request
+from rest_framework.throttling import AnonRateThrottle
+from socialbooster.throttling import GCRAMixin
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-request throttle overhead: DRF timestamp history vs GCRA'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rate', type=str, default='1000/hour', help='Throttle rate (default: 1000/hour)')
+        parser.add_argument('--requests', type=int, default=2000, help='Throttle checks to time (default: 2000)')
+
+    def handle(self, *args, **options):
+        rate = options['rate']
+
+        class HistoryThrottle(AnonRateThrottle):
+            scope = 'benchmark'
+            cache_format = 'benchmark_history_%(scope)s_%(ident)s'
+
+        class GCRAThrottle(GCRAMixin, AnonRateThrottle):
+            scope = 'benchmark'
+            cache_format = 'benchmark_gcra_%(scope)s_%(ident)s'
+
+        HistoryThrottle.rate = GCRAThrottle.rate = rate
+        # Simulated clock: one request per allowed interval
+        clock = [time.time()]
+        HistoryThrottle.timer = GCRAThrottle.timer = staticmethod(lambda: clock[0])
+        request = Request(RequestFactory().get('/api/brands/', REMOTE_ADDR='203.0.113.7'))
+
+        for name, throttle_class in (('history', HistoryThrottle), ('gcra', GCRAThrottle)):
+            throttle = throttle_class()
+            interval = throttle.duration / throttle.num_requests
+            key = throttle.get_cache_key(request, None)
+            # Fill the client's window first
+            for _ in range(throttle.num_requests):
+                clock[0] += interval
+                throttle_class().allow_request(request, None)
+            state_bytes = len(pickle.dumps(cache.get(key)))
+
+            allowed, elapsed = 0, 0.0
+            for _ in range(options['requests']):
+                clock[0] += interval
+                started = time.perf_counter()
+                allowed += throttle_class().allow_request(request, None)
+                elapsed += time.perf_counter() - started
+            cache.delete(key)
+
+            self.stdout.write(
+                f'{name:<8} {rate}: {elapsed / options["requests"] * 1e6:>8.1f} µs/request  '
+                f'cached state {state_bytes:,} bytes per client  ({allowed} of {options["requests"]} allowed)'
+            )
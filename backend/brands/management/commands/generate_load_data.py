@@ -0,0 +1,181 @@
+"""
+Management command to generate a large synthetic dataset for performance testing.
+Values are generated with NumPy a chunk of brands at a time and written with
+COPY (PostgreSQL) or batched executemany INSERTs, so tens of millions of rows
+take minutes rather than hours. The same seed always produces the same data.
+"""
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from brands.auto_fetch import CATEGORY_KEYWORDS
+from brands.models import Brand
+from brands.purge import purge_brands
+from citations.models import AICitation
+from rankings.models import SearchRanking
+from reviews.models import Review
+from socialbooster.bulk import DEFAULT_BATCH_SIZE, bulk_insert
+
+NAME_PREFIX = 'Load Brand'
+REVIEW_PLATFORMS = ['google', 'g2', 'trustpilot', 'capterra']
+QUERY_TEMPLATES = [
+    'What is {name}?',
+    'Tell me about {name}',
+    'Is {name} a good choice?',
+    'Top features of {name}',
+]
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic brands, rankings, citations and reviews for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--brands', type=int, default=1000, help='Number of brands (default: 1000)')
+        parser.add_argument('--days', type=int, default=90, help='Days of history (default: 90)')
+        parser.add_argument(
+            '--keywords-per-brand', type=int, default=5,
+            help='Ranking keywords per brand (default: 5)',
+        )
+        parser.add_argument(
+            '--models', type=str, default=','.join(code for code, _ in AICitation.AI_MODEL_CHOICES),
+            help='Comma-separated AI models to generate citations for (default: all)',
+        )
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help=f'Rows per COPY / INSERT batch (default: {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--chunk-brands', type=int, default=200,
+            help='Brands generated per NumPy chunk; bounds memory use (default: 200)',
+        )
+        parser.add_argument(
+            '--clear', action='store_true',
+            help=f'Delete previously generated "{NAME_PREFIX}" brands (and their data) first',
+        )
+
+    def handle(self, *args, **options):
+        models = [m.strip() for m in options['models'].split(',') if m.strip()]
+        unknown = set(models) - {code for code, _ in AICitation.AI_MODEL_CHOICES}
+        if unknown:
+            raise CommandError(f'Unknown AI models: {", ".join(sorted(unknown))}')
+
+        generated = Brand.all_objects.filter(name__startswith=f'{NAME_PREFIX} ')
+        if options['clear']:
+            deleted = purge_brands(list(generated.values_list('id', flat=True)))
+            self.stdout.write(f'Deleted {deleted} previously generated rows')
+        elif generated.filter(name__startswith=f"{NAME_PREFIX} {options['seed']}-").exists():
+            raise CommandError(
+                f"Brands for seed {options['seed']} already exist; pass --clear or another --seed"
+            )
+
+        rng = np.random.default_rng(options['seed'])
+        self.now = timezone.now()
+        self.batch_size = options['batch_size']
+        days = options['days']
+        self.dates = [date.today() - timedelta(days=days - 1 - d) for d in range(days)]
+
+        started = time.monotonic()
+        brands = self._create_brands(rng, options['brands'], options['seed'])
+        totals = {'brands': len(brands), 'rankings': 0, 'citations': 0, 'reviews': 0}
+
+        for start in range(0, len(brands), options['chunk_brands']):
+            chunk = brands[start:start + options['chunk_brands']]
+            totals['rankings'] += self._rankings(rng, chunk, options['keywords_per_brand'])
+            totals['citations'] += self._citations(rng, chunk, models)
+            totals['reviews'] += self._reviews(rng, chunk)
+            self.stdout.write(f'  {start + len(chunk)}/{len(brands)} brands written')
+
+        elapsed = time.monotonic() - started
+        rows = sum(totals.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {rows:,} rows in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s): "
+            f"{totals['brands']:,} brands, {totals['rankings']:,} rankings, "
+            f"{totals['citations']:,} citations, {totals['reviews']:,} reviews"
+        ))
+
+    def _create_brands(self, rng, count: int, seed: int) -> list:
+        categories = [code for code, _ in Brand.CATEGORY_CHOICES]
+        picks = rng.integers(0, len(categories), count)
+        brands = Brand.objects.bulk_create([
+            Brand(
+                name=f'{NAME_PREFIX} {seed}-{i:07d}',
+                category=categories[picks[i]],
+                website=f'https://load-brand-{seed}-{i}.example.com',
+            )
+            for i in range(count)
+        ], batch_size=self.batch_size)
+        return [(brand.id, brand.name, brand.category) for brand in brands]
+
+    def _rankings(self, rng, brands, keywords_per_brand: int) -> int:
+        n_series, n_days = len(brands) * keywords_per_brand, len(self.dates)
+        # Each (brand, keyword) starts somewhere in the top 50 and drifts by a few places a day
+        base = rng.integers(1, 51, n_series)
+        drift = rng.integers(-2, 3, (n_series, n_days)).cumsum(axis=1)
+        positions = np.clip(base[:, None] + drift, 1, 100).tolist()
+
+        keywords = [
+            f'{name} {terms[k]}' if k < len(terms) else f'{name} keyword {k}'
+            for _, name, category in brands
+            for terms in [CATEGORY_KEYWORDS.get(category, CATEGORY_KEYWORDS['other'])]
+            for k in range(keywords_per_brand)
+        ]
+        brand_ids = [brand_id for brand_id, _, _ in brands for _ in range(keywords_per_brand)]
+
+        rows = (
+            (brand_ids[s], keywords[s], positions[s][d], '', self.dates[d], self.now)
+            for s in range(n_series)
+            for d in range(n_days)
+        )
+        return bulk_insert(
+            SearchRanking, ['brand_id', 'keyword', 'position', 'search_url', 'date', 'created_at'],
+            rows, self.batch_size
+        )
+
+    def _citations(self, rng, brands, models: list) -> int:
+        n_brands, n_models, n_days = len(brands), len(models), len(self.dates)
+        popularity = rng.beta(5, 2, n_brands)
+        model_bias = rng.uniform(-0.08, 0.08, n_models)
+        noise = rng.uniform(-0.1, 0.1, (n_brands, n_models, n_days))
+        mentioned = (rng.random((n_brands, n_models, n_days))
+                     < popularity[:, None, None] + model_bias[None, :, None] + noise).tolist()
+        templates = rng.integers(0, len(QUERY_TEMPLATES), (n_brands, n_models, n_days)).tolist()
+
+        rows = (
+            (
+                brand_id, model, QUERY_TEMPLATES[templates[b][m][d]].format(name=name),
+                mentioned[b][m][d],
+                f'{name} is a popular choice...' if mentioned[b][m][d] else 'Brand not mentioned',
+                self.dates[d], self.now
+            )
+            for b, (brand_id, name, _) in enumerate(brands)
+            for m, model in enumerate(models)
+            for d in range(n_days)
+        )
+        return bulk_insert(
+            AICitation, ['brand_id', 'ai_model', 'query', 'mentioned', 'citation_context', 'date', 'created_at'],
+            rows, self.batch_size
+        )
+
+    def _reviews(self, rng, brands) -> int:
+        n_series, n_days = len(brands) * len(REVIEW_PLATFORMS), len(self.dates)
+        base_rating = rng.uniform(3.5, 4.9, n_series)
+        ratings = np.clip(base_rating[:, None] + rng.normal(0, 0.05, (n_series, n_days)), 1, 5).round(1).tolist()
+        # Review counts only ever grow
+        counts = (rng.integers(100, 20000, n_series)[:, None]
+                  + rng.poisson(3, (n_series, n_days)).cumsum(axis=1)).tolist()
+
+        rows = (
+            (
+                brands[s // len(REVIEW_PLATFORMS)][0], REVIEW_PLATFORMS[s % len(REVIEW_PLATFORMS)],
+                Decimal(str(ratings[s][d])), counts[s][d], self.dates[d], self.now
+            )
+            for s in range(n_series)
+            for d in range(n_days)
+        )
+        return bulk_insert(
+            Review, ['brand_id', 'platform', 'rating', 'review_count', 'date', 'created_at'],
+            rows, self.batch_size
+        )
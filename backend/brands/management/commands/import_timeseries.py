@@ -0,0 +1,203 @@
+"""
+Management command to import historical rankings or review snapshots from a file.
+CSV and NDJSON exports are streamed row by row, brand names are resolved to
+ids from an in-memory map, and rows are upserted in batches (COPY into a
+staging table on PostgreSQL, executemany elsewhere).
+
+Expected columns:
+    rankings: brand, keyword, position, date[, search_url]
+    reviews:  brand, platform, rating, review_count, date
+"""
+import csv
+import json
+import time
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from brands.models import Brand
+from rankings.models import SearchRanking
+from reviews.models import Review
+from socialbooster.bulk import DEFAULT_BATCH_SIZE, merge_rows
+
+MAX_REPORTED_ERRORS = 10
+
+
+def _position(value):
+    position = int(value)
+    if not 1 <= position <= 100:
+        raise ValueError('position must be between 1 and 100')
+    return position
+
+
+def _rating(value):
+    try:
+        rating = Decimal(str(value))
+        # NaN would pass quantize() and then fail the range check with InvalidOperation
+        if not rating.is_finite():
+            raise InvalidOperation
+        rating = rating.quantize(Decimal('0.1'))
+    except InvalidOperation:
+        raise ValueError(f'invalid rating "{value}"')
+    if not 0 <= rating <= 5:
+        raise ValueError('rating must be between 0 and 5')
+    return rating
+
+
+def _platform(value):
+    if value not in dict(Review.PLATFORM_CHOICES):
+        raise ValueError(f'unknown platform "{value}"')
+    return value
+
+
+def _keyword(value):
+    keyword = str(value).strip()
+    if not keyword or len(keyword) > 300:
+        raise ValueError('keyword must be 1-300 characters')
+    return keyword
+
+
+def _date(value):
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+# kind -> (model, [(column, converter, default)]); default None means required
+KINDS = {
+    'rankings': (SearchRanking, [
+        ('keyword', _keyword, None),
+        ('position', _position, None),
+        ('date', _date, None),
+        ('search_url', str, ''),
+    ]),
+    'reviews': (Review, [
+        ('platform', _platform, None),
+        ('rating', _rating, None),
+        ('review_count', int, 0),
+        ('date', _date, None),
+    ]),
+}
+
+
+class Command(BaseCommand):
+    help = 'Import historical rankings or reviews from a CSV or NDJSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str, help='CSV or NDJSON file to import')
+        parser.add_argument('--kind', choices=sorted(KINDS), required=True, help='What the file contains')
+        parser.add_argument(
+            '--format', choices=['csv', 'ndjson'],
+            help='File format (default: from the file extension)',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help=f'Rows per COPY / executemany batch (default: {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--create-brands', action='store_true',
+            help='Create brands that do not exist yet instead of skipping their rows',
+        )
+        parser.add_argument(
+            '--keep-existing', action='store_true',
+            help='Leave rows already in the database untouched instead of updating them',
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f'File not found: {path}')
+
+        file_format = options['format'] or ('ndjson' if path.suffix in ('.ndjson', '.jsonl', '.json') else 'csv')
+        model, columns = KINDS[options['kind']]
+        self.create_brands = options['create_brands']
+        self.brand_ids = {name.lower(): pk for pk, name in Brand.objects.values_list('id', 'name')}
+        self.stats = {'read': 0, 'skipped': 0, 'unknown_brands': {}, 'errors': []}
+        self.now = timezone.now()
+
+        self.started = time.monotonic()
+        with open(path, encoding='utf-8', newline='') as f:
+            records = self._read_csv(f) if file_format == 'csv' else self._read_ndjson(f)
+            written = merge_rows(
+                model,
+                ['brand_id'] + [name for name, _, _ in columns] + ['created_at'],
+                self._rows(records, columns),
+                batch_size=options['batch_size'],
+                ignore_conflicts=options['keep_existing'],
+                on_batch=self._progress,
+            )
+
+        elapsed = time.monotonic() - self.started
+        for line, error in self.stats['errors']:
+            self.stdout.write(self.style.WARNING(f'  line {line}: {error}'))
+        if self.stats['unknown_brands']:
+            names = sorted(self.stats['unknown_brands'], key=self.stats['unknown_brands'].get, reverse=True)
+            self.stdout.write(self.style.WARNING(
+                f"  {len(names)} unknown brands skipped (use --create-brands): {', '.join(names[:5])}"
+            ))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Imported {written:,} {options['kind']} from {self.stats['read']:,} rows in {elapsed:.1f}s "
+            f"({written / max(elapsed, 1e-9):,.0f} rows/s), {self.stats['skipped']:,} skipped"
+        ))
+
+    def _read_csv(self, f):
+        for line, record in enumerate(csv.DictReader(f), start=2):
+            yield line, record
+
+    def _read_ndjson(self, f):
+        for line, text in enumerate(f, start=1):
+            if not text.strip():
+                continue
+            try:
+                yield line, json.loads(text)
+            except json.JSONDecodeError as e:
+                yield line, e
+
+    def _brand_id(self, name: str):
+        key = name.strip().lower()
+        if key in self.brand_ids:
+            return self.brand_ids[key]
+        if self.create_brands and key:
+            self.brand_ids[key] = Brand.objects.create(name=name.strip()).id
+            return self.brand_ids[key]
+        self.stats['unknown_brands'][name] = self.stats['unknown_brands'].get(name, 0) + 1
+        return None
+
+    def _skip(self, line: int, error: str):
+        self.stats['skipped'] += 1
+        if len(self.stats['errors']) < MAX_REPORTED_ERRORS:
+            self.stats['errors'].append((line, error))
+
+    def _rows(self, records, columns):
+        """Convert raw records to row tuples, skipping (and noting) bad ones."""
+        for line, record in records:
+            self.stats['read'] += 1
+            if not isinstance(record, dict):
+                self._skip(line, f'unreadable row: {record}')
+                continue
+
+            brand_id = self._brand_id(str(record.get('brand') or ''))
+            if brand_id is None:
+                self.stats['skipped'] += 1
+                continue
+
+            values = [brand_id]
+            try:
+                for name, convert, default in columns:
+                    raw = record.get(name)
+                    if raw in (None, ''):
+                        if default is None:
+                            raise ValueError(f'missing {name}')
+                        values.append(default)
+                    else:
+                        values.append(convert(raw))
+            except (TypeError, ValueError) as e:
+                self._skip(line, str(e))
+                continue
+
+            values.append(self.now)
+            yield tuple(values)
+
+    def _progress(self, processed: int):
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(f'  {processed:,} rows written ({processed / max(elapsed, 1e-9):,.0f} rows/s)')
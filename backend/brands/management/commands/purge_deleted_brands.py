@@ -0,0 +1,31 @@
+"""
+Management command that finishes purging deleted brands.
+Purges normally run in the web process right after the delete; this picks
+up ones that were interrupted (e.g. a recycled worker) or never started.
+"""
+from collections import Counter
+from django.core.management.base import BaseCommand
+from brands.purge import due_purges, run_purge
+
+
+class Command(BaseCommand):
+    help = 'Purge the history of deleted brands in chunks'
+
+    def handle(self, *args, **options):
+        deletion_ids = due_purges()
+        if not deletion_ids:
+            self.stdout.write('No brand purges pending')
+            return
+
+        self.stdout.write(f'Purging {len(deletion_ids)} deleted brands...')
+        outcomes = Counter()
+        for deletion_id in deletion_ids:
+            try:
+                outcomes[run_purge(deletion_id) or 'skipped'] += 1
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'  Purge {deletion_id} failed: {e}'))
+                outcomes['failed'] += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            '✓ ' + ', '.join(f'{count} {outcome}' for outcome, count in sorted(outcomes.items()))
+        ))
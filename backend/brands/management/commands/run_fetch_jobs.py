@@ -0,0 +1,51 @@
+"""
+Management command that runs due brand auto-fetch jobs.
+Schedule it (e.g. every few minutes) to pick up jobs that were queued while
+no web worker was running them, retries whose backoff has passed, and jobs
+orphaned by a recycled worker.
+"""
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from brands.jobs import run_job_in_thread, due_jobs, recover_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = 'Run pending brand auto-fetch jobs and recover orphaned ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Run at most this many jobs',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.FETCH_WORKERS,
+            help=f'Jobs run in parallel (default: FETCH_WORKERS={settings.FETCH_WORKERS})',
+        )
+
+    def handle(self, *args, **options):
+        recovered = recover_stale_jobs()
+        if recovered:
+            self.stdout.write(self.style.WARNING(f'Requeued {recovered} orphaned jobs'))
+
+        job_ids = due_jobs(limit=options['limit'])
+        if not job_ids:
+            self.stdout.write('No fetch jobs due')
+            return
+
+        self.stdout.write(f'Running {len(job_ids)} fetch jobs...')
+        if options['workers'] <= 1:
+            outcomes = [run_job(job_id) for job_id in job_ids]
+        else:
+            with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+                outcomes = list(executor.map(run_job_in_thread, job_ids))
+
+        counts = Counter(outcome or 'skipped' for outcome in outcomes)
+        self.stdout.write(self.style.SUCCESS(
+            '✓ ' + ', '.join(f'{count} {outcome}' for outcome, count in sorted(counts.items()))
+        ))
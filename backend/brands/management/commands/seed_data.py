@@ -19,7 +19,7 @@ class Command(BaseCommand):
         Review.objects.all().delete()
         AICitation.objects.all().delete()
         SearchRanking.objects.all().delete()
-        Brand.objects.all().delete()
+        Brand.all_objects.all().delete()
         
         self.stdout.write('Seeding database with REAL companies...')
         
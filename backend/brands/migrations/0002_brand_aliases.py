@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 01:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brands', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='brand',
+            name='aliases',
+            field=models.CharField(blank=True, help_text='Comma-separated alternative names (e.g. product names, former names)', max_length=500),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-19 01:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brands', '0003_fetchjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BrandDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('brand_id', models.PositiveIntegerField(db_index=True)),
+                ('brand_name', models.CharField(max_length=200)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('succeeded', 'Succeeded')], default='pending', max_length=20)),
+                ('progress', models.JSONField(blank=True, default=dict, help_text='Rows per related table: {"rankings.SearchRanking": {"total": ..., "deleted": ...}, ...}')),
+                ('last_error', models.TextField(blank=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='brand',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='Set when the brand is deleted; its history is purged in the background', null=True),
+        ),
+    ]
@@ -1,6 +1,26 @@
 from django.db import models
 
 
+class VisibleBrandManager(models.Manager):
+    """Brands that haven't been deleted; hidden ones wait for brands.purge to remove them."""
+    
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class VisibleBrandRowsManager(models.Manager):
+    """
+    Rows (rankings, citations, reviews) of brands that haven't been deleted.
+    
+    A deleted brand's history stays in its tables until brands.purge removes
+    it, so every read of that history goes through this manager. The
+    subquery (rather than a join) lets sparse fieldsets drop the brand table.
+    """
+    
+    def get_queryset(self):
+        return super().get_queryset().filter(brand__in=Brand.objects.all())
+
+
 class Brand(models.Model):
     """Brand model for tracking client brands."""
     
@@ -17,11 +37,97 @@ class Brand(models.Model):
     name = models.CharField(max_length=200)
     category = models.CharField(max_length=50, choices=CATEGORY_CHOICES, default='other')
     website = models.URLField(max_length=500, blank=True)
+    aliases = models.CharField(
+        max_length=500, blank=True,
+        help_text='Comma-separated alternative names (e.g. product names, former names)'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(
+        null=True, blank=True, db_index=True,
+        help_text='Set when the brand is deleted; its history is purged in the background'
+    )
+    
+    objects = VisibleBrandManager()
+    all_objects = models.Manager()
     
     class Meta:
         ordering = ['-created_at']
     
     def __str__(self):
         return self.name
+    
+    @property
+    def alias_list(self):
+        """Aliases as a list, without blanks."""
+        return [alias.strip() for alias in self.aliases.split(',') if alias.strip()]
+
+
+class FetchJob(models.Model):
+    """Persisted onboarding auto-fetch for a brand, run by the background executor in brands.jobs."""
+    
+    PENDING = 'pending'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    ]
+    
+    brand = models.ForeignKey(Brand, on_delete=models.CASCADE, related_name='fetch_jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    stages = models.JSONField(
+        default=dict, blank=True,
+        help_text='Per-stage state: {"rankings": {"status": ..., "result": ..., "error": ...}, ...}'
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    last_error = models.TextField(blank=True)
+    run_after = models.DateTimeField(help_text='Not picked up before this time (retry backoff, pacing)')
+    worker = models.CharField(max_length=255, blank=True, help_text='host:pid of the process running the job')
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [models.Index(fields=['status', 'run_after'], name='fetchjob_status_run_after')]
+    
+    def __str__(self):
+        return f'{self.brand.name} fetch ({self.status})'
+
+
+class BrandDeletion(models.Model):
+    """Background purge of a deleted brand's history, run in chunks by brands.purge."""
+    
+    PENDING = 'pending'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+    ]
+    
+    # Not a foreign key: the brand row is the last thing the purge removes
+    brand_id = models.PositiveIntegerField(db_index=True)
+    brand_name = models.CharField(max_length=200)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    progress = models.JSONField(
+        default=dict, blank=True,
+        help_text='Rows per related table: {"rankings.SearchRanking": {"total": ..., "deleted": ...}, ...}'
+    )
+    last_error = models.TextField(blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f'Purge of {self.brand_name} ({self.status})'
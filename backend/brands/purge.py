@@ -0,0 +1,184 @@
+"""
+Chunked background purge of deleted brands.
+
+Deleting a brand only hides it (Brand.deleted_at) and records a
+BrandDeletion; the brand's rankings, citations, reviews and other history
+are then removed by raw DELETEs of at most BRAND_PURGE_CHUNK_SIZE rows,
+each in its own short transaction. No model instances are loaded and no
+table is locked for long, so reads carry on while a large history drains.
+The brand row itself goes last. Purges are idempotent: an interrupted one
+is resumed by `purge_deleted_brands`.
+"""
+import logging
+import time
+from datetime import timedelta
+from functools import partial
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.utils import timezone
+from .jobs import get_executor
+from .models import Brand, BrandDeletion
+
+logger = logging.getLogger(__name__)
+
+
+def related_models() -> list:
+    """Models whose rows cascade from a brand (every FK to Brand)."""
+    return [
+        relation.related_model for relation in Brand._meta.related_objects
+        if relation.one_to_many and relation.on_delete is models.CASCADE
+    ]
+
+
+def _label(model) -> str:
+    return model._meta.label
+
+
+def _delete_chunk(model, brand_id: int, size: int) -> int:
+    """Delete up to `size` of a brand's rows from one table; returns rows deleted."""
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    column = quote(model._meta.get_field('brand').column)
+    if connection.vendor == 'postgresql':
+        sql = (f'DELETE FROM {table} WHERE ctid = ANY(ARRAY('
+               f'SELECT ctid FROM {table} WHERE {column} = %s LIMIT %s))')
+    elif connection.vendor == 'sqlite':
+        sql = f'DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM {table} WHERE {column} = %s LIMIT %s)'
+    else:
+        pk = quote(model._meta.pk.column)
+        sql = (f'DELETE FROM {table} WHERE {pk} IN (SELECT {pk} FROM ('
+               f'SELECT {pk} FROM {table} WHERE {column} = %s LIMIT %s) AS chunk)')
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(sql, [brand_id, size])
+        return cursor.rowcount
+
+
+def delete_brand(brand) -> BrandDeletion:
+    """
+    Hide a brand right away and queue the purge of its history.
+
+    The purge is handed to the background executor once the transaction
+    commits (or left to `purge_deleted_brands` with FETCH_JOBS_AUTO_START off).
+    Row totals are counted by the purge, not here, so the request doesn't
+    scan a large history.
+    """
+    with transaction.atomic():
+        Brand.all_objects.filter(id=brand.id).update(deleted_at=timezone.now())
+        deletion = BrandDeletion.objects.create(brand_id=brand.id, brand_name=brand.name)
+        if settings.FETCH_JOBS_AUTO_START:
+            transaction.on_commit(lambda: get_executor().submit_call(partial(run_purge_in_thread, deletion.id)))
+    return deletion
+
+
+def run_purge_in_thread(deletion_id: int):
+    """run_purge for pool threads: logs crashes and closes the thread's DB connection."""
+    try:
+        return run_purge(deletion_id)
+    except Exception:
+        logger.exception('Brand purge %s crashed', deletion_id)
+    finally:
+        connection.close()
+
+
+def run_purge(deletion_id: int):
+    """
+    Claim a pending purge and delete the brand's rows chunk by chunk.
+
+    Returns:
+        The purge's new status, or None if it wasn't claimable
+    """
+    claimed = BrandDeletion.objects.filter(id=deletion_id, status=BrandDeletion.PENDING).update(
+        status=BrandDeletion.RUNNING, heartbeat_at=timezone.now()
+    )
+    if not claimed:
+        return None
+
+    deletion = BrandDeletion.objects.get(id=deletion_id)
+    size = settings.BRAND_PURGE_CHUNK_SIZE
+    try:
+        # Totals for the progress report; a resumed purge adds what is left to what it deleted
+        for model in related_models():
+            state = deletion.progress.setdefault(_label(model), {'total': 0, 'deleted': 0})
+            state['total'] = state['deleted'] + model.objects.filter(brand_id=deletion.brand_id).count()
+        BrandDeletion.objects.filter(id=deletion.id).update(progress=deletion.progress)
+        
+        for model in related_models():
+            state = deletion.progress[_label(model)]
+            while True:
+                deleted = _delete_chunk(model, deletion.brand_id, size)
+                if deleted:
+                    state['deleted'] += deleted
+                    BrandDeletion.objects.filter(id=deletion.id).update(
+                        progress=deletion.progress, heartbeat_at=timezone.now()
+                    )
+                if deleted < size:
+                    break
+                # Leave room for other writers between chunks
+                time.sleep(settings.BRAND_PURGE_PAUSE_SECONDS)
+
+        # Anything added since (e.g. by a fetch still in flight) cascades here
+        Brand.all_objects.filter(id=deletion.brand_id).delete()
+    except Exception as e:
+        # Put it back for purge_deleted_brands; finished chunks stay deleted
+        BrandDeletion.objects.filter(id=deletion.id).update(
+            status=BrandDeletion.PENDING, last_error=str(e), progress=deletion.progress
+        )
+        raise
+
+    BrandDeletion.objects.filter(id=deletion.id).update(
+        status=BrandDeletion.SUCCEEDED, last_error='', progress=deletion.progress,
+        heartbeat_at=timezone.now(), finished_at=timezone.now()
+    )
+    return BrandDeletion.SUCCEEDED
+
+
+def purge_brands(brand_ids) -> int:
+    """
+    Delete brands and their history right away, in the same chunks as run_purge.
+
+    For offline tools (e.g. clearing generated load data) that need neither
+    the soft delete nor the progress tracking of delete_brand.
+
+    Returns:
+        Number of rows deleted, brand rows included
+    """
+    size = settings.BRAND_PURGE_CHUNK_SIZE
+    total = 0
+    for brand_id in brand_ids:
+        for model in related_models():
+            while True:
+                deleted = _delete_chunk(model, brand_id, size)
+                total += deleted
+                if deleted < size:
+                    break
+        total += Brand.all_objects.filter(id=brand_id).delete()[0]
+    return total
+
+
+def due_purges() -> list:
+    """Ids of purges to (re)start: pending ones and running ones whose worker stopped heartbeating."""
+    cutoff = timezone.now() - timedelta(seconds=settings.FETCH_JOB_STALE_SECONDS)
+    BrandDeletion.objects.filter(status=BrandDeletion.RUNNING, heartbeat_at__lt=cutoff).update(
+        status=BrandDeletion.PENDING
+    )
+    return list(
+        BrandDeletion.objects.filter(status=BrandDeletion.PENDING).order_by('created_at').values_list('id', flat=True)
+    )
+
+
+def deletion_status(deletion: BrandDeletion) -> dict:
+    """Progress report for GET /api/brands/deletions/<id>/."""
+    total = sum(state.get('total', 0) for state in deletion.progress.values())
+    deleted = sum(state.get('deleted', 0) for state in deletion.progress.values())
+    return {
+        'deletion_id': deletion.id,
+        'brand_id': deletion.brand_id,
+        'brand_name': deletion.brand_name,
+        'status': deletion.status,
+        'rows_deleted': deleted,
+        'rows_total': max(total, deleted),
+        'tables': deletion.progress,
+        'last_error': deletion.last_error,
+        'created_at': deletion.created_at,
+        'finished_at': deletion.finished_at,
+    }
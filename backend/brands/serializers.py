@@ -7,5 +7,5 @@ class BrandSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Brand
-        fields = ['id', 'name', 'category', 'website', 'created_at', 'updated_at']
+        fields = ['id', 'name', 'category', 'website', 'aliases', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
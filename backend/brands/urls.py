@@ -1,10 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BrandViewSet
+from .views import BrandViewSet, BrandDeletionView
 
 router = DefaultRouter()
 router.register(r'', BrandViewSet, basename='brand')
 
 urlpatterns = [
+    path('deletions/<int:pk>/', BrandDeletionView.as_view(), name='brand-deletion'),
     path('', include(router.urls)),
 ]
@@ -1,12 +1,20 @@
+import json
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.response import Response
-from .models import Brand
+from rest_framework.views import APIView
+from socialbooster.serialization import SparseFieldsMixin
+from .models import Brand, BrandDeletion
 from .serializers import BrandSerializer
-from .auto_fetch import auto_fetch_brand_data
-import threading
+from .importer import BrandImportError, CSVParser, import_brands, parse_rows, summarize
+from .jobs import enqueue_fetch, job_status
+from .purge import delete_brand, deletion_status
 
 
-class BrandViewSet(viewsets.ModelViewSet):
+class BrandViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet for Brand CRUD operations.
     
@@ -15,36 +23,122 @@ class BrandViewSet(viewsets.ModelViewSet):
     retrieve: GET /api/brands/{id}/
     update: PUT /api/brands/{id}/
     partial_update: PATCH /api/brands/{id}/
-    destroy: DELETE /api/brands/{id}/
+    destroy: DELETE /api/brands/{id}/ (hides the brand, purges its history in the background)
+    fetch_status: GET /api/brands/{id}/fetch-status/
+    import_brands: POST /api/brands/import/
     """
     queryset = Brand.objects.all()
     serializer_class = BrandSerializer
+    # Deleting a brand purges its history: always check the user in the database
+    strict_authentication = ('destroy',)
     
     def create(self, request, *args, **kwargs):
         """Create a brand and automatically fetch real data from the internet."""
         response = super().create(request, *args, **kwargs)
         
         if response.status_code == 201:
-            # Get the created brand
-            brand_id = response.data.get('id')
-            try:
-                brand = Brand.objects.get(id=brand_id)
-                # Run auto-fetch in background thread to avoid blocking the response
-                thread = threading.Thread(target=auto_fetch_brand_data, args=(brand,))
-                thread.start()
-                
-                # Add message to response indicating data fetch is in progress
-                response.data['auto_fetch_status'] = 'Data fetching started in background'
-            except Brand.DoesNotExist:
-                pass
+            # Tell the client the fetch is queued and where to follow it
+            response.data['auto_fetch_status'] = 'Data fetching queued in background'
+            response.data['fetch_job_id'] = self.fetch_job.id
         
         return response
     
+    def perform_create(self, serializer):
+        brand = serializer.save()
+        # Run auto-fetch on the bounded background executor (see brands.jobs)
+        self.fetch_job = enqueue_fetch(brand)
+    
+    @action(detail=True, methods=['get'], url_path='fetch-status')
+    def fetch_status(self, request, pk=None):
+        """Progress of the brand's latest auto-fetch job, stage by stage."""
+        brand = self.get_object()
+        job = brand.fetch_jobs.order_by('-created_at', '-id').first()
+        if job is None:
+            return Response(
+                {'error': f'No auto-fetch job for brand {brand.id}'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(job_status(job))
+    
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         brand_name = instance.name
-        self.perform_destroy(instance)
+        # Hide now, purge the history in the background (see brands.purge)
+        deletion = delete_brand(instance)
         return Response(
-            {'message': f'Brand "{brand_name}" deleted successfully'},
-            status=status.HTTP_200_OK
+            {
+                'message': f'Brand "{brand_name}" deleted successfully; its history is being purged',
+                'deletion_id': deletion.id,
+                'status_url': f'/api/brands/deletions/{deletion.id}/',
+            },
+            status=status.HTTP_202_ACCEPTED
+        )
+    
+    @action(
+        detail=False, methods=['post'], url_path='import',
+        parser_classes=[JSONParser, CSVParser, MultiPartParser]
+    )
+    def import_brands(self, request):
+        """
+        Import many brands at once from a JSON array, a text/csv body or an
+        uploaded `file` (.csv or .json).
+        
+        Rows are deduplicated by name and website; auto-fetch for the new
+        brands is queued as a paced backlog (?fetch=false skips it). Large
+        imports, ?stream=true or Accept: application/x-ndjson get one
+        NDJSON line per row followed by a summary line. Every row is stored
+        before the response starts, so a client that disconnects while
+        reading the stream doesn't leave a partial import behind.
+        """
+        upload = request.FILES.get('file')
+        if upload is not None:
+            is_csv = upload.name.lower().endswith('.csv') or upload.content_type == 'text/csv'
+            content, fmt = upload.read(), 'csv' if is_csv else 'json'
+        else:
+            content, fmt = request.data, 'csv' if isinstance(request.data, str) else 'json'
+        
+        try:
+            rows = parse_rows(content, fmt)
+        except BrandImportError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        max_rows = settings.BRAND_IMPORT_MAX_ROWS
+        if not rows:
+            return Response({'error': 'No brands to import'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > max_rows:
+            return Response(
+                {'error': f'At most {max_rows} brands per import'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        fetch = request.query_params.get('fetch', 'true').lower() != 'false'
+        results = list(import_brands(rows, fetch=fetch))
+        
+        stream = (
+            request.query_params.get('stream', '').lower() == 'true'
+            or 'application/x-ndjson' in request.headers.get('Accept', '')
+            or len(rows) > settings.BRAND_IMPORT_STREAM_THRESHOLD
         )
+        if not stream:
+            return Response({**summarize(results), 'results': results})
+        
+        def lines():
+            for result in results:
+                yield json.dumps(result) + '\n'
+            yield json.dumps({'summary': summarize(results)}) + '\n'
+        
+        return StreamingHttpResponse(lines(), content_type='application/x-ndjson')
+
+
+class BrandDeletionView(APIView):
+    """Progress of a deleted brand's background purge."""
+    
+    def get(self, request, pk):
+        try:
+            deletion = BrandDeletion.objects.get(id=pk)
+        except BrandDeletion.DoesNotExist:
+            return Response(
+                {'error': f'Brand deletion {pk} not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(deletion_status(deletion))
@@ -1,8 +1,13 @@
 from django.contrib import admin
-from .models import AICitation
+from .models import AICitation, CitationCheckpoint
 
 @admin.register(AICitation)
 class AICitationAdmin(admin.ModelAdmin):
     list_display = ['brand', 'ai_model', 'mentioned', 'date']
     list_filter = ['ai_model', 'mentioned', 'date']
     search_fields = ['query', 'citation_context']
+
+@admin.register(CitationCheckpoint)
+class CitationCheckpointAdmin(admin.ModelAdmin):
+    list_display = ['brand', 'ai_model', 'date', 'completed_at']
+    list_filter = ['ai_model', 'date']
@@ -1,13 +1,17 @@
 """
 Management command to refresh AI citations using real Gemini API.
 """
-import time
 import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
 from django.core.management.base import BaseCommand
+from django.db import connection
 from brands.models import Brand
-from citations.models import AICitation
+from citations.models import AICitation, CitationCheckpoint
+from citations.services import completed_checks, group_brands, refresh_category_citations, save_citation_results
+from integrations.brand_matcher import BrandMatcher
 from integrations.gemini_service import GeminiService
+from integrations.sharding import ShardTracker, parse_shard, shard_brands
 
 
 class Command(BaseCommand):
@@ -30,6 +34,44 @@ class Command(BaseCommand):
             default=14,
             help='Number of days of historical data to generate (default: 14)',
         )
+        parser.add_argument(
+            '--max-wait',
+            type=float,
+            default=120,
+            help='Longest a single Gemini call may wait on rate limiting, in seconds (default: 120)',
+        )
+        parser.add_argument(
+            '--no-cache',
+            action='store_true',
+            help='Ask Gemini again instead of reusing cached answers (fresh answers are still cached)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Concurrent Gemini requests, all paced by the shared rate limiter (default: 4)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Results buffered before each bulk write and checkpoint (default: 50)',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help="Ignore today's checkpoints and check every brand again",
+        )
+        parser.add_argument(
+            '--shard',
+            type=parse_shard,
+            help='Only check brands in shard i of N (e.g. 2/4); run one process per shard',
+        )
+        parser.add_argument(
+            '--by-category',
+            action='store_true',
+            help='Ask shared category prompts once and check the answer for every brand in the category',
+        )
 
     def handle(self, *args, **options):
         if options['generate_history']:
@@ -65,7 +107,7 @@ class Command(BaseCommand):
             'Zoom': 0.92,
         }
         
-        total_created = 0
+        citations = []
         
         for brand in brands:
             base_probability = brand_popularity.get(brand.name, 0.6)
@@ -83,31 +125,34 @@ class Command(BaseCommand):
                         'claude': 0.03,
                     }.get(ai_model, 0)
                     
-                    for _ in range(queries_per_day):
+                    # Distinct queries: (brand, model, query, date) is unique
+                    queries = random.sample([
+                        f"What is {brand.name}?",
+                        f"Tell me about {brand.name}",
+                        f"Is {brand.name} a good choice?",
+                        f"Compare {brand.name} to alternatives",
+                        f"Top features of {brand.name}",
+                    ], queries_per_day)
+                    
+                    for query in queries:
                         # Calculate if mentioned (with some daily variance)
                         daily_variance = random.uniform(-0.1, 0.1)
                         mention_prob = base_probability + model_modifier + daily_variance
                         mentioned = random.random() < mention_prob
                         
-                        query = random.choice([
-                            f"What is {brand.name}?",
-                            f"Tell me about {brand.name}",
-                            f"Is {brand.name} a good choice?",
-                            f"Compare {brand.name} to alternatives",
-                            f"Top features of {brand.name}",
-                        ])
-                        
                         context = f"{brand.name} is a popular tool..." if mentioned else "Brand not mentioned"
                         
-                        AICitation.objects.create(
+                        citations.append(AICitation(
                             brand=brand,
                             ai_model=ai_model,
                             query=query,
                             mentioned=mentioned,
                             citation_context=context,
                             date=check_date
-                        )
-                        total_created += 1
+                        ))
+        
+        AICitation.objects.bulk_create(citations, batch_size=5000)
+        total_created = len(citations)
         
         self.stdout.write(self.style.SUCCESS(
             f'✓ Created {total_created} historical citation records across {days} days'
@@ -115,7 +160,8 @@ class Command(BaseCommand):
     
     def _refresh_with_gemini(self, options):
         """Refresh citations using real Gemini API with semantic detection."""
-        service = GeminiService()
+        # Batch runs can afford to wait longer for a rate-limit slot than API requests
+        service = GeminiService(max_wait=options['max_wait'], fresh=options['no_cache'])
         
         # Test API connection
         self.stdout.write('Testing Gemini API connection...')
@@ -134,58 +180,133 @@ class Command(BaseCommand):
             brands = Brand.objects.filter(name__icontains=options['brand'])
         else:
             brands = Brand.objects.all()
+        brands = shard_brands(brands, options['shard'])
         
         if not brands.exists():
             self.stdout.write(self.style.WARNING('No brands found'))
             return
         
-        self.stdout.write(f'\nRefreshing citations for {brands.count()} brands...\n')
+        shard_label = '' if options['shard'] is None else ' (shard {}/{})'.format(*options['shard'])
+        self.stdout.write(f'\nRefreshing citations for {brands.count()} brands{shard_label}...\n')
         
-        # Clear existing Gemini citations for today
-        AICitation.objects.filter(ai_model='gemini', date=date.today()).delete()
+        tracker = ShardTracker('refresh_citations', options['shard'])
+        if options['by_category']:
+            return self._refresh_by_category(service, brands, tracker)
         
-        total_mentions = 0
-        total_checks = 0
+        ai_model = 'gemini'
+        if options['restart']:
+            CitationCheckpoint.objects.filter(ai_model=ai_model, date=date.today()).delete()
         
-        for brand in brands:
-            self.stdout.write(f'\n🔍 Checking: {brand.name}')
-            
-            queries = [
+        done = completed_checks(ai_model)
+        tasks = [
+            (brand, query)
+            for brand in brands
+            for query in [
                 f"What is {brand.name} and what does it do?",
                 f"Tell me about {brand.name}'s main features",
             ]
-            
-            for query in queries:
-                time.sleep(2)  # Rate limit delay
-                
-                result = service.check_brand_citation(brand.name, query)
-                
-                mentioned = result.get('mentioned', False)
-                context = result.get('citation_context', 'Unable to check')
-                is_semantic = result.get('semantic_match', False)
-                
-                AICitation.objects.create(
-                    brand=brand,
-                    ai_model='gemini',
-                    query=query,
-                    mentioned=mentioned,
-                    citation_context=context[:500] if context else '',
-                    date=date.today()
+            if (brand.id, query) not in done
+        ]
+        
+        skipped = 2 * brands.count() - len(tasks)
+        if skipped:
+            self.stdout.write(f'Skipping {skipped} checks already completed today')
+        
+        tracker.start(total=len(tasks) + skipped, done=skipped)
+        
+        matchers = {brand.id: BrandMatcher.for_brand(brand) for brand, _ in tasks}
+        totals = {'checks': 0, 'mentions': 0, 'failed': 0}
+        buffer = []
+        
+        def check(brand, query):
+            # Worker threads only talk to Gemini; results are written by this thread
+            try:
+                # Ambiguous answers are verified together when the buffer is flushed
+                return service.check_brand_citation(
+                    brand.name, query, matcher=matchers[brand.id], defer_verify=True
                 )
-                
-                total_checks += 1
-                if mentioned:
-                    total_mentions += 1
-                    match_type = "(semantic)" if is_semantic else "(direct)"
-                    self.stdout.write(self.style.SUCCESS(
-                        f'  ✓ Mentioned {match_type}: "{query[:35]}..."'
-                    ))
-                else:
-                    self.stdout.write(self.style.WARNING(
-                        f'  ✗ Not mentioned: "{query[:35]}..."'
-                    ))
+            except Exception as e:
+                return {'error': str(e), 'mentioned': False, 'success': False}
+            finally:
+                connection.close()
+        
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as executor:
+            futures = {executor.submit(check, brand, query): (brand, query) for brand, query in tasks}
+            
+            for future in as_completed(futures):
+                brand, query = futures[future]
+                buffer.append((brand, query, future.result()))
+                if len(buffer) >= options['batch_size']:
+                    self._flush(service, buffer, ai_model, totals, tracker)
+                    buffer = []
+        
+        self._flush(service, buffer, ai_model, totals, tracker)
+        tracker.finish()
         
+        total_checks, total_mentions = totals['checks'], totals['mentions']
         rate = 100 * total_mentions // total_checks if total_checks else 0
         self.stdout.write(self.style.SUCCESS(
             f'\n\n✓ Completed! {total_mentions}/{total_checks} citations found ({rate}% rate)'
         ))
+        if totals['failed']:
+            self.stdout.write(self.style.WARNING(
+                f"{totals['failed']} checks failed and kept their previous results; rerun to retry them"
+            ))
+    
+    def _flush(self, service, buffer, ai_model, totals, tracker):
+        """Verify ambiguous answers in one batch, then write and checkpoint the results."""
+        if not buffer:
+            return
+        
+        pending = [(brand.name, result) for brand, _, result in buffer if result.get('needs_verification')]
+        if pending:
+            self.stdout.write(f'Verifying {len(pending)} ambiguous responses in batches...')
+            service.resolve_verifications(pending)
+        
+        written = save_citation_results(buffer, ai_model)
+        tracker.advance(done=len(written), failed=len(buffer) - len(written))
+        
+        for brand, query, result in buffer:
+            if not result.get('success'):
+                totals['failed'] += 1
+                self.stdout.write(self.style.ERROR(
+                    f'  ✗ {brand.name} failed: "{query[:35]}..." ({result.get("error")})'
+                ))
+                continue
+            
+            totals['checks'] += 1
+            if result.get('mentioned'):
+                totals['mentions'] += 1
+                match_type = f"({result.get('match_stage') or 'direct'})"
+                self.stdout.write(self.style.SUCCESS(
+                    f'  ✓ {brand.name} mentioned {match_type}: "{query[:35]}..."'
+                ))
+            else:
+                self.stdout.write(self.style.WARNING(
+                    f'  ✗ {brand.name} not mentioned: "{query[:35]}..."'
+                ))
+    
+    def _refresh_by_category(self, service, brands, tracker):
+        """One Gemini call per shared category prompt, attributed to every brand in the group."""
+        brands = list(brands)
+        # Progress is counted in prompts here, however many brands share each one
+        tracker.start(total=len(group_brands(brands)))
+        summary = refresh_category_citations(brands, service)
+        tracker.advance(done=summary['prompts_asked'], failed=len(summary['errors']))
+        tracker.finish()
+        
+        for prompt, error in summary['errors'].items():
+            self.stdout.write(self.style.ERROR(f'  ✗ "{prompt[:35]}...": {error}'))
+        
+        for citation in summary['citations']:
+            if citation.mentioned:
+                self.stdout.write(self.style.SUCCESS(
+                    f'  ✓ {citation.brand.name} mentioned: "{citation.query[:35]}..."'
+                ))
+        
+        total_checks = summary['citations_created']
+        rate = 100 * summary['mentions_found'] // total_checks if total_checks else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"\n\n✓ Completed! {summary['mentions_found']}/{total_checks} citations found ({rate}% rate) "
+            f"from {summary['prompts_asked']} prompts"
+        ))
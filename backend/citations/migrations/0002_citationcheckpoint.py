@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-19 01:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brands', '0002_brand_aliases'),
+        ('citations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CitationCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ai_model', models.CharField(choices=[('chatgpt', 'ChatGPT'), ('gemini', 'Gemini'), ('perplexity', 'Perplexity'), ('copilot', 'Microsoft Copilot'), ('google_ai', 'Google AI Overview'), ('claude', 'Claude')], max_length=50)),
+                ('query', models.TextField()),
+                ('date', models.DateField()),
+                ('completed_at', models.DateTimeField(auto_now_add=True)),
+                ('brand', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='citation_checkpoints', to='brands.brand')),
+            ],
+            options={
+                'ordering': ['-date'],
+                'constraints': [models.UniqueConstraint(fields=('brand', 'ai_model', 'query', 'date'), name='unique_citation_checkpoint')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-19 01:40
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def remove_duplicate_citations(apps, schema_editor):
+    """Keep the newest row for each (brand, ai_model, query, date) before adding the constraint."""
+    AICitation = apps.get_model('citations', 'AICitation')
+    duplicates = (
+        AICitation.objects.values('brand_id', 'ai_model', 'query', 'date')
+        .annotate(keep_id=Max('id'), rows=models.Count('id'))
+        .filter(rows__gt=1)
+    )
+    for group in duplicates.iterator():
+        AICitation.objects.filter(
+            brand_id=group['brand_id'], ai_model=group['ai_model'], query=group['query'], date=group['date']
+        ).exclude(id=group['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brands', '0002_brand_aliases'),
+        ('citations', '0002_citationcheckpoint'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_citations, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='aicitation',
+            constraint=models.UniqueConstraint(fields=('brand', 'ai_model', 'query', 'date'), name='unique_ai_citation'),
+        ),
+    ]
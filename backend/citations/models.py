@@ -1,5 +1,5 @@
 from django.db import models
-from brands.models import Brand
+from brands.models import Brand, VisibleBrandRowsManager
 
 
 class AICitation(models.Model):
@@ -22,11 +22,36 @@ class AICitation(models.Model):
     date = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = models.Manager()
+    visible = VisibleBrandRowsManager()
+    
     class Meta:
         ordering = ['-date']
         verbose_name = 'AI Citation'
         verbose_name_plural = 'AI Citations'
+        constraints = [
+            models.UniqueConstraint(fields=['brand', 'ai_model', 'query', 'date'], name='unique_ai_citation'),
+        ]
     
     def __str__(self):
         status = 'mentioned' if self.mentioned else 'not mentioned'
         return f'{self.brand.name} {status} in {self.get_ai_model_display()}'
+
+
+class CitationCheckpoint(models.Model):
+    """Marks a (brand, model, query) check as done for a day so reruns can resume."""
+    
+    brand = models.ForeignKey(Brand, on_delete=models.CASCADE, related_name='citation_checkpoints')
+    ai_model = models.CharField(max_length=50, choices=AICitation.AI_MODEL_CHOICES)
+    query = models.TextField()
+    date = models.DateField()
+    completed_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['brand', 'ai_model', 'query', 'date'], name='unique_citation_checkpoint'),
+        ]
+    
+    def __str__(self):
+        return f'{self.brand.name} / {self.ai_model} / {self.date}'
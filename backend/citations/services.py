@@ -0,0 +1,175 @@
+"""
+Citation refresh helpers.
+
+Query-centric checks: category-level prompts ("What is the best team chat
+app?") are asked once per AI model and the answer is attributed to every
+tracked brand in the category, instead of asking once per brand.
+
+Checkpointed writes: finished (brand, model, query) checks are recorded per
+day so an interrupted refresh can resume, and a day's rows are only replaced
+once the new results are in hand.
+"""
+from datetime import date
+from django.db import transaction
+from integrations.brand_matcher import BrandMatcher
+from socialbooster.bulk import upsert_rows
+from .models import AICitation, CitationCheckpoint
+
+CATEGORY_PROMPTS = {
+    'software': [
+        'What is the best team chat app?',
+        'What software tools do growing teams rely on?',
+    ],
+    'ecommerce': [
+        'What is the best ecommerce platform for a small business?',
+        'How should I start an online store?',
+    ],
+    'finance': [
+        'What payment gateway should a startup use?',
+        'What is the best accounting software for small businesses?',
+    ],
+    'health': [
+        'What are the most trusted health and wellness brands?',
+        'Which healthcare apps do patients recommend?',
+    ],
+    'food': [
+        'What are the best food delivery services?',
+        'Which restaurant and food brands are most popular?',
+    ],
+    'services': [
+        'What are the best professional services firms for small businesses?',
+        'Which consulting agencies do companies recommend?',
+    ],
+    'other': [
+        'Which companies are leaders in their industry?',
+    ],
+}
+
+
+def upsert_citations(citations) -> list:
+    """Write unsaved AICitation instances, replacing rows with the same natural key."""
+    return upsert_rows(AICitation, [
+        {
+            'brand_id': c.brand_id,
+            'ai_model': c.ai_model,
+            'query': c.query,
+            'mentioned': c.mentioned,
+            'citation_context': c.citation_context,
+            'date': c.date,
+        }
+        for c in citations
+    ])
+
+
+def group_brands(brands) -> dict:
+    """
+    Group brands by the prompts they share.
+
+    Returns:
+        dict of prompt -> list of brands asking it
+    """
+    groups = {}
+    for brand in brands:
+        for prompt in CATEGORY_PROMPTS.get(brand.category, CATEGORY_PROMPTS['other']):
+            groups.setdefault(prompt, []).append(brand)
+    return groups
+
+
+def refresh_category_citations(brands, service, ai_model: str = 'gemini', check_date: date = None) -> dict:
+    """
+    Ask each shared prompt once and store a citation row for every brand in its group.
+
+    Today's rows for the same (brand, model, prompt) are replaced with a
+    single bulk upsert.
+
+    Args:
+        brands: Brands to check
+        service: Client with check_group_citation (e.g. GeminiService)
+        ai_model: AICitation.ai_model the answers are recorded under
+        check_date: Date to record (defaults to today)
+
+    Returns:
+        dict with prompts asked, rows written, mentions and failed prompts
+    """
+    check_date = check_date or date.today()
+    groups = group_brands(brands)
+    citations = []
+    errors = {}
+
+    for prompt, group in groups.items():
+        result = service.check_group_citation(
+            prompt, {brand.id: BrandMatcher.for_brand(brand) for brand in group}
+        )
+        if not result.get('success'):
+            errors[prompt] = result.get('error', 'Unknown error')
+            continue
+
+        citations.extend(
+            AICitation(
+                brand=brand,
+                ai_model=ai_model,
+                query=prompt,
+                mentioned=result['results'][brand.id]['mentioned'],
+                citation_context=result['results'][brand.id]['citation_context'][:500],
+                date=check_date
+            )
+            for brand in group
+        )
+
+    with transaction.atomic():
+        upsert_citations(citations)
+
+    return {
+        'prompts_asked': len(groups) - len(errors),
+        'citations_created': len(citations),
+        'mentions_found': sum(c.mentioned for c in citations),
+        'errors': errors,
+        'citations': citations,
+    }
+
+
+def completed_checks(ai_model: str, check_date: date = None) -> set:
+    """(brand_id, query) pairs already checkpointed for the day."""
+    return set(CitationCheckpoint.objects.filter(
+        ai_model=ai_model, date=check_date or date.today()
+    ).values_list('brand_id', 'query'))
+
+
+def save_citation_results(results, ai_model: str, check_date: date = None) -> list:
+    """
+    Replace the day's rows for a batch of finished checks and checkpoint them.
+
+    Failed checks are skipped: the existing rows stay in place and the check
+    is retried on the next run.
+
+    Args:
+        results: Iterable of (brand, query, result dict from check_brand_citation)
+        ai_model: AICitation.ai_model the answers are recorded under
+        check_date: Date to record (defaults to today)
+
+    Returns:
+        List of the AICitation rows written
+    """
+    check_date = check_date or date.today()
+    citations = [
+        AICitation(
+            brand=brand,
+            ai_model=ai_model,
+            query=query,
+            mentioned=result.get('mentioned', False),
+            citation_context=(result.get('citation_context') or '')[:500],
+            date=check_date
+        )
+        for brand, query, result in results
+        if result.get('success')
+    ]
+    if not citations:
+        return []
+
+    with transaction.atomic():
+        upsert_citations(citations)
+        CitationCheckpoint.objects.bulk_create([
+            CitationCheckpoint(brand_id=c.brand_id, ai_model=ai_model, query=c.query, date=check_date)
+            for c in citations
+        ], ignore_conflicts=True)
+    return citations
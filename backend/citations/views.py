@@ -3,13 +3,15 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db.models import Count, Q, F
 from datetime import date, timedelta
+from socialbooster.bulk import BulkUpsertMixin
+from socialbooster.serialization import FastListMixin
 from .models import AICitation
 from .serializers import AICitationSerializer
 
 
-class AICitationViewSet(viewsets.ModelViewSet):
+class AICitationViewSet(FastListMixin, BulkUpsertMixin, viewsets.ModelViewSet):
     """ViewSet for AICitation CRUD and analytics."""
-    queryset = AICitation.objects.select_related('brand').all()
+    queryset = AICitation.visible.select_related('brand')
     serializer_class = AICitationSerializer
     
     def get_queryset(self):
@@ -92,7 +94,7 @@ class AICitationViewSet(viewsets.ModelViewSet):
         # Generate all dates in range
         dates = [(start_date + timedelta(days=i)).isoformat() for i in range(days)]
         
-        queryset = AICitation.objects.filter(date__gte=start_date, date__lte=end_date)
+        queryset = AICitation.visible.filter(date__gte=start_date, date__lte=end_date)
         
         if group_by == 'brand':
             # Group by brand over time
@@ -3,8 +3,23 @@ Pytest configuration and fixtures for testing.
 """
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from brands.models import Brand
+from integrations.fake_server import FakeAPIServer
+from users.authentication import user_cache
+
+
+@pytest.fixture(autouse=True)
+def no_background_fetch(settings):
+    """Leave auto-fetch jobs queued; tests run them explicitly with brands.jobs.run_job."""
+    settings.FETCH_JOBS_AUTO_START = False
+
+
+@pytest.fixture(autouse=True)
+def empty_user_cache():
+    """User ids are reused across tests; don't let one test see another's cached user."""
+    user_cache.clear()
 
 
 @pytest.fixture
@@ -44,3 +59,23 @@ def test_brand(db):
         category='software',
         website='https://testbrand.com'
     )
+
+
+@pytest.fixture
+def fake_api_server(settings):
+    """
+    Run the fake SerpAPI/Gemini server and point the integrations at it.
+    
+    Fault injection can be tuned per test through the returned server's
+    latency_ms, rate_limit_ratio and error_ratio attributes.
+    """
+    server = FakeAPIServer(seed=0).start()
+    settings.SERPAPI_BASE_URL = server.base_url
+    settings.GEMINI_BASE_URL = server.base_url
+    settings.SERPAPI_KEY = 'fake-serpapi-key'
+    settings.GEMINI_API_KEY = 'fake-gemini-key'
+    settings.GEMINI_RATE_LIMIT_PER_MINUTE = 6000
+    settings.LLM_CACHE_ENABLED = False  # Every call should reach the server
+    cache.clear()
+    yield server
+    server.stop()
@@ -27,7 +27,7 @@ class DashboardOverviewView(APIView):
         total_brands = Brand.objects.count()
         
         # Rankings stats
-        rankings_qs = SearchRanking.objects.all()
+        rankings_qs = SearchRanking.visible.all()
         if start_date:
             rankings_qs = rankings_qs.filter(date__gte=start_date)
         if end_date:
@@ -35,7 +35,7 @@ class DashboardOverviewView(APIView):
         avg_position = rankings_qs.aggregate(avg=Avg('position'))['avg'] or 0
         
         # Citations stats
-        citations_qs = AICitation.objects.all()
+        citations_qs = AICitation.visible.all()
         if start_date:
             citations_qs = citations_qs.filter(date__gte=start_date)
         if end_date:
@@ -45,7 +45,7 @@ class DashboardOverviewView(APIView):
         citation_rate = round((mentioned_citations / total_citations) * 100, 1) if total_citations > 0 else 0
         
         # Reviews stats
-        reviews_qs = Review.objects.all()
+        reviews_qs = Review.visible.all()
         if start_date:
             reviews_qs = reviews_qs.filter(date__gte=start_date)
         if end_date:
@@ -78,7 +78,7 @@ class DashboardOverviewView(APIView):
         brands = Brand.objects.all()[:5]
         chart_data = []
         for brand in brands:
-            rankings = SearchRanking.objects.filter(brand=brand).order_by('date')[:30]
+            rankings = SearchRanking.visible.filter(brand=brand).order_by('date')[:30]
             chart_data.append({
                 'brand_name': brand.name,
                 'data': [{'date': r.date.isoformat(), 'position': r.position} for r in rankings]
@@ -87,7 +87,7 @@ class DashboardOverviewView(APIView):
     
     def _get_citation_breakdown(self):
         """Get citation data for pie chart."""
-        breakdown = AICitation.objects.filter(mentioned=True).values('ai_model').annotate(
+        breakdown = AICitation.visible.filter(mentioned=True).values('ai_model').annotate(
             count=Count('id')
         ).order_by('-count')
         model_names = dict(AICitation.AI_MODEL_CHOICES)
@@ -131,12 +131,12 @@ class ExportDataView(APIView):
         data = {'brands': list(Brand.objects.values())}
         
         if brand_id:
-            data['rankings'] = list(SearchRanking.objects.filter(brand_id=brand_id).values())
-            data['citations'] = list(AICitation.objects.filter(brand_id=brand_id).values())
-            data['reviews'] = list(Review.objects.filter(brand_id=brand_id).values())
+            data['rankings'] = list(SearchRanking.visible.filter(brand_id=brand_id).values())
+            data['citations'] = list(AICitation.visible.filter(brand_id=brand_id).values())
+            data['reviews'] = list(Review.visible.filter(brand_id=brand_id).values())
         else:
-            data['rankings'] = list(SearchRanking.objects.values())
-            data['citations'] = list(AICitation.objects.values())
-            data['reviews'] = list(Review.objects.values())
+            data['rankings'] = list(SearchRanking.visible.values())
+            data['citations'] = list(AICitation.visible.values())
+            data['reviews'] = list(Review.visible.values())
         
         return Response(data)
@@ -0,0 +1,27 @@
+from django.contrib import admin
+from .models import KeywordCheck, CreditBudget, LLMResponse, ProviderState, ShardProgress
+
+@admin.register(KeywordCheck)
+class KeywordCheckAdmin(admin.ModelAdmin):
+    list_display = ['brand', 'keyword', 'importance', 'last_checked_at']
+    list_filter = ['importance']
+    search_fields = ['keyword', 'brand__name']
+
+@admin.register(CreditBudget)
+class CreditBudgetAdmin(admin.ModelAdmin):
+    list_display = ['provider', 'searches_left', 'spent_today', 'period_resets_on', 'synced_at']
+
+@admin.register(LLMResponse)
+class LLMResponseAdmin(admin.ModelAdmin):
+    list_display = ['model', 'prompt', 'complete', 'hits', 'last_used_at', 'expires_at']
+    list_filter = ['model', 'complete']
+    search_fields = ['prompt']
+
+@admin.register(ShardProgress)
+class ShardProgressAdmin(admin.ModelAdmin):
+    list_display = ['job', 'run_date', 'shard_index', 'shard_count', 'done', 'total', 'failed', 'host', 'finished_at']
+    list_filter = ['job', 'run_date']
+
+@admin.register(ProviderState)
+class ProviderStateAdmin(admin.ModelAdmin):
+    list_display = ['key', 'state', 'updated_at']
@@ -0,0 +1,282 @@
+"""
+Local matcher cascade for brand mentions.
+Decides cheaply whether an AI response is about a brand so the Gemini
+semantic-verify round trip is only needed for genuinely ambiguous answers.
+"""
+import math
+import re
+from collections import Counter
+from difflib import SequenceMatcher
+from urllib.parse import urlparse
+from brands.auto_fetch import CATEGORY_KEYWORDS
+from brands.models import Brand
+from . import metrics
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+CORPORATE_SUFFIXES = {'inc', 'llc', 'ltd', 'corp', 'corporation', 'co', 'company', 'gmbh', 'plc', 'the'}
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'for', 'from', 'has', 'have', 'in',
+    'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'their', 'this', 'to', 'was', 'with',
+    'you', 'your', 'which', 'what', 'will', 'more', 'also', 'other', 'such', 'these', 'they',
+}
+
+
+def _tokens(text: str) -> list:
+    return WORD_RE.findall(text.lower())
+
+
+def _category_documents() -> dict:
+    labels = dict(Brand.CATEGORY_CHOICES)
+    return {
+        category: _tokens(' '.join(terms) + ' ' + labels.get(category, ''))
+        for category, terms in CATEGORY_KEYWORDS.items()
+    }
+
+
+def _build_idf() -> dict:
+    """Smoothed IDF over the category profiles: terms shared by every category weigh least."""
+    documents = _category_documents().values()
+    n_docs = len(documents)
+    df = Counter(term for doc in documents for term in set(doc))
+    return {term: math.log((1 + n_docs) / (1 + count)) + 1 for term, count in df.items()}
+
+
+IDF = _build_idf()
+UNSEEN_IDF = math.log(1 + len(CATEGORY_KEYWORDS)) + 1
+
+
+def _tfidf(tokens) -> dict:
+    counts = Counter(t for t in tokens if t not in STOP_WORDS)
+    return {term: count * IDF.get(term, UNSEEN_IDF) for term, count in counts.items()}
+
+
+def _cosine(a: dict, b: dict) -> float:
+    dot = sum(weight * b[term] for term, weight in a.items() if term in b)
+    if not dot:
+        return 0.0
+    norm = math.sqrt(sum(w * w for w in a.values())) * math.sqrt(sum(w * w for w in b.values()))
+    return dot / norm
+
+
+class BrandMatcher:
+    """
+    Cascade of local checks, cheapest first:
+
+    1. alias   - the name or an alias as a whole word
+    2. domain  - the website domain (or its label) in the text
+    3. token   - the name's words in sequence, or the name split/joined
+                 differently ("Hub Spot", "Mail-Chimp")
+    4. fuzzy   - near-miss spellings of longer names
+    5. profile - TF-IDF similarity against the brand's profile; a text that
+                 shares nothing with the brand's vocabulary is rejected
+
+    Anything left over is ambiguous and should go to the LLM.
+    """
+
+    MATCH = 'match'
+    NO_MATCH = 'no_match'
+    AMBIGUOUS = 'ambiguous'
+    STAGES = ['alias', 'domain', 'token', 'fuzzy', 'profile']
+
+    FUZZY_MIN_LENGTH = 5
+    FUZZY_THRESHOLD = 0.85
+    PROFILE_MIN_SIMILARITY = 0.05
+
+    _cache = {}
+    _CACHE_SIZE = 1000
+
+    def __init__(self, name: str, aliases=(), website: str = '', category: str = ''):
+        self.name = name
+        self.names = [name] + [alias for alias in aliases if alias]
+        self.domain = ''
+        self.domain_label = ''
+        if website:
+            netloc = urlparse(website if '//' in website else f'//{website}').netloc.lower()
+            self.domain = netloc[4:] if netloc.startswith('www.') else netloc
+            self.domain_label = self.domain.split('.')[0]
+
+        self._name_patterns = [
+            re.compile(r'(?<![a-z0-9])' + re.escape(n.lower()) + r'(?![a-z0-9])') for n in self.names
+        ]
+        self._name_tokens = [
+            [t for t in _tokens(n) if t not in CORPORATE_SUFFIXES] or _tokens(n) for n in self.names
+        ]
+        self._compact_names = {''.join(tokens) for tokens in self._name_tokens if tokens}
+
+        profile_terms = [t for tokens in self._name_tokens for t in tokens]
+        if self.domain_label:
+            profile_terms.append(self.domain_label)
+        profile_terms += _category_documents().get(category, [])
+        self._profile = _tfidf(profile_terms)
+
+    @classmethod
+    def for_brand(cls, brand) -> 'BrandMatcher':
+        """Matcher for a Brand, cached until the brand is edited."""
+        cached = cls._cache.get(brand.id)
+        if cached and cached[0] == brand.updated_at:
+            return cached[1]
+        if len(cls._cache) >= cls._CACHE_SIZE:
+            cls._cache.clear()
+        matcher = cls(brand.name, brand.alias_list, brand.website, brand.category)
+        cls._cache[brand.id] = (brand.updated_at, matcher)
+        return matcher
+
+    def _match_alias(self, text_lower, words):
+        for pattern in self._name_patterns:
+            found = pattern.search(text_lower)
+            if found:
+                return found.span()
+        return None
+
+    def _match_domain(self, text_lower, words):
+        if self.domain:
+            pos = text_lower.find(self.domain)
+            if pos >= 0:
+                return pos, pos + len(self.domain)
+        if len(self.domain_label) >= 4 and self.domain_label not in self._compact_names:
+            for word in words:
+                if word.group() == self.domain_label:
+                    return word.span()
+        return None
+
+    def _match_token(self, text_lower, words):
+        tokens = [w.group() for w in words]
+        for name_tokens in self._name_tokens:
+            size = len(name_tokens)
+            for i in range(len(tokens) - size + 1):
+                if tokens[i:i + size] == name_tokens:
+                    return words[i].start(), words[i + size - 1].end()
+        # Same letters, different word breaks
+        for i in range(len(tokens)):
+            joined = ''
+            for j in range(i, min(i + 3, len(tokens))):
+                joined += tokens[j]
+                if joined in self._compact_names:
+                    return words[i].start(), words[j].end()
+        return None
+
+    def _match_fuzzy(self, text_lower, words):
+        tokens = [w.group() for w in words]
+        for name_tokens in self._name_tokens:
+            target = ''.join(name_tokens)
+            if len(target) < self.FUZZY_MIN_LENGTH:
+                continue
+            size = len(name_tokens)
+            for i in range(len(tokens) - size + 1):
+                candidate = ''.join(tokens[i:i + size])
+                if abs(len(candidate) - len(target)) > 2:
+                    continue
+                matcher = SequenceMatcher(None, target, candidate)
+                if matcher.quick_ratio() >= self.FUZZY_THRESHOLD and matcher.ratio() >= self.FUZZY_THRESHOLD:
+                    return words[i].start(), words[i + size - 1].end()
+        return None
+
+    def similarity(self, text: str) -> float:
+        """TF-IDF cosine similarity between the text and the brand profile."""
+        return _cosine(_tfidf(_tokens(text)), self._profile)
+
+    def classify(self, text: str) -> dict:
+        """
+        Run the cascade on a response.
+
+        Returns:
+            dict with outcome (match/no_match/ambiguous), the deciding stage
+            and, for matches, the (start, end) span of the mention
+        """
+        text_lower = text.lower()
+        words = list(WORD_RE.finditer(text_lower))
+        metrics.incr('matcher.checks')
+
+        for stage in self.STAGES[:-1]:
+            span = getattr(self, f'_match_{stage}')(text_lower, words)
+            if span:
+                metrics.incr(f'matcher.{stage}')
+                return {'outcome': self.MATCH, 'stage': stage, 'span': span}
+
+        if self.similarity(text) < self.PROFILE_MIN_SIMILARITY:
+            metrics.incr('matcher.profile')
+            return {'outcome': self.NO_MATCH, 'stage': 'profile', 'span': None}
+
+        metrics.incr('matcher.ambiguous')
+        return {'outcome': self.AMBIGUOUS, 'stage': None, 'span': None}
+
+
+class MultiBrandMatcher:
+    """
+    Scans one answer for many brands at once.
+
+    Names, aliases and domains of every brand are compiled into a single
+    alternation so the text is searched once however many brands there are;
+    brands it doesn't find get the token and fuzzy stages of their own
+    matcher. The profile stage is not used: a category answer being on-topic
+    says nothing about which brands it cites.
+
+    Args:
+        matchers: dict of key (e.g. brand id) -> BrandMatcher
+    """
+
+    STAGES = ['alias', 'domain', 'token', 'fuzzy']
+
+    def __init__(self, matchers: dict):
+        self.matchers = matchers
+        self._owners = {}
+        for key, matcher in matchers.items():
+            for name in matcher.names:
+                self._owners.setdefault(name.lower(), []).append((key, 'alias'))
+            if matcher.domain:
+                self._owners.setdefault(matcher.domain, []).append((key, 'domain'))
+
+        # Longest first so "HubSpot CRM" wins over "HubSpot"
+        terms = sorted(self._owners, key=len, reverse=True)
+        self._pattern = re.compile(
+            r'(?<![a-z0-9])(?:' + '|'.join(re.escape(term) for term in terms) + r')(?![a-z0-9])'
+        ) if terms else None
+
+    def scan(self, text: str) -> dict:
+        """
+        Find every brand mentioned in a response.
+
+        Returns:
+            dict of key -> {'stage', 'span'} for the brands that matched
+        """
+        text_lower = text.lower()
+        found = {}
+
+        if self._pattern:
+            for hit in self._pattern.finditer(text_lower):
+                for key, stage in self._owners[hit.group()]:
+                    found.setdefault(key, {'stage': stage, 'span': hit.span()})
+
+        words = list(WORD_RE.finditer(text_lower))
+        for key, matcher in self.matchers.items():
+            if key in found:
+                continue
+            for stage in self.STAGES[2:]:
+                span = getattr(matcher, f'_match_{stage}')(text_lower, words)
+                if span:
+                    found[key] = {'stage': stage, 'span': span}
+                    break
+
+        metrics.incr('matcher.group_scans')
+        metrics.incr('matcher.group_brands', len(self.matchers))
+        return found
+
+
+def matcher_stats() -> dict:
+    """Per-stage hit rates and how many LLM verifications the cascade avoided."""
+    counters = metrics.snapshot('matcher.')
+    checks = counters.get('matcher.checks', 0)
+    ambiguous = counters.get('matcher.ambiguous', 0)
+    return {
+        'checks': checks,
+        'stages': {
+            stage: {
+                'hits': counters.get(f'matcher.{stage}', 0),
+                'hit_rate': metrics.ratio(counters.get(f'matcher.{stage}', 0), checks),
+            }
+            for stage in BrandMatcher.STAGES
+        },
+        'llm_verifications': ambiguous,
+        'llm_verifications_avoided': checks - ambiguous,
+        'avoided_rate': metrics.ratio(checks - ambiguous, checks),
+    }
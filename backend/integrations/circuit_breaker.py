@@ -0,0 +1,150 @@
+"""
+Per-provider circuit breaker for outbound API calls.
+State lives in the database (integrations.provider_state) so every worker
+and cron process sees the same breaker: once a provider is failing, every
+caller fails fast instead of waiting out its timeout. While the circuit is
+closed and healthy a call only reads the state; it is locked and written on
+failures and state changes.
+"""
+import time
+from contextlib import contextmanager
+import requests
+from django.conf import settings
+from socialbooster import telemetry
+from .provider_state import locked_state, read_state
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling a provider whose circuit is open. Safe to retry later."""
+
+    retriable = True
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(f'{provider} circuit is open; retry in {retry_after:.0f}s')
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Closed → open after consecutive failures (errors, 5xx or calls slower
+    than the latency threshold); open → half-open after the reset timeout,
+    when a limited number of probe calls are let through. A successful
+    probe closes the circuit, a failed one re-opens it.
+
+    Args:
+        provider: Provider name, e.g. 'serpapi' or 'gemini'
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    INITIAL_STATE = {
+        'state': CLOSED,
+        'failures': 0,
+        'opened_at': None,
+        'probes': 0,
+        'probe_started_at': None,
+        'last_error': '',
+        'last_failure_at': None,
+    }
+
+    def __init__(self, provider: str):
+        self.provider = provider
+        self.key = f'circuit:{provider}'
+        self.failure_threshold = getattr(settings, 'CIRCUIT_BREAKER_FAILURE_THRESHOLD', 5)
+        self.latency_threshold = getattr(settings, 'CIRCUIT_BREAKER_LATENCY_THRESHOLD', 10)
+        self.reset_timeout = getattr(settings, 'CIRCUIT_BREAKER_RESET_TIMEOUT', 30)
+        self.half_open_probes = getattr(settings, 'CIRCUIT_BREAKER_HALF_OPEN_PROBES', 1)
+
+    def _load(self) -> dict:
+        return read_state(self.key, self.INITIAL_STATE)
+
+    def _locked(self):
+        return locked_state(self.key, self.INITIAL_STATE)
+
+    def before_call(self):
+        """Let a call through, or raise CircuitOpenError if the provider is failing."""
+        if self._load()['state'] == self.CLOSED:
+            return
+
+        with self._locked() as state:
+            now = time.time()
+
+            if state['state'] == self.OPEN:
+                elapsed = now - state['opened_at']
+                if elapsed < self.reset_timeout:
+                    raise CircuitOpenError(self.provider, self.reset_timeout - elapsed)
+                state.update(state=self.HALF_OPEN, probes=0, probe_started_at=None)
+
+            if state['state'] == self.HALF_OPEN:
+                # A probe that never reported back must not wedge the circuit
+                stale_probe = state['probe_started_at'] and now - state['probe_started_at'] > self.reset_timeout
+                if state['probes'] >= self.half_open_probes and not stale_probe:
+                    raise CircuitOpenError(self.provider, self.reset_timeout)
+                state['probes'] = 1 if stale_probe else state['probes'] + 1
+                state['probe_started_at'] = now
+
+    def record_success(self, elapsed: float):
+        """Record a completed call; slow calls count as failures."""
+        if elapsed > self.latency_threshold:
+            return self.record_failure(f'Slow response: {elapsed:.1f}s')
+
+        state = self._load()
+        if state['state'] == self.CLOSED and not state['failures']:
+            return
+        with self._locked() as state:
+            state.update(state=self.CLOSED, failures=0, opened_at=None, probes=0, probe_started_at=None)
+
+    def record_failure(self, error: str):
+        """Record a failed call, opening the circuit once the threshold is reached."""
+        with self._locked() as state:
+            now = time.time()
+            state['failures'] += 1
+            state['last_error'] = error[:200]
+            state['last_failure_at'] = now
+
+            if state['state'] == self.HALF_OPEN or state['failures'] >= self.failure_threshold:
+                state.update(state=self.OPEN, opened_at=now, probes=0, probe_started_at=None)
+
+    @staticmethod
+    def is_failure(exc: Exception) -> bool:
+        """Provider-side failures only; 4xx responses are the caller's problem."""
+        if isinstance(exc, requests.exceptions.HTTPError) and exc.response is not None:
+            return exc.response.status_code >= 500
+        return isinstance(exc, requests.exceptions.RequestException)
+
+    @contextmanager
+    def call(self):
+        """Guard an outbound call: fail fast when open, record the outcome otherwise."""
+        self.before_call()
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            telemetry.record_http(self.provider, time.monotonic() - started)
+            if self.is_failure(e):
+                self.record_failure(str(e))
+            else:
+                self.record_success(time.monotonic() - started)
+            raise
+        elapsed = time.monotonic() - started
+        telemetry.record_http(self.provider, elapsed)
+        self.record_success(elapsed)
+
+    def snapshot(self) -> dict:
+        """Current breaker state for the health endpoint."""
+        state = self._load()
+        retry_in = None
+        if state['state'] == self.OPEN:
+            retry_in = max(0, round(self.reset_timeout - (time.time() - state['opened_at']), 1))
+
+        return {
+            'state': state['state'],
+            'consecutive_failures': state['failures'],
+            'last_error': state['last_error'],
+            'last_failure_at': state['last_failure_at'],
+            'retry_in_seconds': retry_in,
+            'failure_threshold': self.failure_threshold,
+            'latency_threshold_seconds': self.latency_threshold,
+        }
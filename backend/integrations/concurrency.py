@@ -0,0 +1,78 @@
+"""
+Bounded fan-out for outbound API calls.
+
+Each provider has one semaphore per process (PROVIDER_CONCURRENCY), shared
+by every stage, job and command running in it, so fanning out never puts
+more than that many calls in flight to a provider. Rate limits
+(integrations.rate_limit) and circuit breakers still apply on top.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from contextvars import copy_context
+from django.conf import settings
+from django.db import connection
+from socialbooster import telemetry
+
+DEFAULT_CONCURRENCY = 4
+
+_semaphores = {}
+_semaphores_lock = threading.Lock()
+
+
+def provider_limit(provider: str) -> int:
+    """Most calls one process may have in flight to a provider."""
+    return max(1, settings.PROVIDER_CONCURRENCY.get(provider, DEFAULT_CONCURRENCY))
+
+
+def provider_semaphore(provider: str) -> threading.BoundedSemaphore:
+    with _semaphores_lock:
+        if provider not in _semaphores:
+            _semaphores[provider] = threading.BoundedSemaphore(provider_limit(provider))
+        return _semaphores[provider]
+
+
+@contextmanager
+def provider_slot(provider: str):
+    """Hold one of the provider's concurrency slots for the duration of a call."""
+    with provider_semaphore(provider):
+        yield
+
+
+def _slot(provider):
+    return provider_slot(provider) if provider else nullcontext()
+
+
+def run_in_thread(call, provider: str = None):
+    """Body for a worker thread: run a call (in a provider slot) and close the thread's DB connection."""
+    try:
+        with _slot(provider), telemetry.instrument_thread():
+            return call()
+    finally:
+        # Threads here are short-lived; don't leave their connections open
+        connection.close()
+
+
+def run_concurrently(calls: list, provider: str = None, max_workers: int = None) -> list:
+    """
+    Run zero-argument callables in parallel and return their results in order.
+
+    With a provider, calls also take one of its slots, so max_workers only
+    bounds the threads started here. A single call runs inline on the
+    calling thread. Exceptions propagate once every call has finished;
+    callables that must not fail the batch should catch their own.
+
+    Args:
+        calls: Zero-argument callables
+        provider: Provider whose concurrency slots the calls use, if any
+        max_workers: Thread cap (default: the provider's limit, else one per call)
+    """
+    if len(calls) <= 1:
+        with _slot(provider):
+            return [call() for call in calls]
+
+    workers = max_workers or (provider_limit(provider) if provider else len(calls))
+    with ThreadPoolExecutor(max_workers=min(workers, len(calls))) as executor:
+        # Each call runs in a copy of this context, so it reports to the request's telemetry
+        futures = [executor.submit(copy_context().run, run_in_thread, call, provider) for call in calls]
+    return [future.result() for future in futures]
@@ -0,0 +1,246 @@
+"""
+Local stand-in server for SerpAPI and Gemini.
+Replays recorded responses with configurable latency, 429s and errors so the
+integration paths can be load-tested offline without spending API credits.
+
+Point the services at it through SERPAPI_BASE_URL and GEMINI_BASE_URL.
+"""
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fake_fixtures'
+GEMINI_PATH = re.compile(r'/models/(?P<model>[^/:]+):(?P<method>generateContent|streamGenerateContent)$')
+BATCH_VERIFY_PROMPT = re.compile(r'Answers \(1-(\d+)\):\s*$')
+STREAM_CHUNK_WORDS = 8
+
+
+def _load_fixture(fixtures_dir: Path, name: str) -> dict:
+    with open(fixtures_dir / name, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _fill(value, placeholder: str, text: str):
+    """Recursively substitute a placeholder in every string of a fixture."""
+    if isinstance(value, str):
+        return value.replace(placeholder, text)
+    if isinstance(value, list):
+        return [_fill(v, placeholder, text) for v in value]
+    if isinstance(value, dict):
+        return {k: _fill(v, placeholder, text) for k, v in value.items()}
+    return value
+
+
+class FakeAPIServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server answering SerpAPI and Gemini requests from fixtures.
+
+    Args:
+        port: Port to bind (0 picks a free one)
+        latency_ms: Mean added latency per request
+        jitter_ms: Uniform +/- spread around the mean latency
+        chunk_delay_ms: Delay between streamed chunks
+        rate_limit_ratio: Fraction of requests answered with 429
+        error_ratio: Fraction of requests answered with 500
+        retry_after: Retry-After header value sent with 429s
+        fixtures_dir: Directory holding the recorded responses
+        seed: Seed for the fault-injection RNG
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, latency_ms=0, jitter_ms=0, chunk_delay_ms=0,
+                 rate_limit_ratio=0.0, error_ratio=0.0, retry_after=1,
+                 fixtures_dir=None, seed=None):
+        super().__init__((host, port), FakeAPIRequestHandler)
+        fixtures_dir = Path(fixtures_dir) if fixtures_dir else FIXTURES_DIR
+        self.serpapi_search = _load_fixture(fixtures_dir, 'serpapi_search.json')
+        self.serpapi_account = _load_fixture(fixtures_dir, 'serpapi_account.json')
+        self.gemini = _load_fixture(fixtures_dir, 'gemini_generate.json')
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.chunk_delay_ms = chunk_delay_ms
+        self.rate_limit_ratio = rate_limit_ratio
+        self.error_ratio = error_ratio
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {}
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        """Serve from a background thread (used by the pytest fixture)."""
+        self._thread = threading.Thread(target=self.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def draw_fault(self):
+        """Pick the simulated latency and status for one request."""
+        with self._lock:
+            delay = max(0.0, self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            roll = self._random.random()
+        if roll < self.rate_limit_ratio:
+            return delay, 429
+        if roll < self.rate_limit_ratio + self.error_ratio:
+            return delay, 500
+        return delay, 200
+
+    def record(self, route: str, status: int):
+        with self._lock:
+            route_stats = self.stats.setdefault(route, {})
+            route_stats[status] = route_stats.get(status, 0) + 1
+
+    def add(self, counter: str, amount: int):
+        with self._lock:
+            self.stats[counter] = self.stats.get(counter, 0) + amount
+
+    def search_response(self, query: str, num: int) -> dict:
+        recorded = self.serpapi_search['queries'].get(query.lower())
+        data = recorded or _fill(self.serpapi_search['default'], '{q}', query)
+        data = dict(data)
+        data['organic_results'] = data.get('organic_results', [])[:num]
+        return data
+
+    def generate_text(self, prompt: str) -> str:
+        batch = BATCH_VERIFY_PROMPT.search(prompt)
+        if batch:
+            return '\n'.join(f"{n}. {self.gemini['verify_answer']}" for n in range(1, int(batch.group(1)) + 1))
+        if 'answer only yes or no' in prompt.lower():
+            return self.gemini['verify_answer']
+        recorded = self.gemini['prompts'].get(prompt)
+        return recorded if recorded is not None else self.gemini['default'].replace('{prompt}', prompt)
+
+
+class FakeAPIRequestHandler(BaseHTTPRequestHandler):
+    """Routes SerpAPI (/search, /account) and Gemini (/models/...) requests."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass  # Keep load-test output quiet
+
+    def _send_json(self, status: int, payload: dict, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _inject_fault(self, route: str) -> bool:
+        """Sleep for the simulated latency; returns True if a fault was sent."""
+        delay, status = self.server.draw_fault()
+        if delay:
+            time.sleep(delay)
+        self.server.record(route, status)
+        if status == 429:
+            self._send_json(429, {'error': {'code': 429, 'status': 'RESOURCE_EXHAUSTED'}},
+                            headers={'Retry-After': str(self.server.retry_after)})
+            return True
+        if status == 500:
+            self._send_json(500, {'error': {'code': 500, 'status': 'INTERNAL'}})
+            return True
+        return False
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if url.path == '/__stats__':
+            return self._send_json(200, self.server.stats)
+
+        if url.path.endswith('/account'):
+            if not self._inject_fault('serpapi.account'):
+                self._send_json(200, self.server.serpapi_account)
+            return
+
+        if url.path.endswith('/search'):
+            if not params.get('api_key'):
+                return self._send_json(401, {'error': 'Invalid API key.'})
+            if not self._inject_fault('serpapi.search'):
+                num = int(params.get('num', 10))
+                self._send_json(200, self.server.search_response(params.get('q', ''), num))
+            return
+
+        self._send_json(404, {'error': f'Unknown path {url.path}'})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        match = GEMINI_PATH.search(url.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length) or b'{}')
+
+        if not match:
+            return self._send_json(404, {'error': f'Unknown path {url.path}'})
+        if self._inject_fault(f"gemini.{match.group('method')}"):
+            return
+
+        prompt = ''.join(
+            part.get('text', '')
+            for content in body.get('contents', [])
+            for part in content.get('parts', [])
+        )
+        text = self.server.generate_text(prompt)
+
+        if match.group('method') == 'streamGenerateContent':
+            return self._send_stream(prompt, text, match.group('model'))
+        self._send_json(200, self._candidate(prompt, text, match.group('model')))
+
+    @staticmethod
+    def _candidate(prompt: str, text: str, model: str, finished: bool = True) -> dict:
+        candidate = {'content': {'parts': [{'text': text}], 'role': 'model'}, 'index': 0}
+        if finished:
+            candidate['finishReason'] = 'STOP'
+        return {
+            'candidates': [candidate],
+            'usageMetadata': {
+                'promptTokenCount': len(prompt.split()),
+                'candidatesTokenCount': len(text.split()),
+            },
+            'modelVersion': model,
+        }
+
+    def _send_stream(self, prompt: str, text: str, model: str):
+        """Send the answer as server-sent events, a few words per chunk."""
+        words = text.split(' ')
+        chunks = [
+            ' '.join(words[i:i + STREAM_CHUNK_WORDS]) + (' ' if i + STREAM_CHUNK_WORDS < len(words) else '')
+            for i in range(0, len(words), STREAM_CHUNK_WORDS)
+        ]
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        sent = 0
+        try:
+            for idx, chunk in enumerate(chunks):
+                event = self._candidate(prompt, chunk, model, finished=idx == len(chunks) - 1)
+                self.wfile.write(f'data: {json.dumps(event)}\r\n\r\n'.encode('utf-8'))
+                self.wfile.flush()
+                sent += 1
+                if self.server.chunk_delay_ms:
+                    time.sleep(self.server.chunk_delay_ms / 1000)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client stopped reading early
+        self.server.add('gemini.stream_chunks_sent', sent)
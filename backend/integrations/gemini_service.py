@@ -3,45 +3,115 @@ Gemini API integration service for AI citation checking.
 Uses Google's Gemini API to check if brands are mentioned in AI responses.
 Includes semantic detection to verify if responses describe the brand.
 """
+import json
+import random
+import re
 import time
 import requests
 from django.conf import settings
+from .brand_matcher import BrandMatcher, MultiBrandMatcher
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .llm_cache import LLMResponseCache
+from .rate_limit import RateLimitExceeded, TokenBucket
+
+VERIFY_ANSWER_RE = re.compile(r'^[\s*#-]*(\d+)\s*[.):\-]?\s*\**\s*(YES|NO)\b', re.IGNORECASE | re.MULTILINE)
 
 
 class GeminiService:
     """Service for interacting with Google's Gemini API."""
     
-    BASE_URL = 'https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent'
+    BASE_URL = 'https://generativelanguage.googleapis.com/v1beta'
+    MODEL = 'gemini-2.0-flash'
     MAX_RETRIES = 3
-    INITIAL_BACKOFF = 5  # seconds
+    INITIAL_BACKOFF = 1  # seconds
+    MAX_BACKOFF = 20  # seconds
+    CONTEXT_CHARS = 100  # Characters of context kept on each side of a mention
+    BATCH_VERIFY_SIZE = 20  # (brand, text) pairs per batched verification prompt
     
-    def __init__(self):
+    def __init__(self, max_wait: float = None, fresh: bool = False):
         self.api_key = getattr(settings, 'GEMINI_API_KEY', '')
+        self.base_url = (getattr(settings, 'GEMINI_BASE_URL', '') or self.BASE_URL).rstrip('/')
+        self.generate_url = f"{self.base_url}/models/{self.MODEL}:generateContent"
+        self.stream_url = f"{self.base_url}/models/{self.MODEL}:streamGenerateContent"
+        # Longest a single call may wait on rate limiting before failing fast
+        self.max_wait = max_wait if max_wait is not None else getattr(settings, 'GEMINI_MAX_WAIT_SECONDS', 10)
+        self.limiter = TokenBucket(
+            'gemini',
+            rate_per_minute=getattr(settings, 'GEMINI_RATE_LIMIT_PER_MINUTE', 15),
+            capacity=getattr(settings, 'GEMINI_RATE_LIMIT_BURST', 5)
+        )
+        self.breaker = CircuitBreaker('gemini')
+        # fresh=True skips cached answers but still stores the new ones
+        self.cache = LLMResponseCache(self.MODEL) if getattr(settings, 'LLM_CACHE_ENABLED', True) else None
+        self.fresh = fresh
+    
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self.MAX_BACKOFF, self.INITIAL_BACKOFF * (2 ** attempt)))
+    
+    @staticmethod
+    def _retry_after(response: requests.Response):
+        """Seconds from a Retry-After header, if the provider sent one."""
+        try:
+            return float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
     
-    def _make_request(self, json_data: dict, timeout: int = 30) -> requests.Response:
-        """Make API request with retry logic for rate limiting."""
+    def _make_request(self, json_data: dict, timeout: int = 30, stream: bool = False) -> requests.Response:
+        """
+        Make an API request paced by the shared rate limiter.
+        
+        Retries 429s (honoring Retry-After) and transient errors with jittered
+        backoff, but never waits past the call's deadline: once the next
+        attempt can't start in time a RateLimitExceeded is raised so the
+        caller can report a retriable error straight away. While the Gemini
+        circuit is open, CircuitOpenError is raised without calling the API.
+        
+        With stream=True the streaming endpoint is used and the response body
+        is left unread for the caller to consume as server-sent events.
+        """
+        url = self.stream_url if stream else self.generate_url
+        params = {'key': self.api_key}
+        if stream:
+            params['alt'] = 'sse'
+        deadline = time.monotonic() + self.max_wait
+        
         for attempt in range(self.MAX_RETRIES):
+            self.limiter.acquire(max_wait=max(0.0, deadline - time.monotonic()))
+            
             try:
-                response = requests.post(
-                    f"{self.BASE_URL}?key={self.api_key}",
-                    headers={'Content-Type': 'application/json'},
-                    json=json_data,
-                    timeout=timeout
-                )
-                
-                if response.status_code == 429:
-                    # Rate limited - wait and retry
-                    wait_time = self.INITIAL_BACKOFF * (2 ** attempt)
-                    time.sleep(wait_time)
-                    continue
-                
-                response.raise_for_status()
-                return response
-                
+                with self.breaker.call():
+                    response = requests.post(
+                        url,
+                        params=params,
+                        headers={'Content-Type': 'application/json'},
+                        json=json_data,
+                        timeout=timeout,
+                        stream=stream
+                    )
+                    if response.status_code != 429:
+                        response.raise_for_status()
+            except CircuitOpenError:
+                raise
             except requests.exceptions.RequestException as e:
-                if attempt == self.MAX_RETRIES - 1:
+                if e.response is not None:
+                    e.response.close()  # Hand a streamed connection back to the pool
+                backoff = self._backoff(attempt)
+                if attempt == self.MAX_RETRIES - 1 or time.monotonic() + backoff > deadline:
                     raise
-                time.sleep(self.INITIAL_BACKOFF * (2 ** attempt))
+                time.sleep(backoff)
+                continue
+            
+            if response.status_code == 429:
+                # Pause everyone sharing the quota, not just this thread
+                retry_after = self._retry_after(response) or self._backoff(attempt)
+                self.limiter.block(retry_after)
+                response.close()
+                if attempt == self.MAX_RETRIES - 1:
+                    raise RateLimitExceeded('Gemini rate limit exceeded', retry_after=retry_after)
+                continue
+            
+            return response
         
         return response
     
@@ -56,6 +126,35 @@ class GeminiService:
                         response_text += part['text']
         return response_text
     
+    def _cached_response(self, prompt: str, config: dict, contains: str = ''):
+        """
+        Cached answer for a prompt, unless the cache is off or bypassed.
+        
+        Answers cut short by an early-stopped stream are only served when
+        they contain the text being looked for.
+        """
+        if self.cache is None or self.fresh:
+            return None
+        return self.cache.get(prompt, config, contains=contains)
+    
+    def _store_response(self, prompt: str, config: dict, response_text: str, complete: bool = True):
+        if self.cache is not None and response_text:
+            self.cache.set(prompt, config, response_text, complete=complete)
+    
+    def _generate_text(self, prompt: str, config: dict, timeout: int = 30) -> str:
+        """Buffered answer to a prompt, served from the response cache when possible."""
+        cached = self._cached_response(prompt, config)
+        if cached is not None:
+            return cached.response_text
+        
+        response = self._make_request({
+            'contents': [{'parts': [{'text': prompt}]}],
+            'generationConfig': config
+        }, timeout=timeout)
+        response_text = self._extract_response_text(response.json())
+        self._store_response(prompt, config, response_text)
+        return response_text
+    
     def _semantic_verify(self, brand_name: str, response_text: str) -> bool:
         """
         Use Gemini to semantically verify if the response describes the brand.
@@ -73,28 +172,190 @@ Text to analyze:
 
 Answer only YES or NO:"""
             
-            response = self._make_request({
-                'contents': [{'parts': [{'text': verify_prompt}]}],
-                'generationConfig': {
-                    'temperature': 0.1,
-                    'maxOutputTokens': 10,
-                }
-            }, timeout=15)
-            
-            verify_text = self._extract_response_text(response.json()).strip().upper()
+            verify_text = self._generate_text(verify_prompt, {
+                'temperature': 0.1,
+                'maxOutputTokens': 10,
+            }, timeout=15).strip().upper()
             return 'YES' in verify_text
             
         except Exception:
             return False
     
-    def check_brand_citation(self, brand_name: str, query: str) -> dict:
+    def _verify_batch_request(self, items: list) -> dict:
+        """
+        Ask Gemini to verify several (brand, text) pairs in one prompt.
+        
+        Returns:
+            dict of item number (1-based) -> bool for every answer that
+            could be parsed; conflicting or missing numbers are left out
+        """
+        blocks = [
+            f'{number}. Company/product: "{brand_name}"\nText: """{response_text[:800]}"""'
+            for number, (brand_name, response_text) in enumerate(items, start=1)
+        ]
+        verify_prompt = (
+            "For each numbered item below, decide whether the text describes or discusses "
+            "the named company/product.\n"
+            'Reply with exactly one line per item in the form "<number>. YES" or "<number>. NO" '
+            "and nothing else.\n\n" + '\n\n'.join(blocks) + f"\n\nAnswers (1-{len(items)}):"
+        )
+        
+        answer_text = self._generate_text(verify_prompt, {
+            'temperature': 0.1,
+            'maxOutputTokens': 8 * len(items) + 16,
+        }, timeout=30)
+        
+        answers = {}
+        conflicting = set()
+        for number, answer in VERIFY_ANSWER_RE.findall(answer_text):
+            number, verdict = int(number), answer.upper() == 'YES'
+            if number in answers and answers[number] != verdict:
+                conflicting.add(number)
+            answers[number] = verdict
+        
+        return {
+            number: verdict for number, verdict in answers.items()
+            if 1 <= number <= len(items) and number not in conflicting
+        }
+    
+    def batch_semantic_verify(self, items: list) -> list:
+        """
+        Semantically verify many (brand_name, response_text) pairs.
+        
+        Pairs are packed BATCH_VERIFY_SIZE to a prompt with a numbered
+        YES/NO answer format. Entries whose answer can't be parsed fall back
+        to a single _semantic_verify call.
+        
+        Args:
+            items: List of (brand_name, response_text) tuples
+            
+        Returns:
+            List of bools in the same order as items
+        """
+        results = [False] * len(items)
+        pending = [
+            (idx, brand_name, response_text)
+            for idx, (brand_name, response_text) in enumerate(items)
+            if response_text and len(response_text) >= 20
+        ]
+        
+        for start in range(0, len(pending), self.BATCH_VERIFY_SIZE):
+            chunk = pending[start:start + self.BATCH_VERIFY_SIZE]
+            try:
+                answers = self._verify_batch_request([(brand, text) for _, brand, text in chunk])
+            except requests.exceptions.RequestException:
+                continue  # Same as a failed single verification: not mentioned
+            
+            for number, (idx, brand_name, response_text) in enumerate(chunk, start=1):
+                if number in answers:
+                    results[idx] = answers[number]
+                else:
+                    results[idx] = self._semantic_verify(brand_name, response_text)
+        
+        return results
+    
+    def _apply_verification(self, result: dict, response_text: str, mentioned: bool) -> dict:
+        """Fill in a citation result from a semantic verification outcome."""
+        result.update(
+            mentioned=mentioned,
+            semantic_match=mentioned,
+            match_stage='semantic',
+            needs_verification=False,
+        )
+        if mentioned:
+            # Semantic match - use first part of response as context
+            result['citation_context'] = response_text[:200] + '...' if len(response_text) > 200 else response_text
+        return result
+    
+    def resolve_verifications(self, pending: list):
+        """
+        Complete citation results returned with needs_verification in one batch.
+        
+        Args:
+            pending: List of (brand_name, result) from check_brand_citation(defer_verify=True)
+        """
+        pending = [(brand_name, result) for brand_name, result in pending if result.get('needs_verification')]
+        verdicts = self.batch_semantic_verify([
+            (brand_name, result['response_text']) for brand_name, result in pending
+        ])
+        for (brand_name, result), mentioned in zip(pending, verdicts):
+            self._apply_verification(result, result.pop('response_text'), mentioned)
+    
+    def _iter_stream_text(self, response: requests.Response):
+        """
+        Yield the text of each server-sent event chunk as it arrives.
+        
+        Raises:
+            requests.exceptions.JSONDecodeError: on a malformed chunk, so
+                callers handle it like any other failed request
+        """
+        response.encoding = 'utf-8'
+        for line in response.iter_lines(decode_unicode=True):
+            if line and line.startswith('data:'):
+                try:
+                    data = json.loads(line[5:])
+                except json.JSONDecodeError as e:
+                    raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos, response=response)
+                yield self._extract_response_text(data)
+    
+    def _scan_stream(self, response: requests.Response, brand_name: str):
+        """
+        Read a streamed answer until the brand's context window is complete.
+        
+        Returns:
+            (text read so far, position of the first mention or -1, stopped early)
+        """
+        brand_lower = brand_name.lower()
+        text = ''
+        text_lower = ''
+        pos = -1
+        
+        try:
+            for chunk in self._iter_stream_text(response):
+                text += chunk
+                text_lower += chunk.lower()
+                if pos < 0:
+                    # Only the new chunk plus a name-length overlap can hold a new match
+                    pos = text_lower.find(brand_lower, max(0, len(text_lower) - len(chunk) - len(brand_lower)))
+                if pos >= 0 and len(text) >= pos + len(brand_name) + self.CONTEXT_CHARS:
+                    return text, pos, True
+        finally:
+            response.close()
+        
+        return text, pos, False
+    
+    def _mention_context(self, response_text: str, pos: int, mention_end: int, truncated: bool = False) -> str:
+        """Text around a mention, with ellipses where it was cut."""
+        start = max(0, pos - self.CONTEXT_CHARS)
+        end = min(len(response_text), mention_end + self.CONTEXT_CHARS)
+        context = response_text[start:end]
+        if start > 0:
+            context = '...' + context
+        if end < len(response_text) or truncated:
+            context = context + '...'
+        return context
+    
+    def check_brand_citation(self, brand_name: str, query: str, stream: bool = None,
+                             matcher: BrandMatcher = None, defer_verify: bool = False) -> dict:
         """
         Check if a brand is mentioned when asking Gemini a question.
         Uses semantic detection to verify even when brand name isn't explicit.
         
+        In streaming mode the answer is scanned as it arrives and the stream
+        is closed as soon as a direct mention and its context are in hand.
+        Answers without a direct mention go through the local matcher
+        cascade first; semantic verification by Gemini only runs for
+        answers the cascade can't decide.
+        
         Args:
             brand_name: Name of the brand to look for
             query: Question to ask Gemini
+            stream: Use the streaming endpoint (defaults to GEMINI_STREAMING)
+            matcher: Brand profile matcher (BrandMatcher.for_brand); a
+                name-only matcher is used if omitted
+            defer_verify: Don't run semantic verification; return the result
+                with needs_verification set so the caller can resolve many
+                at once with resolve_verifications()
             
         Returns:
             dict with citation result
@@ -102,59 +363,143 @@ Answer only YES or NO:"""
         if not self.api_key:
             return {'error': 'Gemini API key not configured', 'mentioned': False}
         
+        if stream is None:
+            stream = getattr(settings, 'GEMINI_STREAMING', True)
+        
+        config = {
+            'temperature': 0.7,
+            'maxOutputTokens': 1024,
+        }
+        
         try:
-            response = self._make_request({
-                'contents': [{'parts': [{'text': query}]}],
-                'generationConfig': {
-                    'temperature': 0.7,
-                    'maxOutputTokens': 1024,
-                }
-            })
-            data = response.json()
-            response_text = self._extract_response_text(data)
+            cached = self._cached_response(query, config, contains=brand_name)
             
-            # First check: direct mention (case-insensitive)
-            brand_lower = brand_name.lower()
-            response_lower = response_text.lower()
-            direct_mention = brand_lower in response_lower
-            
-            # Second check: semantic verification if no direct mention
-            mentioned = direct_mention
-            if not direct_mention and response_text:
-                mentioned = self._semantic_verify(brand_name, response_text)
-            
-            # Extract context
-            context = ''
-            if direct_mention:
-                pos = response_lower.find(brand_lower)
-                start = max(0, pos - 100)
-                end = min(len(response_text), pos + len(brand_name) + 100)
-                context = response_text[start:end]
-                if start > 0:
-                    context = '...' + context
-                if end < len(response_text):
-                    context = context + '...'
-            elif mentioned:
-                # Semantic match - use first part of response as context
-                context = response_text[:200] + '...' if len(response_text) > 200 else response_text
+            if cached is not None:
+                response_text = cached.response_text
+                pos = response_text.lower().find(brand_name.lower())
+                stopped_early = not cached.complete
+            else:
+                response = self._make_request({
+                    'contents': [{'parts': [{'text': query}]}],
+                    'generationConfig': config
+                }, stream=stream)
+                
+                if stream:
+                    response_text, pos, stopped_early = self._scan_stream(response, brand_name)
+                else:
+                    response_text = self._extract_response_text(response.json())
+                    pos = response_text.lower().find(brand_name.lower())
+                    stopped_early = False
+                self._store_response(query, config, response_text, complete=not stopped_early)
             
-            return {
-                'mentioned': mentioned,
+            # First check: direct mention (case-insensitive)
+            direct_mention = pos >= 0
+            result = {
+                'mentioned': direct_mention,
                 'direct_mention': direct_mention,
-                'semantic_match': mentioned and not direct_mention,
-                'citation_context': context if mentioned else 'Brand not described in response',
+                'semantic_match': False,
+                'match_stage': 'direct' if direct_mention else None,
+                'citation_context': 'Brand not described in response',
                 'full_response': response_text[:500] if response_text else '',
+                'stopped_early': stopped_early,
+                'cached': cached is not None,
+                'needs_verification': False,
                 'success': True
             }
             
+            if direct_mention:
+                result['citation_context'] = self._mention_context(
+                    response_text, pos, pos + len(brand_name), truncated=stopped_early
+                )
+            elif response_text:
+                # Second check: local matcher cascade (aliases, domain, fuzzy, profile)
+                verdict = (matcher or BrandMatcher(brand_name)).classify(response_text)
+                result['match_stage'] = verdict['stage']
+                
+                if verdict['outcome'] == BrandMatcher.MATCH:
+                    result['mentioned'] = True
+                    result['citation_context'] = self._mention_context(response_text, *verdict['span'])
+                elif verdict['outcome'] == BrandMatcher.AMBIGUOUS:
+                    # Last resort: semantic verification by Gemini
+                    if defer_verify:
+                        result.update(needs_verification=True, match_stage='pending', response_text=response_text)
+                    else:
+                        self._apply_verification(
+                            result, response_text, self._semantic_verify(brand_name, response_text)
+                        )
+            
+            return result
+            
         except requests.exceptions.RequestException as e:
             return {
                 'error': str(e),
                 'mentioned': False,
                 'citation_context': f'API error: {str(e)}',
-                'success': False
+                'success': False,
+                'retriable': getattr(e, 'retriable', False),
+                'retry_after': getattr(e, 'retry_after', None)
             }
     
+    def check_group_citation(self, query: str, matchers: dict) -> dict:
+        """
+        Ask a shared prompt once and check the answer for a whole group of brands.
+        
+        The full answer is needed to judge every brand, so this always uses
+        the buffered endpoint (and the response cache).
+        
+        Args:
+            query: Prompt shared by the group, e.g. a category question
+            matchers: dict of key (e.g. brand id) -> BrandMatcher
+            
+        Returns:
+            dict with the shared response and per-key citation results
+        """
+        if not self.api_key:
+            return {'error': 'Gemini API key not configured', 'success': False}
+        
+        config = {
+            'temperature': 0.7,
+            'maxOutputTokens': 1024,
+        }
+        
+        try:
+            cached = self._cached_response(query, config)
+            if cached is not None:
+                response_text = cached.response_text
+            else:
+                response = self._make_request({
+                    'contents': [{'parts': [{'text': query}]}],
+                    'generationConfig': config
+                })
+                response_text = self._extract_response_text(response.json())
+                self._store_response(query, config, response_text)
+        except requests.exceptions.RequestException as e:
+            return {
+                'error': str(e),
+                'success': False,
+                'retriable': getattr(e, 'retriable', False),
+                'retry_after': getattr(e, 'retry_after', None)
+            }
+        
+        found = MultiBrandMatcher(matchers).scan(response_text)
+        results = {}
+        for key in matchers:
+            hit = found.get(key)
+            results[key] = {
+                'mentioned': hit is not None,
+                'match_stage': hit['stage'] if hit else None,
+                'citation_context': (
+                    self._mention_context(response_text, *hit['span']) if hit else 'Brand not described in response'
+                ),
+            }
+        
+        return {
+            'full_response': response_text[:500],
+            'cached': cached is not None,
+            'results': results,
+            'success': True
+        }
+    
     def test_connection(self) -> dict:
         """Test the Gemini API connection."""
         if not self.api_key:
@@ -0,0 +1,119 @@
+"""
+Persistent, content-addressed cache for LLM answers.
+Identical prompts (same model and generation config) are answered from the
+database until they expire, so repeated refreshes within a day don't spend
+any Gemini quota. The table is bounded: least recently used rows are evicted
+once it grows past LLM_CACHE_MAX_ENTRIES. Eviction runs on about one write in
+LLM_CACHE_EVICT_EVERY rather than on each one, so the table may briefly run
+that many rows over the bound.
+"""
+import hashlib
+import json
+import random
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+from . import metrics
+from .models import LLMResponse
+
+
+def cache_key(model: str, prompt: str, config: dict) -> str:
+    """sha256 over the model, prompt and generation config."""
+    payload = json.dumps([model, prompt, config or {}], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Read-through cache of LLM answers backed by the LLMResponse table.
+
+    Args:
+        model: Model name, part of every key
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+        self.ttl = timedelta(seconds=getattr(settings, 'LLM_CACHE_TTL_SECONDS', 86400))
+        self.max_entries = getattr(settings, 'LLM_CACHE_MAX_ENTRIES', 10000)
+        self.evict_every = max(1, getattr(settings, 'LLM_CACHE_EVICT_EVERY', 100))
+
+    def get(self, prompt: str, config: dict, contains: str = ''):
+        """
+        Look up a cached answer.
+
+        Args:
+            contains: Text a partial (early-stopped) answer must include to
+                be usable; complete answers are always served, partial ones
+                never without it
+
+        Returns:
+            LLMResponse or None on a miss (expired rows count as misses)
+        """
+        now = timezone.now()
+        entry = LLMResponse.objects.filter(
+            key=cache_key(self.model, prompt, config), expires_at__gt=now
+        ).first()
+
+        if entry is not None and not entry.complete and (
+            not contains or contains.lower() not in entry.response_text.lower()
+        ):
+            entry = None
+
+        if entry is None:
+            metrics.incr('llm_cache.misses')
+            return None
+
+        LLMResponse.objects.filter(pk=entry.pk).update(hits=F('hits') + 1, last_used_at=now)
+        metrics.incr('llm_cache.hits')
+        return entry
+
+    def set(self, prompt: str, config: dict, response_text: str, complete: bool = True):
+        """Store (or replace) an answer; now and then also evict down to the size bound."""
+        now = timezone.now()
+        defaults = {
+            'model': self.model,
+            'prompt': prompt,
+            'response_text': response_text,
+            'complete': complete,
+            'expires_at': now + self.ttl,
+            'last_used_at': now,
+        }
+        try:
+            LLMResponse.objects.update_or_create(key=cache_key(self.model, prompt, config), defaults=defaults)
+        except IntegrityError:
+            return  # Another worker stored the same prompt first
+        # The expired-row DELETE and COUNT(*) grow with the table: not on every write
+        if random.randrange(self.evict_every) == 0:
+            self.evict(now)
+
+    def evict(self, now=None) -> int:
+        """Drop expired rows, then the least recently used ones above max_entries."""
+        now = now or timezone.now()
+        evicted, _ = LLMResponse.objects.filter(expires_at__lte=now).delete()
+
+        overflow = LLMResponse.objects.count() - self.max_entries
+        if overflow > 0:
+            stale_ids = list(
+                LLMResponse.objects.order_by('last_used_at').values_list('id', flat=True)[:overflow]
+            )
+            evicted += LLMResponse.objects.filter(id__in=stale_ids).delete()[0]
+
+        if evicted:
+            metrics.incr('llm_cache.evictions', evicted)
+        return evicted
+
+
+def llm_cache_stats() -> dict:
+    """Hit rate of the LLM response cache and its current size."""
+    counters = metrics.snapshot('llm_cache.')
+    hits = counters.get('llm_cache.hits', 0)
+    misses = counters.get('llm_cache.misses', 0)
+    return {
+        'entries': LLMResponse.objects.count(),
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': metrics.ratio(hits, hits + misses),
+        'evictions': counters.get('llm_cache.evictions', 0),
+    }
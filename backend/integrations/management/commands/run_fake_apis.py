@@ -0,0 +1,61 @@
+"""
+Management command to run the local SerpAPI/Gemini stand-in server.
+
+Usage:
+    python manage.py run_fake_apis --port 8765 --latency-ms 300 --rate-limit-ratio 0.05
+    SERPAPI_BASE_URL=http://127.0.0.1:8765 GEMINI_BASE_URL=http://127.0.0.1:8765 \\
+        SERPAPI_KEY=fake GEMINI_API_KEY=fake python manage.py refresh_citations
+"""
+from django.core.management.base import BaseCommand
+from integrations.fake_server import FakeAPIServer
+
+
+class Command(BaseCommand):
+    help = 'Run a local fake SerpAPI/Gemini server that replays recorded responses'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+        parser.add_argument('--port', type=int, default=8765, help='Port to bind (default: 8765)')
+        parser.add_argument('--latency-ms', type=float, default=0, help='Mean added latency per request')
+        parser.add_argument('--jitter-ms', type=float, default=0, help='Uniform +/- spread around the latency')
+        parser.add_argument(
+            '--chunk-delay-ms', type=float, default=0,
+            help='Delay between chunks of streamed Gemini responses (default: 0)',
+        )
+        parser.add_argument(
+            '--rate-limit-ratio', type=float, default=0.0,
+            help='Fraction of requests answered with 429 (default: 0)',
+        )
+        parser.add_argument(
+            '--error-ratio', type=float, default=0.0,
+            help='Fraction of requests answered with 500 (default: 0)',
+        )
+        parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds sent with 429s')
+        parser.add_argument('--fixtures', help='Directory with recorded responses (default: bundled fixtures)')
+        parser.add_argument('--seed', type=int, help='Seed for fault injection')
+
+    def handle(self, *args, **options):
+        server = FakeAPIServer(
+            host=options['host'],
+            port=options['port'],
+            latency_ms=options['latency_ms'],
+            jitter_ms=options['jitter_ms'],
+            chunk_delay_ms=options['chunk_delay_ms'],
+            rate_limit_ratio=options['rate_limit_ratio'],
+            error_ratio=options['error_ratio'],
+            retry_after=options['retry_after'],
+            fixtures_dir=options['fixtures'],
+            seed=options['seed'],
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Fake SerpAPI/Gemini server on {server.base_url}'))
+        self.stdout.write(f'  export SERPAPI_BASE_URL={server.base_url} GEMINI_BASE_URL={server.base_url}')
+        self.stdout.write(f'  Request stats: {server.base_url}/__stats__')
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f'\nServed: {server.stats}')
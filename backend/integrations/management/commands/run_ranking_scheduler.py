@@ -0,0 +1,49 @@
+"""
+Management command to spend the released SerpAPI credits on due ranking checks.
+Meant to be run from cron (e.g. hourly); each run only spends what the budget allows.
+"""
+from django.core.management.base import BaseCommand
+from integrations.scheduler import SerpAPICreditScheduler
+
+
+class Command(BaseCommand):
+    help = 'Run due ranking checks within the SerpAPI credit budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Spend at most this many credits in this run',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show the plan without calling SerpAPI',
+        )
+
+    def handle(self, *args, **options):
+        scheduler = SerpAPICreditScheduler()
+
+        if options['dry_run']:
+            scheduler.sync_budget()
+            summary = scheduler.describe()
+            budget = summary['budget']
+            self.stdout.write(
+                f"Credits left: {budget['searches_left']} (resets {budget['period_resets_on']}), "
+                f"spent today: {budget['spent_today']}, allowance now: {summary['allowance_now']}"
+            )
+            for item in summary['plan']:
+                marker = '→' if item['runs_now'] else ' '
+                self.stdout.write(
+                    f"  {marker} {item['keyword']} (score {item['score']}, {len(item['brand_ids'])} brands)"
+                )
+            return
+
+        result = scheduler.run(limit=options['limit'])
+        failed = len([r for r in result['results'] if not r.get('success')])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Spent {result['credits_spent']}/{result['allowance']} credits, "
+            f"{len(result['results']) - failed} checks updated, {failed} failed. "
+            f"{result['credits_left']} credits left."
+        ))
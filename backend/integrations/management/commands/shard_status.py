@@ -0,0 +1,43 @@
+"""
+Management command summarizing sharded refresh runs (the coordinator view).
+"""
+from datetime import date
+from django.core.management.base import BaseCommand
+from integrations.sharding import shard_summary
+
+
+class Command(BaseCommand):
+    help = 'Show per-shard completion of sharded refresh jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--job',
+            type=str,
+            help='Only show this job (e.g. refresh_citations)',
+        )
+        parser.add_argument(
+            '--date',
+            type=date.fromisoformat,
+            help='Day to report, YYYY-MM-DD (default: today)',
+        )
+
+    def handle(self, *args, **options):
+        summary = shard_summary(job=options['job'], run_date=options['date'])
+
+        if not summary:
+            self.stdout.write(self.style.WARNING('No sharded runs recorded for that day'))
+            return
+
+        for run in summary:
+            style = self.style.SUCCESS if run['finished'] == run['shard_count'] else self.style.WARNING
+            self.stdout.write(style(
+                f"{run['job']}: {run['finished']}/{run['shard_count']} shards finished"
+            ))
+            for shard in run['shards']:
+                if shard['state'] == 'missing':
+                    self.stdout.write(self.style.ERROR(f"  {shard['shard']:>7}  missing"))
+                    continue
+                self.stdout.write(
+                    f"  {shard['shard']:>7}  {shard['state']:<8} {shard['done']}/{shard['total']} "
+                    f"({shard['percent']}%), {shard['failed']} failed  {shard['host']}:{shard['pid']}"
+                )
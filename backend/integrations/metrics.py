@@ -0,0 +1,36 @@
+"""
+Lightweight counters for integration paths, stored in the Django cache.
+Used to report hit rates (matcher stages, response cache) without a
+metrics stack; counters are per cache backend and reset with it.
+"""
+from django.core.cache import cache
+
+KEY_PREFIX = 'metrics:'
+COUNTERS_KEY = f'{KEY_PREFIX}__names__'
+
+
+def incr(name: str, amount: int = 1):
+    """Increment a named counter."""
+    key = f'{KEY_PREFIX}{name}'
+    if cache.add(key, amount, None):
+        names = cache.get(COUNTERS_KEY) or set()
+        if name not in names:
+            cache.set(COUNTERS_KEY, names | {name}, None)
+        return
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.set(key, amount, None)
+
+
+def snapshot(prefix: str = '') -> dict:
+    """Current values of all counters whose name starts with prefix."""
+    names = sorted(name for name in (cache.get(COUNTERS_KEY) or set()) if name.startswith(prefix))
+    values = cache.get_many([f'{KEY_PREFIX}{name}' for name in names])
+    return {name: values.get(f'{KEY_PREFIX}{name}', 0) for name in names}
+
+
+def ratio(part: int, whole: int) -> float:
+    """Percentage rounded like the rest of the API (one decimal)."""
+    return round(part / whole * 100, 1) if whole else 0
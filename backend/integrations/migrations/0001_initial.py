@@ -0,0 +1,45 @@
+# Generated by Django 6.0 on 2026-10-19 01:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('brands', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CreditBudget',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(max_length=50, unique=True)),
+                ('searches_left', models.IntegerField(default=0, help_text='Credits left in the current period')),
+                ('searches_per_period', models.IntegerField(default=0)),
+                ('period_resets_on', models.DateField(blank=True, null=True)),
+                ('spent_today', models.IntegerField(default=0)),
+                ('spent_on', models.DateField(blank=True, null=True)),
+                ('synced_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='KeywordCheck',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('keyword', models.CharField(max_length=300)),
+                ('importance', models.PositiveSmallIntegerField(default=1, help_text='Relative weight when ordering checks (higher runs first)')),
+                ('last_checked_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('brand', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='keyword_checks', to='brands.brand')),
+            ],
+            options={
+                'ordering': ['last_checked_at'],
+                'unique_together': {('brand', 'keyword')},
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-19 01:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0002_llmresponse'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShardProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job', models.CharField(help_text='Command name, e.g. refresh_citations', max_length=50)),
+                ('run_date', models.DateField()),
+                ('shard_index', models.PositiveIntegerField(help_text='1-based shard number')),
+                ('shard_count', models.PositiveIntegerField()),
+                ('host', models.CharField(blank=True, max_length=255)),
+                ('pid', models.PositiveIntegerField(blank=True, null=True)),
+                ('total', models.PositiveIntegerField(default=0, help_text='Checks assigned to the shard')),
+                ('done', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('started_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-run_date', 'job', 'shard_count', 'shard_index'],
+                'unique_together': {('job', 'run_date', 'shard_index', 'shard_count')},
+            },
+        ),
+    ]
@@ -0,0 +1,94 @@
+from django.db import models
+from brands.models import Brand
+
+
+class KeywordCheck(models.Model):
+    """A (brand, keyword) ranking check managed by the SerpAPI credit scheduler."""
+
+    brand = models.ForeignKey(Brand, on_delete=models.CASCADE, related_name='keyword_checks')
+    keyword = models.CharField(max_length=300)
+    importance = models.PositiveSmallIntegerField(
+        default=1, help_text='Relative weight when ordering checks (higher runs first)'
+    )
+    last_checked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['last_checked_at']
+        unique_together = ['brand', 'keyword']
+
+    def __str__(self):
+        return f'{self.brand.name} - "{self.keyword}"'
+
+
+class CreditBudget(models.Model):
+    """Persisted API credit state for a provider (one row per provider)."""
+
+    provider = models.CharField(max_length=50, unique=True)
+    searches_left = models.IntegerField(default=0, help_text='Credits left in the current period')
+    searches_per_period = models.IntegerField(default=0)
+    period_resets_on = models.DateField(null=True, blank=True)
+    spent_today = models.IntegerField(default=0)
+    spent_on = models.DateField(null=True, blank=True)
+    synced_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.provider}: {self.searches_left} credits left'
+
+
+class LLMResponse(models.Model):
+    """Cached LLM answer, addressed by a hash of (model, prompt, generation config)."""
+
+    key = models.CharField(max_length=64, unique=True)
+    model = models.CharField(max_length=100)
+    prompt = models.TextField()
+    response_text = models.TextField()
+    complete = models.BooleanField(
+        default=True, help_text='False when the answer was cut short (stream stopped early)'
+    )
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+    last_used_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f'{self.model}: "{self.prompt[:50]}"'
+
+
+class ShardProgress(models.Model):
+    """Progress of one shard of a sharded refresh job for a day."""
+
+    job = models.CharField(max_length=50, help_text='Command name, e.g. refresh_citations')
+    run_date = models.DateField()
+    shard_index = models.PositiveIntegerField(help_text='1-based shard number')
+    shard_count = models.PositiveIntegerField()
+    host = models.CharField(max_length=255, blank=True)
+    pid = models.PositiveIntegerField(null=True, blank=True)
+    total = models.PositiveIntegerField(default=0, help_text='Checks assigned to the shard')
+    done = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-run_date', 'job', 'shard_count', 'shard_index']
+        unique_together = ['job', 'run_date', 'shard_index', 'shard_count']
+
+    def __str__(self):
+        return f'{self.job} {self.run_date} shard {self.shard_index}/{self.shard_count}'
+
+
+class ProviderState(models.Model):
+    """
+    State shared by every worker for one outbound-call guard, e.g. the Gemini
+    token bucket or the SerpAPI circuit breaker (see integrations.provider_state).
+    """
+
+    key = models.CharField(max_length=100, unique=True)
+    state = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,39 @@
+"""
+Database-backed state shared by every worker process for outbound-call
+guards (the token bucket in rate_limit and the circuit breaker).
+
+Each guard keeps a small JSON dict in one ProviderState row. Updates are
+read-modify-writes under a row lock (SELECT ... FOR UPDATE), so gunicorn
+workers, cron commands and their threads all see and update the same
+state; nothing is evicted, unlike the per-process local-memory cache.
+"""
+import copy
+from contextlib import contextmanager
+from django.db import transaction
+from .models import ProviderState
+
+
+def read_state(key: str, default: dict) -> dict:
+    """The current state without locking (for checks that don't change it)."""
+    state = ProviderState.objects.filter(key=key).values_list('state', flat=True).first()
+    return state if state is not None else copy.deepcopy(default)
+
+
+@contextmanager
+def locked_state(key: str, default: dict):
+    """
+    Lock a state row for a read-modify-write.
+    
+    Yields the state dict; changes made to it are saved when the block
+    exits normally. An exception rolls the transaction back, leaving the
+    row as it was.
+    """
+    with transaction.atomic():
+        row, _ = ProviderState.objects.select_for_update().get_or_create(
+            key=key, defaults={'state': copy.deepcopy(default)}
+        )
+        state = copy.deepcopy(row.state)
+        yield state
+        if state != row.state:
+            row.state = state
+            row.save(update_fields=['state', 'updated_at'])
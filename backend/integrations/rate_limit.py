@@ -0,0 +1,90 @@
+"""
+Token-bucket rate limiting for outbound API calls.
+The bucket state lives in the database (integrations.provider_state), so every
+thread, gunicorn worker and cron process paces its calls against the same
+provider quota.
+"""
+import time
+import requests
+from .provider_state import locked_state
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """Raised when a call would have to wait longer than its deadline. Safe to retry later."""
+    
+    retriable = True
+    
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Shared token bucket with reservations.
+    
+    Each call takes one token; when the bucket is empty the caller is told
+    how long to wait for its reserved token instead of being rejected, so
+    calls are spread out at the provider's rate. A 429 from the provider
+    blocks the whole bucket until its Retry-After has passed.
+    
+    Args:
+        name: State key suffix (one bucket per provider)
+        rate_per_minute: Sustained calls allowed per minute
+        capacity: Calls allowed in a burst after an idle period
+    """
+    
+    def __init__(self, name: str, rate_per_minute: float, capacity: int = 1):
+        self.key = f'ratelimit:{name}'
+        self.interval = 60.0 / rate_per_minute
+        self.capacity = max(1, capacity)
+    
+    def _default(self) -> dict:
+        return {'tokens': self.capacity, 'updated': time.time(), 'blocked_until': 0.0}
+    
+    def _refill(self, state: dict, now: float) -> float:
+        elapsed = max(0.0, now - state['updated'])
+        return min(self.capacity, state['tokens'] + elapsed / self.interval)
+    
+    def reserve(self, max_wait: float) -> float:
+        """
+        Reserve a token.
+        
+        Args:
+            max_wait: Longest acceptable wait in seconds
+            
+        Returns:
+            Seconds the caller must wait before making its call
+            
+        Raises:
+            RateLimitExceeded: if the wait would exceed max_wait (nothing is reserved)
+        """
+        with locked_state(self.key, self._default()) as state:
+            now = time.time()
+            tokens = self._refill(state, now) - 1
+            wait = max(0.0, -tokens * self.interval, state['blocked_until'] - now)
+            
+            if wait > max_wait:
+                raise RateLimitExceeded(
+                    f'Rate limit: next slot in {wait:.1f}s exceeds the {max_wait:.1f}s deadline',
+                    retry_after=wait
+                )
+            
+            state.update(tokens=tokens, updated=now)
+        return wait
+    
+    def block(self, seconds: float):
+        """Stop handing out tokens for `seconds` (e.g. after a 429 with Retry-After)."""
+        with locked_state(self.key, self._default()) as state:
+            now = time.time()
+            state.update(
+                tokens=min(self._refill(state, now), 0.0),
+                updated=now,
+                blocked_until=max(state['blocked_until'], now + seconds)
+            )
+    
+    def acquire(self, max_wait: float):
+        """Reserve a token and sleep until it is due."""
+        wait = self.reserve(max_wait)
+        if wait > 0:
+            time.sleep(wait)
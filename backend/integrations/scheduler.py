@@ -0,0 +1,288 @@
+"""
+Quota-aware scheduler for SerpAPI ranking checks.
+Spends the remaining SerpAPI credits evenly over the refresh period, running
+the stalest and most important (brand, keyword) checks first.
+"""
+import calendar
+import heapq
+import math
+from datetime import date, timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from rankings.models import SearchRanking
+from socialbooster.bulk import upsert_rows
+from .concurrency import run_concurrently
+from .models import CreditBudget, KeywordCheck
+from .services import SerpAPIService
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Normalize a keyword so identical searches share one API call."""
+    return ' '.join(keyword.lower().split())
+
+
+def next_reset_date(today: date, reset_day: int) -> date:
+    """Return the next date on which a monthly quota resets."""
+    year, month = today.year, today.month
+    if today.day >= reset_day:
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+    day = min(reset_day, calendar.monthrange(year, month)[1])
+    return date(year, month, day)
+
+
+class SerpAPICreditScheduler:
+    """
+    Plans and runs ranking checks within the SerpAPI credit budget.
+
+    The daily budget is the credits left divided by the days until the
+    quota resets, and it is released gradually over the day so a cron job
+    can never spend tomorrow's credits this morning.
+    """
+
+    PROVIDER = 'serpapi'
+    REFRESH_PERIOD = timedelta(days=1)  # A keyword is due again after this long
+    SYNC_INTERVAL = timedelta(minutes=15)  # How often to re-read the account quota
+    NOT_FOUND_POSITION = 100
+
+    def __init__(self, service=None):
+        self.service = service or SerpAPIService()
+        self.reset_day = getattr(settings, 'SERPAPI_QUOTA_RESET_DAY', 1)
+        self.reserve = getattr(settings, 'SERPAPI_CREDIT_RESERVE', 0)
+
+    def track(self, brand, keywords, importance: int = 1):
+        """Register (brand, keyword) checks; existing checks are left untouched."""
+        KeywordCheck.objects.bulk_create(
+            [KeywordCheck(brand=brand, keyword=keyword, importance=importance) for keyword in keywords],
+            ignore_conflicts=True
+        )
+
+    def _locked_budget(self) -> CreditBudget:
+        """The budget row, locked until the surrounding transaction ends, with today's spend reset if stale."""
+        CreditBudget.objects.get_or_create(provider=self.PROVIDER)
+        budget = CreditBudget.objects.select_for_update().get(provider=self.PROVIDER)
+        today = timezone.localdate()
+        if budget.spent_on != today:
+            budget.spent_today = 0
+            budget.spent_on = today
+        return budget
+
+    def sync_budget(self, force: bool = False) -> CreditBudget:
+        """Load the persisted budget, refreshing it from the SerpAPI account if stale."""
+        now = timezone.now()
+        budget = CreditBudget.objects.filter(provider=self.PROVIDER).first()
+        usage = None
+        if force or budget is None or budget.synced_at is None or now - budget.synced_at >= self.SYNC_INTERVAL:
+            # Read the account before taking the lock, not while holding it
+            usage = self.service.get_api_usage()
+
+        with transaction.atomic():
+            budget = self._locked_budget()
+            if usage is not None and 'error' not in usage:
+                budget.searches_left = usage.get('total_searches_left', usage.get('plan_searches_left')) or 0
+                budget.searches_per_period = usage.get('searches_per_month') or 0
+                budget.synced_at = now
+            budget.period_resets_on = next_reset_date(timezone.localdate(now), self.reset_day)
+            budget.save()
+        return budget
+
+    def allowance(self, budget: CreditBudget, now=None) -> int:
+        """Number of searches that may be spent right now without running ahead of the budget."""
+        now = now or timezone.now()
+        today = timezone.localdate(now)
+        spent = budget.spent_today if budget.spent_on == today else 0
+        usable = max(0, budget.searches_left - self.reserve)
+
+        resets_on = budget.period_resets_on or next_reset_date(today, self.reset_day)
+        days_left = max(1, (resets_on - today).days)
+        daily_budget = (usable + spent) / days_left
+
+        local_now = timezone.localtime(now)
+        day_start = local_now.replace(hour=0, minute=0, second=0, microsecond=0)
+        day_elapsed = (local_now - day_start).total_seconds() / 86400
+
+        released = math.ceil(daily_budget * day_elapsed)
+        return max(0, min(usable, released - spent))
+
+    def _due_checks(self, now, brand_ids=None):
+        due = Q(last_checked_at__isnull=True) | Q(last_checked_at__lte=now - self.REFRESH_PERIOD)
+        # Deleted brands' checks wait for their purge without spending credits
+        checks = KeywordCheck.objects.select_related('brand').filter(due, brand__deleted_at__isnull=True)
+
+        if brand_ids is not None:
+            # Other brands tracking the same keyword ride along for free, whatever
+            # their shard; run() claims their checks so no other run searches them too
+            keywords = KeywordCheck.objects.filter(due, brand_id__in=brand_ids).values_list('keyword', flat=True)
+            same_keyword = Q()
+            for keyword in set(keywords):
+                same_keyword |= Q(keyword__iexact=keyword)
+            if not same_keyword:
+                return []
+            checks = checks.filter(same_keyword)
+
+        return checks
+
+    def _score(self, check, now) -> float:
+        """Priority of a check: hours of staleness weighted by importance."""
+        reference = check.last_checked_at or (check.created_at - self.REFRESH_PERIOD)
+        staleness_hours = (now - reference).total_seconds() / 3600
+        return staleness_hours * check.importance
+
+    def plan(self, limit=None, brand_ids=None, now=None) -> list:
+        """
+        Build the ordered list of searches to run next.
+
+        Args:
+            limit: Maximum number of searches (credits) to plan
+            brand_ids: Only plan keywords tracked by these brands
+
+        Returns:
+            List of dicts with keyword, score and the checks it satisfies
+        """
+        now = now or timezone.now()
+        groups = {}
+
+        for check in self._due_checks(now, brand_ids):
+            key = normalize_keyword(check.keyword)
+            group = groups.setdefault(key, {'keyword': check.keyword, 'score': 0.0, 'checks': []})
+            group['checks'].append(check)
+            group['score'] += self._score(check, now)
+
+        queue = [(-group['score'], key) for key, group in groups.items()]
+        heapq.heapify(queue)
+
+        planned = []
+        while queue and (limit is None or len(planned) < limit):
+            _, key = heapq.heappop(queue)
+            planned.append(groups[key])
+        return planned
+
+    def _adjust_spend(self, budget: CreditBudget, credits: int):
+        if not credits:
+            return
+        CreditBudget.objects.filter(pk=budget.pk).update(
+            spent_today=F('spent_today') + credits,
+            searches_left=F('searches_left') - credits
+        )
+        budget.refresh_from_db()
+
+    def run(self, limit=None, brand_ids=None) -> dict:
+        """
+        Spend the currently released credits on the highest-priority checks.
+
+        The allowance is computed, the planned searches are reserved
+        against the budget and their checks are claimed (marked as checked
+        now) in one transaction holding the budget row lock, so concurrent
+        runs (cron, shards, brand onboarding) can neither spend the same
+        credits nor plan the same checks. Searches that fail are refunded
+        and their checks released afterwards.
+
+        Args:
+            limit: Optional cap below the budget allowance
+            brand_ids: Only run keywords tracked by these brands
+
+        Returns:
+            dict with credits spent and per-check results
+        """
+        self.sync_budget()
+        with transaction.atomic():
+            budget = self._locked_budget()
+            budget.save(update_fields=['spent_today', 'spent_on', 'updated_at'])
+            allowance = self.allowance(budget)
+            if limit is not None:
+                allowance = min(allowance, limit)
+            groups = self.plan(limit=allowance, brand_ids=brand_ids)
+            self._adjust_spend(budget, len(groups))
+            now = timezone.now()
+            KeywordCheck.objects.filter(
+                id__in=[check.id for group in groups for check in group['checks']]
+            ).update(last_checked_at=now)
+
+        results = []
+        rankings = []
+        released = []
+
+        # Searches run in parallel (bounded per provider); writes happen below in one transaction
+        searches = run_concurrently(
+            [lambda keyword=group['keyword']: self.service.search_google(keyword, num_results=100) for group in groups],
+            provider=self.PROVIDER
+        )
+
+        for group, search in zip(groups, searches):
+            if 'error' in search:
+                results.extend({
+                    'brand_id': check.brand_id,
+                    'keyword': check.keyword,
+                    'success': False,
+                    'error': search['error']
+                } for check in group['checks'])
+                # The check objects still hold their last_checked_at from before the claim
+                released.extend(group['checks'])
+                continue
+
+            for check in group['checks']:
+                position = self.service.find_brand_position(check.brand.name, search['results'])
+                rankings.append({
+                    'brand_id': check.brand_id,
+                    'keyword': check.keyword,
+                    'position': position or self.NOT_FOUND_POSITION,
+                    'search_url': '',
+                    'date': timezone.localdate(now),
+                })
+                result = {
+                    'brand_id': check.brand_id,
+                    'keyword': check.keyword,
+                    'position': position,
+                    'success': True
+                }
+                if position is None:
+                    result['note'] = 'Brand not found in top 100 results'
+                results.append(result)
+
+        credits_spent = len([search for search in searches if 'error' not in search])
+        with transaction.atomic():
+            self._adjust_spend(budget, credits_spent - len(groups))
+            upsert_rows(SearchRanking, rankings, update_fields=['position'])
+            KeywordCheck.objects.bulk_update(released, ['last_checked_at'])
+
+        return {
+            'allowance': allowance,
+            'credits_spent': credits_spent,
+            'credits_left': budget.searches_left,
+            'results': results
+        }
+
+    def describe(self, limit: int = 50) -> dict:
+        """Summarize the budget as last synced and the upcoming plan for the API (read-only)."""
+        now = timezone.now()
+        budget = CreditBudget.objects.filter(provider=self.PROVIDER).first() or CreditBudget(provider=self.PROVIDER)
+        if budget.spent_on != timezone.localdate(now):
+            budget.spent_today = 0
+        allowance = self.allowance(budget, now=now)
+        planned = self.plan(limit=limit, now=now)
+
+        return {
+            'budget': {
+                'provider': budget.provider,
+                'searches_left': budget.searches_left,
+                'searches_per_period': budget.searches_per_period,
+                'period_resets_on': budget.period_resets_on.isoformat() if budget.period_resets_on else None,
+                'spent_today': budget.spent_today,
+                'synced_at': budget.synced_at.isoformat() if budget.synced_at else None,
+                'reserve': self.reserve,
+            },
+            'allowance_now': allowance,
+            'due_checks': self._due_checks(now).count(),
+            'plan': [
+                {
+                    'keyword': group['keyword'],
+                    'score': round(group['score'], 1),
+                    'brand_ids': [check.brand_id for check in group['checks']],
+                    'runs_now': idx < allowance,
+                }
+                for idx, group in enumerate(planned)
+            ]
+        }
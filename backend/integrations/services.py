@@ -5,15 +5,18 @@ Uses SerpAPI for reliable Google search results.
 import requests
 from django.conf import settings
 from datetime import date
+from .circuit_breaker import CircuitBreaker
 
 
 class SerpAPIService:
     """Service for interacting with SerpAPI for Google Search."""
     
-    BASE_URL = 'https://serpapi.com/search'
+    BASE_URL = 'https://serpapi.com'
     
     def __init__(self):
         self.api_key = getattr(settings, 'SERPAPI_KEY', '')
+        self.base_url = (getattr(settings, 'SERPAPI_BASE_URL', '') or self.BASE_URL).rstrip('/')
+        self.breaker = CircuitBreaker('serpapi')
     
     def search_google(self, query: str, num_results: int = 10) -> dict:
         """
@@ -30,19 +33,20 @@ class SerpAPIService:
             return {'error': 'SerpAPI key not configured'}
         
         try:
-            response = requests.get(
-                self.BASE_URL,
-                params={
-                    'api_key': self.api_key,
-                    'engine': 'google',
-                    'q': query,
-                    'num': num_results,
-                    'hl': 'en',
-                    'gl': 'us'
-                },
-                timeout=30
-            )
-            response.raise_for_status()
+            with self.breaker.call():
+                response = requests.get(
+                    f'{self.base_url}/search',
+                    params={
+                        'api_key': self.api_key,
+                        'engine': 'google',
+                        'q': query,
+                        'num': num_results,
+                        'hl': 'en',
+                        'gl': 'us'
+                    },
+                    timeout=30
+                )
+                response.raise_for_status()
             data = response.json()
             
             # Extract organic results
@@ -77,9 +81,30 @@ class SerpAPIService:
         if 'error' in results:
             return results
         
-        position = None
         search_results = results.get('results', [])
+        position = self.find_brand_position(brand_name, search_results)
         
+        return {
+            'keyword': keyword,
+            'brand': brand_name,
+            'position': position,
+            'found': position is not None,
+            'date': date.today().isoformat(),
+            'total_results_checked': len(search_results)
+        }
+    
+    @staticmethod
+    def find_brand_position(brand_name: str, search_results: list):
+        """
+        Find the first position at which a brand appears in organic results.
+        
+        Args:
+            brand_name: Name of the brand to look for
+            search_results: Results as returned by search_google
+            
+        Returns:
+            1-based position, or None if the brand is not present
+        """
         brand_lower = brand_name.lower()
         
         for idx, result in enumerate(search_results, start=1):
@@ -89,17 +114,9 @@ class SerpAPIService:
             
             # Check if brand name appears in title, link, or snippet
             if brand_lower in title or brand_lower in link or brand_lower in snippet:
-                position = idx
-                break
+                return idx
         
-        return {
-            'keyword': keyword,
-            'brand': brand_name,
-            'position': position,
-            'found': position is not None,
-            'date': date.today().isoformat(),
-            'total_results_checked': len(search_results)
-        }
+        return None
     
     def get_api_usage(self) -> dict:
         """Check SerpAPI account info."""
@@ -107,12 +124,13 @@ class SerpAPIService:
             return {'error': 'SerpAPI key not configured'}
         
         try:
-            response = requests.get(
-                'https://serpapi.com/account',
-                params={'api_key': self.api_key},
-                timeout=10
-            )
-            response.raise_for_status()
+            with self.breaker.call():
+                response = requests.get(
+                    f'{self.base_url}/account',
+                    params={'api_key': self.api_key},
+                    timeout=10
+                )
+                response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             return {'error': str(e)}
@@ -0,0 +1,140 @@
+"""
+Stable sharding of brands across processes and hosts.
+A brand always lands in the same shard for a given shard count, so N cron
+jobs or containers can each run `--shard i/N` without coordinating or
+checking a brand twice. Each shard records its progress in ShardProgress.
+"""
+import argparse
+import os
+import socket
+import zlib
+from datetime import date
+from django.db.models import F
+from django.utils import timezone
+from .models import ShardProgress
+
+
+def parse_shard(value: str) -> tuple:
+    """
+    Parse an 'i/N' shard spec (1-based) for argparse.
+
+    Returns:
+        (index, count) tuple
+    """
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'Expected a shard like 2/4, got "{value}"')
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f'Shard index must be between 1 and {max(count, 1)}, got "{value}"')
+    return index, count
+
+
+def shard_of(brand_id: int, count: int) -> int:
+    """1-based shard a brand belongs to; crc32 keeps it stable across processes."""
+    return zlib.crc32(str(brand_id).encode()) % count + 1
+
+
+def shard_brands(queryset, shard):
+    """Restrict a Brand queryset to one shard (no-op when shard is None)."""
+    if shard is None:
+        return queryset
+    index, count = shard
+    ids = [pk for pk in queryset.values_list('id', flat=True) if shard_of(pk, count) == index]
+    return queryset.filter(id__in=ids)
+
+
+class ShardTracker:
+    """
+    Writes a shard's progress row for the day.
+
+    Args:
+        job: Job name shared by all shards, e.g. 'refresh_citations'
+        shard: (index, count), or None for an unsharded run (recorded as 1/1)
+    """
+
+    def __init__(self, job: str, shard=None, run_date: date = None):
+        self.job = job
+        self.index, self.count = shard or (1, 1)
+        self.run_date = run_date or date.today()
+        self.progress = None
+
+    def start(self, total: int, done: int = 0) -> ShardProgress:
+        """Create or reset the row; done counts work already finished (e.g. checkpoints)."""
+        self.progress, _ = ShardProgress.objects.update_or_create(
+            job=self.job,
+            run_date=self.run_date,
+            shard_index=self.index,
+            shard_count=self.count,
+            defaults={
+                'host': socket.gethostname(),
+                'pid': os.getpid(),
+                'total': total,
+                'done': done,
+                'failed': 0,
+                'started_at': timezone.now(),
+                'finished_at': None,
+            }
+        )
+        return self.progress
+
+    def advance(self, done: int = 0, failed: int = 0):
+        ShardProgress.objects.filter(pk=self.progress.pk).update(
+            done=F('done') + done, failed=F('failed') + failed, updated_at=timezone.now()
+        )
+
+    def finish(self):
+        ShardProgress.objects.filter(pk=self.progress.pk).update(finished_at=timezone.now())
+        self.progress.refresh_from_db()
+
+
+def shard_summary(job: str = None, run_date: date = None, stale_after: int = 900) -> list:
+    """
+    Completion per shard for the coordinator view.
+
+    Args:
+        job: Only this job (all jobs if omitted)
+        run_date: Day to report (defaults to today)
+        stale_after: Seconds without progress before a running shard is reported stale
+
+    Returns:
+        One dict per (job, shard_count) with per-shard rows, including
+        shards that never started
+    """
+    rows = ShardProgress.objects.filter(run_date=run_date or date.today())
+    if job:
+        rows = rows.filter(job=job)
+
+    now = timezone.now()
+    runs = {}
+    for row in rows:
+        if row.finished_at:
+            state = 'finished'
+        elif (now - row.updated_at).total_seconds() > stale_after:
+            state = 'stale'
+        else:
+            state = 'running'
+        runs.setdefault((row.job, row.shard_count), {})[row.shard_index] = {
+            'shard': f'{row.shard_index}/{row.shard_count}',
+            'state': state,
+            'host': row.host,
+            'pid': row.pid,
+            'total': row.total,
+            'done': row.done,
+            'failed': row.failed,
+            'percent': round(row.done / row.total * 100, 1) if row.total else 100.0,
+            'updated_at': row.updated_at,
+        }
+
+    summary = []
+    for (job_name, count), shards in sorted(runs.items()):
+        summary.append({
+            'job': job_name,
+            'shard_count': count,
+            'finished': sum(1 for s in shards.values() if s['state'] == 'finished'),
+            'shards': [
+                shards.get(index) or {'shard': f'{index}/{count}', 'state': 'missing'}
+                for index in range(1, count + 1)
+            ],
+        })
+    return summary
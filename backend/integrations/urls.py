@@ -1,13 +1,17 @@
 from django.urls import path
 from .views import (
-    SearchBrandRankingView, APIUsageView, BulkSearchView,
-    GeminiTestView, GeminiCitationCheckView
+    SearchBrandRankingView, APIUsageView, BulkSearchView, SchedulerPlanView, ShardStatusView,
+    IntegrationsHealthView, IntegrationsMetricsView, GeminiTestView, GeminiCitationCheckView
 )
 
 urlpatterns = [
     path('search/', SearchBrandRankingView.as_view(), name='search-brand'),
     path('bulk-search/', BulkSearchView.as_view(), name='bulk-search'),
     path('usage/', APIUsageView.as_view(), name='api-usage'),
+    path('health/', IntegrationsHealthView.as_view(), name='integrations-health'),
+    path('metrics/', IntegrationsMetricsView.as_view(), name='integrations-metrics'),
+    path('scheduler/', SchedulerPlanView.as_view(), name='scheduler-plan'),
+    path('shards/', ShardStatusView.as_view(), name='shard-status'),
     path('gemini/test/', GeminiTestView.as_view(), name='gemini-test'),
     path('gemini/check-citation/', GeminiCitationCheckView.as_view(), name='gemini-check-citation'),
 ]
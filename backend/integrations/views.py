@@ -1,10 +1,29 @@
+import math
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from datetime import date
+from django.conf import settings
 from .services import SerpAPIService
+from .scheduler import SerpAPICreditScheduler
+from .circuit_breaker import CircuitBreaker
+from .brand_matcher import BrandMatcher, matcher_stats
+from .llm_cache import llm_cache_stats
+from .sharding import shard_summary
 from brands.models import Brand
 from rankings.models import SearchRanking
+from socialbooster.bulk import upsert_rows
+
+
+def ranking_row(brand_id: int, keyword: str, position: int) -> dict:
+    """Today's SearchRanking row for upsert_rows; pass update_fields=['position'] to keep a stored search_url."""
+    return {
+        'brand_id': brand_id,
+        'keyword': keyword,
+        'position': position,
+        'search_url': '',
+        'date': date.today(),
+    }
 
 
 class SearchBrandRankingView(APIView):
@@ -45,11 +64,8 @@ class SearchBrandRankingView(APIView):
         
         # Save the ranking if found
         if result['found']:
-            SearchRanking.objects.update_or_create(
-                brand=brand,
-                keyword=keyword,
-                date=date.today(),
-                defaults={'position': result['position']}
+            upsert_rows(
+                SearchRanking, [ranking_row(brand.id, keyword, result['position'])], update_fields=['position']
             )
         
         return Response(result)
@@ -64,6 +80,60 @@ class APIUsageView(APIView):
         return Response(usage)
 
 
+class IntegrationsHealthView(APIView):
+    """Report circuit breaker state for each outbound provider."""
+    
+    PROVIDERS = {
+        'serpapi': 'SERPAPI_KEY',
+        'gemini': 'GEMINI_API_KEY',
+    }
+    
+    def get(self, request):
+        providers = {}
+        for provider, key_setting in self.PROVIDERS.items():
+            providers[provider] = CircuitBreaker(provider).snapshot()
+            providers[provider]['configured'] = bool(getattr(settings, key_setting, ''))
+        
+        degraded = [name for name, info in providers.items() if info['state'] != CircuitBreaker.CLOSED]
+        return Response({
+            'status': 'degraded' if degraded else 'ok',
+            'degraded_providers': degraded,
+            'providers': providers
+        })
+
+
+class IntegrationsMetricsView(APIView):
+    """Report integration counters such as matcher stage and LLM cache hit rates."""
+    
+    def get(self, request):
+        return Response({
+            'matcher': matcher_stats(),
+            'llm_cache': llm_cache_stats(),
+        })
+
+
+class ShardStatusView(APIView):
+    """Per-shard completion of today's sharded refresh jobs."""
+    
+    def get(self, request):
+        return Response(shard_summary(job=request.query_params.get('job')))
+
+
+class SchedulerPlanView(APIView):
+    """Show the SerpAPI credit budget and the upcoming ranking check plan."""
+    
+    def get(self, request):
+        limit = request.query_params.get('limit', '50')
+        if not limit.isdigit():
+            return Response(
+                {'error': 'limit must be a non-negative integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = int(limit)
+        scheduler = SerpAPICreditScheduler()
+        return Response(scheduler.describe(limit=limit))
+
+
 class BulkSearchView(APIView):
     """Bulk search rankings for all brands with their keywords."""
     
@@ -89,6 +159,10 @@ class BulkSearchView(APIView):
         
         service = SerpAPIService()
         results = []
+        rankings = []
+        brands = Brand.objects.in_bulk(
+            {query.get('brand_id') for query in queries if str(query.get('brand_id', '')).isdigit()}
+        )
         
         for query in queries:
             brand_id = query.get('brand_id')
@@ -98,21 +172,18 @@ class BulkSearchView(APIView):
                 results.append({'error': 'brand_id and keyword required', 'query': query})
                 continue
             
-            try:
-                brand = Brand.objects.get(id=brand_id)
-                result = service.check_brand_position(brand.name, keyword)
-                
-                if result.get('found'):
-                    SearchRanking.objects.update_or_create(
-                        brand=brand,
-                        keyword=keyword,
-                        date=date.today(),
-                        defaults={'position': result['position']}
-                    )
-                
-                results.append(result)
-            except Brand.DoesNotExist:
+            brand = brands.get(int(brand_id)) if str(brand_id).isdigit() else None
+            if brand is None:
                 results.append({'error': f'Brand {brand_id} not found', 'query': query})
+                continue
+            
+            result = service.check_brand_position(brand.name, keyword)
+            if result.get('found'):
+                rankings.append(ranking_row(brand.id, keyword, result['position']))
+            results.append(result)
+        
+        # One upsert for every ranking found
+        upsert_rows(SearchRanking, rankings, update_fields=['position'])
         
         return Response({
             'total': len(queries),
@@ -167,20 +238,29 @@ class GeminiCitationCheckView(APIView):
             )
         
         service = GeminiService()
-        result = service.check_brand_citation(brand.name, query)
+        result = service.check_brand_citation(
+            brand.name, query, matcher=BrandMatcher.for_brand(brand)
+        )
+        
+        if result.get('retriable'):
+            # Rate limited: fail fast and let the client retry later
+            retry_after = math.ceil(result.get('retry_after') or 1)
+            return Response(
+                {'error': result['error'], 'retry_after': retry_after},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(retry_after)}
+            )
         
         if result.get('success'):
             # Save the citation result
-            AICitation.objects.update_or_create(
-                brand=brand,
-                ai_model='gemini',
-                query=query,
-                date=date.today(),
-                defaults={
-                    'mentioned': result['mentioned'],
-                    'citation_context': result['citation_context']
-                }
-            )
+            upsert_rows(AICitation, [{
+                'brand_id': brand.id,
+                'ai_model': 'gemini',
+                'query': query,
+                'mentioned': result['mentioned'],
+                'citation_context': result['citation_context'],
+                'date': date.today(),
+            }])
         
         return Response({
             'brand': brand.name,
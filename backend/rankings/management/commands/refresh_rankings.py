@@ -0,0 +1,62 @@
+"""
+Management command to refresh search rankings for a shard of brands.
+Run one process per shard (`--shard i/N`) to spread the SerpAPI calls over
+several cron jobs or containers; each shard spends its share of the credits
+the scheduler has released. A keyword shared with brands of other shards is
+searched once, by whichever shard claims it first, and updates them all.
+"""
+from django.core.management.base import BaseCommand
+from brands.auto_fetch import generate_keywords
+from brands.models import Brand
+from integrations.scheduler import SerpAPICreditScheduler
+from integrations.sharding import ShardTracker, parse_shard, shard_brands
+
+
+class Command(BaseCommand):
+    help = 'Refresh due ranking checks for all brands, or one shard of them'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--shard',
+            type=parse_shard,
+            help='Only refresh brands in shard i of N (e.g. 2/4)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help="Spend at most this many credits in this run (default: the shard's share of the allowance)",
+        )
+
+    def handle(self, *args, **options):
+        scheduler = SerpAPICreditScheduler()
+        brands = list(shard_brands(Brand.objects.all(), options['shard']))
+
+        # Make sure every brand in the shard has its keywords tracked
+        for brand in brands:
+            keywords = generate_keywords(brand.name, brand.category)
+            scheduler.track(brand, keywords[:1], importance=2)
+            scheduler.track(brand, keywords[1:])
+
+        limit = options['limit']
+        if limit is None:
+            # Split the released credits so parallel shards can't overspend together
+            index, count = options['shard'] or (1, 1)
+            allowance = scheduler.allowance(scheduler.sync_budget())
+            limit = allowance // count + (1 if index <= allowance % count else 0)
+
+        brand_ids = [brand.id for brand in brands]
+        tracker = ShardTracker('refresh_rankings', options['shard'])
+        # Progress is counted in searches: one per keyword, however many brands share it
+        tracker.start(total=len(scheduler.plan(limit=limit, brand_ids=brand_ids)))
+
+        result = scheduler.run(limit=limit, brand_ids=brand_ids)
+        failed = len([r for r in result['results'] if not r.get('success')])
+        failed_searches = {r['keyword'].lower() for r in result['results'] if not r.get('success')}
+        tracker.advance(done=result['credits_spent'], failed=len(failed_searches))
+        tracker.finish()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {len(brands)} brands: spent {result['credits_spent']}/{limit} credits, "
+            f"{len(result['results']) - failed} checks updated, {failed} failed. "
+            f"{result['credits_left']} credits left."
+        ))
@@ -1,5 +1,5 @@
 from django.db import models
-from brands.models import Brand
+from brands.models import Brand, VisibleBrandRowsManager
 
 
 class SearchRanking(models.Model):
@@ -12,6 +12,9 @@ class SearchRanking(models.Model):
     date = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = models.Manager()
+    visible = VisibleBrandRowsManager()
+    
     class Meta:
         ordering = ['-date', 'position']
         unique_together = ['brand', 'keyword', 'date']
@@ -2,13 +2,15 @@ from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db.models import Avg
+from socialbooster.bulk import BulkUpsertMixin
+from socialbooster.serialization import FastListMixin
 from .models import SearchRanking
 from .serializers import SearchRankingSerializer
 
 
-class SearchRankingViewSet(viewsets.ModelViewSet):
+class SearchRankingViewSet(FastListMixin, BulkUpsertMixin, viewsets.ModelViewSet):
     """ViewSet for SearchRanking CRUD and trend analysis."""
-    queryset = SearchRanking.objects.select_related('brand').all()
+    queryset = SearchRanking.visible.select_related('brand')
     serializer_class = SearchRankingSerializer
     
     def get_queryset(self):
@@ -32,7 +34,7 @@ class SearchRankingViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], url_path='trends/(?P<brand_id>[^/.]+)')
     def trends(self, request, brand_id=None):
         """Get ranking trends for a specific brand."""
-        rankings = SearchRanking.objects.filter(brand_id=brand_id).order_by('date')
+        rankings = SearchRanking.visible.filter(brand_id=brand_id).order_by('date')
         trend_data = {}
         for ranking in rankings:
             keyword = ranking.keyword
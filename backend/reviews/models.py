@@ -1,5 +1,5 @@
 from django.db import models
-from brands.models import Brand
+from brands.models import Brand, VisibleBrandRowsManager
 
 
 class Review(models.Model):
@@ -21,6 +21,9 @@ class Review(models.Model):
     date = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = models.Manager()
+    visible = VisibleBrandRowsManager()
+    
     class Meta:
         ordering = ['-date']
         unique_together = ['brand', 'platform', 'date']
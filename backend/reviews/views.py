@@ -2,13 +2,15 @@ from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db.models import Avg, Sum
+from socialbooster.bulk import BulkUpsertMixin
+from socialbooster.serialization import FastListMixin
 from .models import Review
 from .serializers import ReviewSerializer
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(FastListMixin, BulkUpsertMixin, viewsets.ModelViewSet):
     """ViewSet for Review CRUD and analytics."""
-    queryset = Review.objects.select_related('brand').all()
+    queryset = Review.visible.select_related('brand')
     serializer_class = ReviewSerializer
     
     def get_queryset(self):
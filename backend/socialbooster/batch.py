@@ -0,0 +1,148 @@
+"""
+POST /api/batch/: several API calls in one round trip.
+
+Sub-requests are dispatched in-process straight to their views, skipping
+middleware. Each carries the batch's credentials and goes through its own
+view's authentication (strict actions still check the user in the database)
+and throttles, so a batch of N calls costs N requests of the caller's quota,
+plus one for the batch itself. Batches made only of reads run up to
+BATCH_CONCURRENCY sub-requests at a time, each on a worker thread with its
+own DB connection; any write makes the whole batch run in order on the
+request's own thread and connection.
+
+Request:
+    {"requests": [{"id": "summary", "method": "GET", "path": "/api/reviews/summary/",
+                   "params": {"brand": 1}, "body": {...}}, ...]}
+
+Response (always 200 once the batch itself is valid):
+    {"responses": [{"id": "summary", "status": 200, "body": {...}}, ...]}
+"""
+import io
+import json
+import logging
+from functools import partial
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.urls import Resolver404, resolve
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from integrations.concurrency import run_concurrently
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+METHODS = SAFE_METHODS + ('POST', 'PUT', 'PATCH', 'DELETE')
+
+
+def _parse(payload) -> list:
+    """Validate the batch payload into a list of sub-request specs."""
+    specs = payload.get('requests') if isinstance(payload, dict) else payload
+    if not isinstance(specs, list) or not specs:
+        raise ValidationError({'requests': 'Expected a non-empty list of sub-requests'})
+    if len(specs) > settings.BATCH_MAX_REQUESTS:
+        raise ValidationError({'requests': f'At most {settings.BATCH_MAX_REQUESTS} sub-requests per batch'})
+
+    errors = {}
+    for index, spec in enumerate(specs):
+        if not isinstance(spec, dict):
+            errors[index] = 'Expected an object'
+            continue
+        path = spec.get('path')
+        method = str(spec.get('method', 'GET')).upper()
+        if not isinstance(path, str) or not path.startswith('/api/'):
+            errors[index] = 'path must be an /api/ URL'
+        elif path.split('?', 1)[0].rstrip('/') == '/api/batch':
+            errors[index] = 'Batches cannot be nested'
+        elif method not in METHODS:
+            errors[index] = f'Unsupported method {method}'
+        elif not isinstance(spec.get('params', {}), dict):
+            errors[index] = 'params must be an object'
+    if errors:
+        raise ValidationError({'requests': errors})
+    return specs
+
+
+def _subrequest(request, spec: dict) -> WSGIRequest:
+    """A request for one sub-call, carrying the batch's headers and credentials."""
+    path, _, query = spec['path'].partition('?')
+    params = spec.get('params') or {}
+    if params:
+        query = '&'.join(part for part in (query, urlencode(params, doseq=True)) if part)
+    body = json.dumps(spec['body']).encode('utf-8') if spec.get('body') is not None else b''
+
+    environ = dict(request.META)
+    environ.update({
+        'REQUEST_METHOD': str(spec.get('method', 'GET')).upper(),
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+        'HTTP_ACCEPT': 'application/json',
+        'wsgi.input': io.BytesIO(body),
+    })
+    subrequest = WSGIRequest(environ)
+    # The Authorization header came along in META; authentication forced on
+    # the batch itself (APIClient.force_authenticate) is passed on as is
+    for attr in ('_force_auth_user', '_force_auth_token'):
+        if hasattr(request._request, attr):
+            setattr(subrequest, attr, getattr(request._request, attr))
+    return subrequest
+
+
+def _body(response):
+    """A sub-response's payload as JSON-ready data."""
+    if hasattr(response, 'data'):
+        return response.data
+    content = b''.join(response.streaming_content) if response.streaming else response.content
+    text = content.decode(response.charset or 'utf-8')
+    if response.get('Content-Type', '').startswith('application/json'):
+        return json.loads(text) if text else None
+    return text
+
+
+def _dispatch(subrequest, spec: dict) -> dict:
+    result = {'id': spec.get('id'), 'status': 500, 'body': None}
+    try:
+        match = resolve(subrequest.path_info)
+    except Resolver404:
+        result.update(status=404, body={'error': True, 'code': 'NOT_FOUND', 'message': 'No such endpoint'})
+        return result
+    try:
+        response = match.func(subrequest, *match.args, **match.kwargs)
+        result.update(status=response.status_code, body=_body(response))
+    except Exception:
+        logger.exception('Batch sub-request %s %s failed', subrequest.method, subrequest.path)
+        result['body'] = {'error': True, 'code': 'INTERNAL_ERROR', 'message': 'An unexpected error occurred'}
+    return result
+
+
+class BatchView(APIView):
+    """
+    Run several API calls in one request.
+
+    POST /api/batch/
+    Each sub-request still applies its own view's authentication, permissions and throttles.
+    """
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        specs = _parse(request.data)
+        subrequests = [_subrequest(request, spec) for spec in specs]
+        calls = [partial(_dispatch, subrequest, spec) for subrequest, spec in zip(subrequests, specs)]
+
+        read_only = all(str(spec.get('method', 'GET')).upper() in SAFE_METHODS for spec in specs)
+        if read_only and settings.BATCH_CONCURRENCY > 1:
+            results = run_concurrently(calls, max_workers=settings.BATCH_CONCURRENCY)
+        else:
+            results = [call() for call in calls]
+
+        # X-RateLimit-* headers report the quota left after the sub-requests
+        for subrequest in subrequests:
+            quota = getattr(subrequest, 'rate_limit', None)
+            current = getattr(request._request, 'rate_limit', None)
+            if quota is not None and (current is None or quota['remaining'] < current['remaining']):
+                request._request.rate_limit = quota
+        return Response({'responses': results})
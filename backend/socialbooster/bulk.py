@@ -0,0 +1,380 @@
+"""
+Helpers for writing large numbers of rows.
+
+bulk_insert / merge_rows: append-only loads and file imports. On PostgreSQL
+rows are streamed with COPY (into a staging table for merges); other
+databases get batched executemany INSERTs. Rows are plain tuples so callers
+can generate them without building a model instance per row.
+
+upsert_rows / bulk_upsert_response: idempotent writes keyed on a model's
+natural key (its unique_together or UniqueConstraint), done with a single
+bulk_create(update_conflicts=True) instead of update_or_create per row.
+"""
+import csv
+import io
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+def batched(iterable, size: int):
+    """Yield lists of up to `size` items."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _csv_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _db_value(value):
+    if isinstance(value, datetime):
+        return connection.ops.adapt_datetimefield_value(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _insert(table: str, columns: list, rows: list):
+    """INSERT one batch of rows with executemany (databases without COPY)."""
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote(table), ', '.join(quote(column) for column in columns), ', '.join(['%s'] * len(columns))
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [[_db_value(value) for value in row] for row in rows])
+
+
+def _copy(table: str, columns: list, rows: list):
+    """COPY one batch of rows into a table (PostgreSQL only)."""
+    buffer = io.StringIO()
+    # Strings are always quoted, so an unquoted empty field is NULL and '' stays ''
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    buffer.seek(0)
+
+    sql = f'COPY {table} ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)'
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        if hasattr(raw, 'copy_expert'):
+            raw.copy_expert(sql, buffer)  # psycopg2
+        else:
+            with raw.copy(sql) as copy:  # psycopg 3
+                copy.write(buffer.getvalue())
+
+
+def bulk_insert(model, fields: list, rows, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Insert rows of field values into a model's table.
+
+    Each batch is committed on its own so a long load doesn't hold one huge
+    transaction open. Rows bypass the ORM: values must be complete
+    (auto_now_add fields and defaults are not filled in) and no signals fire.
+
+    Args:
+        model: Model class
+        fields: Field names, in the order of the values in each row
+        rows: Iterable of tuples
+        batch_size: Rows per COPY / executemany call
+
+    Returns:
+        Number of rows inserted
+    """
+    columns = [model._meta.get_field(name).column for name in fields]
+    use_copy = connection.vendor == 'postgresql'
+    inserted = 0
+
+    for batch in batched(rows, batch_size):
+        with transaction.atomic():
+            if use_copy:
+                _copy(model._meta.db_table, columns, batch)
+            else:
+                _insert(model._meta.db_table, columns, batch)
+        inserted += len(batch)
+
+    return inserted
+
+
+def _merge_postgres(table: str, columns: list, keys: list, updates: list, rows: list, ignore_conflicts: bool):
+    """COPY a batch into a temporary staging table, then merge it into the target."""
+    quote = connection.ops.quote_name
+    staging = f'{table}_staging'
+    column_list = ', '.join(quote(column) for column in columns)
+    key_list = ', '.join(quote(column) for column in keys)
+    if ignore_conflicts or not updates:
+        conflict = 'DO NOTHING'
+    else:
+        conflict = 'DO UPDATE SET ' + ', '.join(f'{quote(c)} = EXCLUDED.{quote(c)}' for c in updates)
+
+    with connection.cursor() as cursor:
+        # Dropped here as well as on commit, in case the caller holds an outer transaction
+        cursor.execute(f'DROP TABLE IF EXISTS {quote(staging)}')
+        cursor.execute(
+            f'CREATE TEMPORARY TABLE {quote(staging)} ON COMMIT DROP AS '
+            f'SELECT {column_list} FROM {quote(table)} WITH NO DATA'
+        )
+        _copy(quote(staging), [quote(column) for column in columns], rows)
+        # DISTINCT ON keeps the last copy of a key: ON CONFLICT can't touch a row twice
+        cursor.execute(
+            f'INSERT INTO {quote(table)} ({column_list}) '
+            f'SELECT DISTINCT ON ({key_list}) {column_list} FROM {quote(staging)} '
+            f'ORDER BY {key_list}, ctid DESC '
+            f'ON CONFLICT ({key_list}) {conflict}'
+        )
+
+
+def _merge_executemany(table: str, columns: list, keys: list, updates: list, rows: list, ignore_conflicts: bool):
+    """Upsert a batch with INSERT ... ON CONFLICT through executemany (SQLite)."""
+    quote = connection.ops.quote_name
+    if ignore_conflicts or not updates:
+        conflict = 'DO NOTHING'
+    else:
+        conflict = 'DO UPDATE SET ' + ', '.join(f'{quote(c)} = excluded.{quote(c)}' for c in updates)
+    sql = 'INSERT INTO {} ({}) VALUES ({}) ON CONFLICT ({}) {}'.format(
+        quote(table), ', '.join(quote(column) for column in columns), ', '.join(['%s'] * len(columns)),
+        ', '.join(quote(column) for column in keys), conflict
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [[_db_value(value) for value in row] for row in rows])
+
+
+def merge_rows(model, fields: list, rows, batch_size: int = DEFAULT_BATCH_SIZE,
+               ignore_conflicts: bool = False, on_batch=None) -> int:
+    """
+    Upsert rows of field values on the model's natural key, batch by batch.
+
+    PostgreSQL batches are COPYed into a temporary staging table and merged
+    with one INSERT ... ON CONFLICT; other databases run the same upsert
+    through executemany. Like bulk_insert, rows bypass the ORM.
+
+    Args:
+        model: Model class with a unique_together / UniqueConstraint
+        fields: Field names, in the order of the values in each row; must
+            include every natural key field
+        rows: Iterable of tuples
+        batch_size: Rows per batch (and per transaction)
+        ignore_conflicts: Keep existing rows instead of updating them
+        on_batch: Optional callback, called with the running row count
+
+    Returns:
+        Number of rows processed
+    """
+    columns = [model._meta.get_field(name).column for name in fields]
+    keys = [model._meta.get_field(name).column for name in natural_key(model)]
+    auto_add = {field.column for field in model._meta.concrete_fields if getattr(field, 'auto_now_add', False)}
+    updates = [column for column in columns if column not in keys and column not in auto_add]
+    merge = _merge_postgres if connection.vendor == 'postgresql' else _merge_executemany
+    processed = 0
+
+    for batch in batched(rows, batch_size):
+        with transaction.atomic():
+            merge(model._meta.db_table, columns, keys, updates, batch, ignore_conflicts)
+        processed += len(batch)
+        if on_batch:
+            on_batch(processed)
+
+    return processed
+
+
+def natural_key(model) -> list:
+    """Field names of a model's first unique_together / UniqueConstraint."""
+    meta = model._meta
+    if meta.unique_together:
+        return list(meta.unique_together[0])
+    for constraint in meta.constraints:
+        if getattr(constraint, 'fields', None):
+            return list(constraint.fields)
+    raise ValueError(f'{model.__name__} has no natural key to upsert on')
+
+
+def writable_fields(model) -> list:
+    """Concrete fields a client may send: everything but the pk and auto timestamps."""
+    return [
+        field for field in model._meta.concrete_fields
+        if not field.primary_key and not getattr(field, 'auto_now', False)
+        and not getattr(field, 'auto_now_add', False)
+    ]
+
+
+def validate_rows(model, rows: list):
+    """
+    Validate raw rows (dicts) against a model without DRF serializers.
+
+    Non-relational values go through the model field's own clean()
+    (type coercion, max_length, choices, decimal digits); foreign keys are
+    checked with one query for the whole batch.
+
+    Returns:
+        (cleaned, errors): per row either a dict of field values and None,
+        or None and a dict of field -> messages
+    """
+    fields = writable_fields(model)
+    relations = {field.name: field for field in fields if field.is_relation}
+    cleaned, errors = [], []
+
+    for row in rows:
+        values, row_errors = {}, {}
+        if not isinstance(row, dict):
+            cleaned.append(None)
+            errors.append({'non_field_errors': ['Expected an object']})
+            continue
+
+        for field in fields:
+            if field.name not in row or row[field.name] in (None, ''):
+                if field.has_default() or field.blank:
+                    values[field.attname] = field.get_default()
+                elif field.null:
+                    values[field.attname] = None
+                else:
+                    row_errors[field.name] = ['This field is required.']
+                continue
+
+            value = row[field.name]
+            if field.is_relation:
+                if isinstance(value, bool) or not str(value).isdigit():
+                    row_errors[field.name] = ['A valid integer id is required.']
+                else:
+                    values[field.attname] = int(value)
+                continue
+            try:
+                values[field.attname] = field.clean(value, None)
+            except ValidationError as e:
+                row_errors[field.name] = e.messages
+
+        cleaned.append(None if row_errors else values)
+        errors.append(row_errors or None)
+
+    # One existence query per relation for the whole batch
+    for name, field in relations.items():
+        ids = {values[field.attname] for values in cleaned if values and values.get(field.attname) is not None}
+        existing = set(field.related_model.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        for i, values in enumerate(cleaned):
+            if values and values.get(field.attname) is not None and values[field.attname] not in existing:
+                cleaned[i] = None
+                errors[i] = {name: [f'{field.related_model.__name__} {values[field.attname]} does not exist.']}
+
+    return cleaned, errors
+
+
+def upsert_rows(model, rows: list, ignore_conflicts: bool = False, update_fields: list = None) -> list:
+    """
+    Insert rows (dicts of field values), updating rows whose natural key exists.
+
+    One SELECT finds which keys already exist (for the per-row status) and
+    one bulk_create(update_conflicts=True) writes everything. Existing rows
+    get update_fields (default: every writable non-key field) overwritten;
+    with ignore_conflicts they are left untouched instead, e.g. for
+    placeholders that must not overwrite real data.
+
+    Returns:
+        Status per row: 'created', 'updated', 'exists' (ignore_conflicts) or
+        'superseded' (a later row in the batch has the same key)
+    """
+    key_fields = [model._meta.get_field(name) for name in natural_key(model)]
+    key_attnames = [field.attname for field in key_fields]
+
+    def key_of(values):
+        return tuple(values[attname] for attname in key_attnames)
+
+    last_index = {key_of(values): i for i, values in enumerate(rows)}
+    existing = set()
+    if rows:
+        lookups = {f'{attname}__in': {key[i] for key in last_index} for i, attname in enumerate(key_attnames)}
+        existing = set(model.objects.filter(**lookups).values_list(*key_attnames))
+        # Coerce stored values (e.g. dates, decimals) to compare with the incoming keys
+        existing = {
+            tuple(field.to_python(value) for field, value in zip(key_fields, key)) for key in existing
+        }
+
+    objects = [model(**rows[i]) for i in sorted(last_index.values())]
+    if ignore_conflicts:
+        model.objects.bulk_create(objects, ignore_conflicts=True)
+    else:
+        model.objects.bulk_create(
+            objects,
+            update_conflicts=True,
+            unique_fields=[field.name for field in key_fields],
+            update_fields=update_fields or [
+                field.name for field in writable_fields(model) if field.attname not in key_attnames
+            ],
+        )
+
+    statuses = []
+    for i, values in enumerate(rows):
+        key = key_of(values)
+        if last_index[key] != i:
+            statuses.append('superseded')
+        elif key in existing:
+            statuses.append('exists' if ignore_conflicts else 'updated')
+        else:
+            statuses.append('created')
+    return statuses
+
+
+def bulk_upsert_response(model, rows, ignore_conflicts: bool = False) -> dict:
+    """
+    Validate and upsert a client payload, reporting a status for every row.
+
+    Returns:
+        dict with per-status counts and a results list in request order
+    """
+    cleaned, errors = validate_rows(model, rows)
+    valid = [values for values in cleaned if values is not None]
+    statuses = iter(upsert_rows(model, valid, ignore_conflicts) if valid else [])
+
+    results = []
+    for index, (values, row_errors) in enumerate(zip(cleaned, errors)):
+        if values is None:
+            results.append({'index': index, 'status': 'error', 'errors': row_errors})
+        else:
+            results.append({'index': index, 'status': next(statuses)})
+
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    return {'total': len(results), 'counts': counts, 'results': results}
+
+
+class BulkUpsertMixin:
+    """
+    Adds POST <prefix>/bulk/ to a ModelViewSet.
+
+    Accepts a JSON array of rows (or {"rows": [...]}) and upserts them on the
+    model's natural key. Invalid rows are reported without failing the rest.
+    """
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        rows = request.data.get('rows') if isinstance(request.data, dict) else request.data
+        max_rows = getattr(settings, 'BULK_MAX_ROWS', 1000)
+
+        if not isinstance(rows, list) or not rows:
+            return Response(
+                {'error': 'Expected a non-empty array of rows'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(rows) > max_rows:
+            return Response(
+                {'error': f'At most {max_rows} rows per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            result = bulk_upsert_response(self.get_queryset().model, rows)
+        return Response(result)
@@ -0,0 +1,25 @@
+"""
+Cache backends that report hits and misses to the request's telemetry
+(socialbooster.telemetry). Outside sampled requests they behave exactly
+like the backend they extend.
+"""
+from django.core.cache.backends.locmem import LocMemCache
+from . import telemetry
+
+_MISSING = object()
+
+
+class TelemetryCacheMixin:
+    """Counts get() hits and misses; get_many() and get_or_set() go through get()."""
+    
+    def get(self, key, default=None, version=None):
+        collector = telemetry.current()
+        if collector is None:
+            return super().get(key, default, version)
+        value = super().get(key, _MISSING, version)
+        collector.record_cache(value is not _MISSING)
+        return default if value is _MISSING else value
+
+
+class TelemetryLocMemCache(TelemetryCacheMixin, LocMemCache):
+    """The local-memory cache with hit/miss telemetry."""
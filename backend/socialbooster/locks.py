@@ -0,0 +1,35 @@
+"""
+Short-lived locks on top of the Django cache.
+With a shared cache backend (Redis/Memcached) the lock is shared by every
+worker process; with the local-memory cache it covers one process.
+"""
+import time
+from contextlib import contextmanager
+from django.core.cache import cache
+
+
+@contextmanager
+def cache_lock(key: str, timeout: int = 5, wait: float = 1.0):
+    """
+    Hold a cache lock while updating a shared cache entry.
+    
+    If the lock can't be taken within `wait` seconds (e.g. a crashed holder
+    that hasn't expired yet) the block runs anyway rather than stalling the
+    request; the update is then best-effort.
+    
+    Args:
+        key: Name of the resource to lock
+        timeout: Seconds before an abandoned lock expires
+        wait: Seconds to spin before giving up on the lock
+    """
+    lock_key = f'lock:{key}'
+    deadline = time.monotonic() + wait
+    acquired = cache.add(lock_key, 1, timeout)
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(0.005)
+        acquired = cache.add(lock_key, 1, timeout)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            cache.delete(lock_key)
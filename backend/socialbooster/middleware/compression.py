@@ -0,0 +1,150 @@
+"""
+Negotiated gzip/brotli compression for API responses.
+
+Only /api/ responses are handled (WhiteNoise already serves compressed
+static files). Brotli is used when the client accepts it and the brotli
+package is installed, gzip otherwise. Bodies under COMPRESSION_MIN_BYTES
+go out as-is, and streaming responses are compressed chunk by chunk with a
+flush after each one, so NDJSON streams still arrive line by line.
+"""
+import re
+import zlib
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'application/javascript', 'text/')
+QUALITY_RE = re.compile(r'q\s*=\s*([0-9.]+)')
+
+
+def available_encodings() -> tuple:
+    """Encodings this process can produce, most preferred first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate(accept_encoding: str):
+    """The best encoding the client accepts (per Accept-Encoding q-values), or None."""
+    qualities = {}
+    for part in (accept_encoding or '').split(','):
+        token, _, params = part.partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        match = QUALITY_RE.search(params)
+        try:
+            qualities[token] = float(match.group(1)) if match else 1.0
+        except ValueError:
+            qualities[token] = 0.0
+
+    best, best_quality = None, 0.0
+    for encoding in available_encodings():
+        quality = qualities.get(encoding, qualities.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        # wbits=31: gzip container, no file name or timestamp
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def compressor(encoding: str, level: int = None):
+    """An incremental compressor; level defaults to GZIP_LEVEL / BROTLI_QUALITY."""
+    if encoding == 'br':
+        return _BrotliCompressor(settings.BROTLI_QUALITY if level is None else level)
+    return _GzipCompressor(settings.GZIP_LEVEL if level is None else level)
+
+
+def compress(content: bytes, encoding: str, level: int = None) -> bytes:
+    """Compress a whole body in one go."""
+    stream = compressor(encoding, level)
+    return stream.compress(content) + stream.finish()
+
+
+def _compress_stream(chunks, stream):
+    for chunk in chunks:
+        data = stream.compress(chunk) + stream.flush()
+        if data:
+            yield data
+    yield stream.finish()
+
+
+class CompressionMiddleware:
+    """
+    Compresses JSON and text API responses for clients that accept it.
+
+    Place it above middleware that reads or rewrites response bodies.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self._compressible(request, response):
+            return response
+
+        # The body now depends on the request's Accept-Encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = _compress_stream(response.streaming_content, compressor(encoding))
+            # The compressed length isn't known until the stream ends
+            del response.headers['Content-Length']
+        else:
+            compressed = compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # Same payload, different bytes: a strong ETag no longer applies
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def _compressible(self, request, response) -> bool:
+        if not request.path.startswith('/api/') or response.has_header('Content-Encoding'):
+            return False
+        if response.status_code < 200 or response.status_code in (204, 304):
+            return False
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return False
+        if response.streaming:
+            # Async iterators can't be wrapped by this (WSGI) middleware
+            return not getattr(response, 'is_async', False)
+        return len(response.content) >= settings.COMPRESSION_MIN_BYTES
@@ -4,6 +4,7 @@ Only logs essential info to avoid performance impact.
 """
 import logging
 import time
+from socialbooster import telemetry
 
 logger = logging.getLogger('api.requests')
 
@@ -12,11 +13,15 @@ class RequestLoggingMiddleware:
     """
     Logs API requests with minimal overhead.
     Only logs: method, path, status, and duration.
+    
+    A sample of API requests (TELEMETRY_SAMPLE_RATE) also collects DB,
+    cache and provider timings, returned in a Server-Timing header and
+    logged as extra fields (record.telemetry).
     """
     
     def __init__(self, get_response):
         self.get_response = get_response
-
+    
     def __call__(self, request):
         # Skip logging for static files and health checks
         if request.path.startswith(('/static/', '/assets/', '/favicon')):
@@ -24,17 +29,30 @@ class RequestLoggingMiddleware:
         
         start_time = time.time()
         
-        response = self.get_response(request)
+        collected = None
+        if request.path.startswith('/api/') and telemetry.sampled():
+            with telemetry.collect() as collected:
+                response = self.get_response(request)
+        else:
+            response = self.get_response(request)
         
         # Calculate duration
         duration_ms = (time.time() - start_time) * 1000
         
+        if collected is not None:
+            response['Server-Timing'] = collected.server_timing(duration_ms)
+        
         # Log only API requests (minimal info for speed)
         if request.path.startswith('/api/'):
             log_level = logging.WARNING if response.status_code >= 400 else logging.INFO
-            logger.log(
-                log_level,
-                f"{request.method} {request.path} {response.status_code} {duration_ms:.0f}ms"
-            )
+            message = f"{request.method} {request.path} {response.status_code} {duration_ms:.0f}ms"
+            if collected is None:
+                logger.log(log_level, message)
+            else:
+                logger.log(
+                    log_level,
+                    f"{message} {collected.summary()}",
+                    extra={'telemetry': {'duration_ms': round(duration_ms, 1), **collected.fields()}}
+                )
         
         return response
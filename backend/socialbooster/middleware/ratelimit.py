@@ -0,0 +1,26 @@
+"""
+X-RateLimit-* headers for throttled API responses.
+
+The throttles (socialbooster.throttling) record the tightest quota that
+applied to the request; this middleware copies it onto the response:
+
+    X-RateLimit-Limit      requests allowed per period in that scope
+    X-RateLimit-Remaining  requests left right now
+    X-RateLimit-Reset      seconds until the full quota is available again
+"""
+
+
+class RateLimitHeadersMiddleware:
+    """Adds X-RateLimit-* headers to responses whose request was throttled."""
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        quota = getattr(request, 'rate_limit', None)
+        if quota is not None:
+            response['X-RateLimit-Limit'] = str(quota['limit'])
+            response['X-RateLimit-Remaining'] = str(quota['remaining'])
+            response['X-RateLimit-Reset'] = str(quota['reset'])
+        return response
@@ -0,0 +1,253 @@
+"""
+Fast read path for list endpoints.
+
+FastListMixin replaces ModelViewSet.list for JSON responses: rows are
+fetched with values() instead of model instances, turned into the
+serializer's representation through a plan compiled once per serializer
+(choice labels come from precomputed dicts, brand names from the join),
+and rendered with orjson when it is installed. The output is byte for
+byte what the serializer and DRF's JSONRenderer produce; serializers with
+fields the plan can't reproduce (method fields, nested serializers) and
+non-JSON renderers keep using the regular path.
+
+SparseFieldsMixin adds ?fields= / ?exclude= to list and detail responses,
+trimming the serialized output and the SQL projection together.
+"""
+import json
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import relations, serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+try:
+    import orjson
+except ImportError:  # Falls back to the standard library encoder
+    orjson = None
+
+# Plain values that come out of values() already in their JSON form
+PASSTHROUGH_FIELDS = (
+    serializers.CharField, serializers.IntegerField, serializers.BooleanField,
+    serializers.ChoiceField, relations.PrimaryKeyRelatedField,
+)
+# Fields whose to_representation is cheap and exact on values() output
+CONVERTED_FIELDS = (serializers.DateTimeField, serializers.DateField, serializers.DecimalField)
+
+
+def dumps(data) -> bytes:
+    """JSON-encode data exactly like DRF's default JSONRenderer (compact, UTF-8)."""
+    if orjson is not None:
+        content = orjson.dumps(data)
+    else:
+        content = json.dumps(data, ensure_ascii=False, separators=(',', ':'), allow_nan=False).encode('utf-8')
+    # JSONRenderer escapes these so the output is also valid JavaScript
+    return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class EncodedJSONResponse(Response):
+    """A Response whose JSON body is already encoded; .data is kept for tests and middleware."""
+
+    def __init__(self, data, content: bytes, **kwargs):
+        super().__init__(data, **kwargs)
+        self.encoded = content
+
+    @property
+    def rendered_content(self):
+        self['Content-Type'] = 'application/json'
+        return self.encoded
+
+
+class FastRowSerializer:
+    """
+    A serializer's read representation, compiled to a values() column list
+    and one converter per output field.
+    """
+
+    def __init__(self, serializer_class):
+        serializer = serializer_class()
+        model = serializer.Meta.model
+        self.columns = []
+        self.plan = []  # (output name, values() column, converter or None)
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            source = field.source
+            if source.startswith('get_') and source.endswith('_display'):
+                model_field = model._meta.get_field(source[len('get_'):-len('_display')])
+                labels = {value: str(label) for value, label in model_field.flatchoices}
+                column, convert = model_field.name, lambda value, labels=labels: labels.get(value, value)
+            elif isinstance(field, CONVERTED_FIELDS):
+                column, convert = source, field.to_representation
+            elif isinstance(field, PASSTHROUGH_FIELDS) and not isinstance(field, serializers.ManyRelatedField):
+                column, convert = source.replace('.', '__'), None
+            else:
+                raise TypeError(f'{serializer_class.__name__}.{name} ({type(field).__name__}) has no fast path')
+            if column not in self.columns:
+                self.columns.append(column)
+            self.plan.append((name, column, convert))
+
+    def represent(self, rows) -> list:
+        """Turn values() rows into representation dicts."""
+        plan = self.plan
+        return [
+            {
+                name: row[column] if convert is None or row[column] is None else convert(row[column])
+                for name, column, convert in plan
+            }
+            for row in rows
+        ]
+
+    def subset(self, names) -> 'FastRowSerializer':
+        """The plan for only the named fields, fetching only their columns."""
+        subset = object.__new__(FastRowSerializer)
+        subset.plan = [entry for entry in self.plan if entry[0] in names]
+        subset.columns = list(dict.fromkeys(column for _, column, _ in subset.plan))
+        return subset
+
+
+_plans = {}
+_columns = {}
+
+
+def fast_plan(serializer_class):
+    """The compiled plan for a serializer class, or None if it has no fast path."""
+    if serializer_class not in _plans:
+        try:
+            _plans[serializer_class] = FastRowSerializer(serializer_class)
+        except TypeError:
+            _plans[serializer_class] = None
+    return _plans[serializer_class]
+
+
+def _model_path(model, path: str) -> bool:
+    """Whether a values()-style path (e.g. brand__name) ends on a concrete column."""
+    parts = path.split('__')
+    for index, part in enumerate(parts):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return False
+        if not field.concrete or field.many_to_many:
+            return False
+        if index < len(parts) - 1:
+            if not field.is_relation:
+                return False
+            model = field.related_model
+    return True
+
+
+def source_columns(serializer_class) -> dict:
+    """
+    The model column behind each readable field of a serializer, as a
+    values()/only() path, or None for fields with no column of their own
+    (method fields, nested serializers, properties).
+    """
+    if serializer_class not in _columns:
+        serializer = serializer_class()
+        model = serializer.Meta.model
+        columns = {}
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            source = field.source
+            if source.startswith('get_') and source.endswith('_display'):
+                source = source[len('get_'):-len('_display')]
+            path = source.replace('.', '__')
+            columns[name] = path if source != '*' and _model_path(model, path) else None
+        _columns[serializer_class] = columns
+    return _columns[serializer_class]
+
+
+def _names(value) -> list:
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+class SparseFieldsMixin:
+    """
+    ?fields=a,b returns only those fields; ?exclude=a,b drops them.
+
+    Applies to list and retrieve. The queryset is narrowed to match: only()
+    the selected columns, and related tables (e.g. the brand join behind
+    brand_name) are joined only when a selected field reads from them.
+    """
+    sparse_actions = ('list', 'retrieve')
+
+    def sparse_fields(self):
+        """The selected field names in serializer order, or None when every field is returned."""
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = None
+            params = self.request.query_params
+            fields, exclude = _names(params.get('fields')), _names(params.get('exclude'))
+            if getattr(self, 'action', None) in self.sparse_actions and (fields or exclude):
+                available = list(source_columns(self.get_serializer_class()))
+                unknown = sorted((set(fields) | set(exclude)) - set(available))
+                if unknown:
+                    raise ValidationError({'fields': f'Unknown fields: {", ".join(unknown)}'})
+                self._sparse_fields = tuple(
+                    name for name in available if (not fields or name in fields) and name not in exclude
+                )
+                if not self._sparse_fields:
+                    raise ValidationError({'fields': 'No fields left to return'})
+        return self._sparse_fields
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        selected = self.sparse_fields()
+        if selected is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in list(target.fields):
+                if name not in selected:
+                    del target.fields[name]
+        return serializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        selected = self.sparse_fields()
+        if selected is None:
+            return queryset
+
+        columns = source_columns(self.get_serializer_class())
+        needed = [columns[name] for name in selected]
+        if None in needed:
+            # A selected field reads more than a column; load whole rows
+            return queryset
+        related = {column.rsplit('__', 1)[0] for column in needed if '__' in column}
+        return queryset.select_related(None).select_related(*related).only(*needed)
+
+
+class FastListMixin(SparseFieldsMixin):
+    """
+    Serves list() from values() rows rendered with orjson.
+
+    Set fast_list = False on a view (or pass ?fast=false) to use the
+    regular serializer path, e.g. when comparing the two. Sparse fieldsets
+    narrow the plan, so values() only fetches the selected columns.
+    """
+    fast_list = True
+
+    def use_fast_list(self, request) -> bool:
+        renderer = getattr(request, 'accepted_renderer', None)
+        return (
+            self.fast_list
+            and request.query_params.get('fast', 'true').lower() != 'false'
+            and type(renderer) is JSONRenderer
+            and 'indent' not in getattr(request, 'accepted_media_type', '')
+            and fast_plan(self.get_serializer_class()) is not None
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_list(request):
+            return super().list(request, *args, **kwargs)
+
+        plan = fast_plan(self.get_serializer_class())
+        selected = self.sparse_fields()
+        if selected is not None:
+            plan = plan.subset(selected)
+        rows = self.filter_queryset(self.get_queryset()).values(*plan.columns)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            data = self.get_paginated_response(plan.represent(page)).data
+        else:
+            data = plan.represent(rows)
+        return EncodedJSONResponse(data, dumps(data))
@@ -42,6 +42,7 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'socialbooster.middleware.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -50,6 +51,7 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     # Custom middleware
     'socialbooster.middleware.logging.RequestLoggingMiddleware',
+    'socialbooster.middleware.ratelimit.RateLimitHeadersMiddleware',
 ]
 
 ROOT_URLCONF = 'socialbooster.urls'
@@ -88,6 +90,12 @@ else:
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            # Worker threads share rows such as the outbound rate limit
+            # (integrations.provider_state): take the write lock when a
+            # transaction starts and wait for it, and test on a file, since
+            # in-memory shared-cache databases fail on lock conflicts
+            'OPTIONS': {'transaction_mode': 'IMMEDIATE', 'timeout': 20},
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
         }
     }
 
@@ -111,7 +119,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # =============================================================================
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
@@ -155,6 +163,8 @@ CORS_ALLOWED_ORIGINS = [
 ]
 CORS_ALLOW_ALL_ORIGINS = DEBUG
 CORS_ALLOW_CREDENTIALS = True
+# Let cross-origin clients read their remaining quota
+CORS_EXPOSE_HEADERS = ['X-RateLimit-Limit', 'X-RateLimit-Remaining', 'X-RateLimit-Reset']
 
 # =============================================================================
 # Static files (CSS, JavaScript, Images)
@@ -169,7 +179,7 @@ WHITENOISE_INDEX_FILE = True
 # =============================================================================
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': 'socialbooster.cache.TelemetryLocMemCache',
         'LOCATION': 'socialbooster-cache',
         'TIMEOUT': 300,  # 5 minutes default
         'OPTIONS': {
@@ -219,3 +229,90 @@ LOGGING = {
 # =============================================================================
 SERPAPI_KEY = os.getenv('SERPAPI_KEY', '')
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')
+
+# SerpAPI credit scheduler: day of month the plan quota resets, and credits
+# kept back for manual searches
+SERPAPI_QUOTA_RESET_DAY = int(os.getenv('SERPAPI_QUOTA_RESET_DAY', '1'))
+SERPAPI_CREDIT_RESERVE = int(os.getenv('SERPAPI_CREDIT_RESERVE', '5'))
+
+# Override to point the integrations at a stand-in server
+# (see `python manage.py run_fake_apis`)
+SERPAPI_BASE_URL = os.getenv('SERPAPI_BASE_URL', 'https://serpapi.com')
+GEMINI_BASE_URL = os.getenv('GEMINI_BASE_URL', 'https://generativelanguage.googleapis.com/v1beta')
+
+# Outbound Gemini pacing, shared by every worker through a locked database row.
+# Defaults match the gemini-2.0-flash free tier (15 requests/minute).
+GEMINI_RATE_LIMIT_PER_MINUTE = float(os.getenv('GEMINI_RATE_LIMIT_PER_MINUTE', '15'))
+GEMINI_RATE_LIMIT_BURST = int(os.getenv('GEMINI_RATE_LIMIT_BURST', '5'))
+# Longest an API request may wait for a Gemini slot before returning a retriable error
+GEMINI_MAX_WAIT_SECONDS = float(os.getenv('GEMINI_MAX_WAIT_SECONDS', '10'))
+
+# Circuit breaker for SerpAPI/Gemini: opens after this many consecutive
+# failures (errors, 5xx or responses slower than the latency threshold),
+# then lets a probe through after the reset timeout
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_BREAKER_FAILURE_THRESHOLD', '5'))
+CIRCUIT_BREAKER_LATENCY_THRESHOLD = float(os.getenv('CIRCUIT_BREAKER_LATENCY_THRESHOLD', '10'))
+CIRCUIT_BREAKER_RESET_TIMEOUT = float(os.getenv('CIRCUIT_BREAKER_RESET_TIMEOUT', '30'))
+CIRCUIT_BREAKER_HALF_OPEN_PROBES = int(os.getenv('CIRCUIT_BREAKER_HALF_OPEN_PROBES', '1'))
+
+# Scan Gemini answers as they stream and stop once the brand is found
+GEMINI_STREAMING = os.getenv('GEMINI_STREAMING', 'True').lower() == 'true'
+
+# Persistent LLM response cache: identical prompts are answered from the
+# database until they expire (refresh_citations --no-cache bypasses it).
+# Expired and least recently used rows are evicted on ~1 in EVICT_EVERY writes
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'True').lower() == 'true'
+LLM_CACHE_TTL_SECONDS = int(os.getenv('LLM_CACHE_TTL_SECONDS', '86400'))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '10000'))
+LLM_CACHE_EVICT_EVERY = int(os.getenv('LLM_CACHE_EVICT_EVERY', '100'))
+
+# Largest payload accepted by the POST /api/{rankings,citations,reviews}/bulk/ endpoints
+BULK_MAX_ROWS = int(os.getenv('BULK_MAX_ROWS', '1000'))
+
+# Brand onboarding auto-fetch (brands.jobs): background threads per process,
+# retries with exponential backoff, and when a running job counts as orphaned.
+# Turn auto-start off to leave every job to `python manage.py run_fetch_jobs`.
+FETCH_WORKERS = int(os.getenv('FETCH_WORKERS', '4'))
+FETCH_JOBS_AUTO_START = os.getenv('FETCH_JOBS_AUTO_START', 'True').lower() == 'true'
+FETCH_JOB_MAX_ATTEMPTS = int(os.getenv('FETCH_JOB_MAX_ATTEMPTS', '3'))
+FETCH_RETRY_BASE_SECONDS = float(os.getenv('FETCH_RETRY_BASE_SECONDS', '30'))
+FETCH_JOB_STALE_SECONDS = int(os.getenv('FETCH_JOB_STALE_SECONDS', '900'))
+
+# Most calls each process keeps in flight per provider when fanning out
+# (integrations.concurrency); rate limits still pace them
+PROVIDER_CONCURRENCY = {
+    'serpapi': int(os.getenv('SERPAPI_CONCURRENCY', '4')),
+    'gemini': int(os.getenv('GEMINI_CONCURRENCY', '4')),
+}
+
+# POST /api/brands/import/: largest import, size above which per-row results
+# are streamed back as NDJSON, and seconds between the new brands' auto-fetch starts
+BRAND_IMPORT_MAX_ROWS = int(os.getenv('BRAND_IMPORT_MAX_ROWS', '5000'))
+BRAND_IMPORT_STREAM_THRESHOLD = int(os.getenv('BRAND_IMPORT_STREAM_THRESHOLD', '500'))
+FETCH_IMPORT_SPACING_SECONDS = float(os.getenv('FETCH_IMPORT_SPACING_SECONDS', '5'))
+
+# Deleted brands are hidden at once and their history purged in the background
+# (brands.purge): rows per DELETE, and the pause between chunks
+BRAND_PURGE_CHUNK_SIZE = int(os.getenv('BRAND_PURGE_CHUNK_SIZE', '5000'))
+BRAND_PURGE_PAUSE_SECONDS = float(os.getenv('BRAND_PURGE_PAUSE_SECONDS', '0.05'))
+
+# API response compression (socialbooster.middleware.compression): brotli when
+# installed and accepted, else gzip; smaller bodies are sent uncompressed
+COMPRESSION_MIN_BYTES = int(os.getenv('COMPRESSION_MIN_BYTES', '1024'))
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', '5'))
+
+# POST /api/batch/: most sub-requests per batch, and how many of a read-only
+# batch's sub-requests run at once (1 runs them in order)
+BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', '20'))
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', '4'))
+
+# JWT users are cached per process (users.authentication) for this many
+# seconds; saves and deletes evict them at once. 0 checks the database on
+# every request, as simplejwt does.
+USER_CACHE_TTL_SECONDS = int(os.getenv('USER_CACHE_TTL_SECONDS', '60'))
+USER_CACHE_MAX_ENTRIES = int(os.getenv('USER_CACHE_MAX_ENTRIES', '1024'))
+
+# Share of API requests that collect DB, cache and provider timings for the
+# Server-Timing header and request log (socialbooster.telemetry)
+TELEMETRY_SAMPLE_RATE = float(os.getenv('TELEMETRY_SAMPLE_RATE', '1.0' if DEBUG else '0.05'))
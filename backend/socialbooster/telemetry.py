@@ -0,0 +1,141 @@
+"""
+Per-request performance telemetry.
+
+RequestLoggingMiddleware opens a Telemetry collector for a sample of API
+requests (TELEMETRY_SAMPLE_RATE). While it is open:
+
+- queries on the request thread's DB connections are counted and timed
+  with connection.execute_wrapper, as are queries in worker threads started
+  through integrations.concurrency;
+- reads from the default cache count hits and misses (socialbooster.cache);
+- outbound provider calls are timed per provider (integrations.circuit_breaker).
+
+The totals are sent back as a Server-Timing header and added as fields to
+the request log line. Unsampled requests only pay a context variable
+lookup in the cache and provider hooks.
+"""
+import random
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import connections
+
+_current = ContextVar('telemetry', default=None)
+
+
+class Telemetry:
+    """Counters for one request; safe to update from several threads."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.http = {}  # provider -> [calls, seconds]
+    
+    def record_query(self, seconds: float):
+        with self._lock:
+            self.db_queries += 1
+            self.db_seconds += seconds
+    
+    def record_cache(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+    
+    def record_http(self, provider: str, seconds: float):
+        with self._lock:
+            calls = self.http.setdefault(provider, [0, 0.0])
+            calls[0] += 1
+            calls[1] += seconds
+    
+    def _execute(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record_query(time.perf_counter() - started)
+    
+    @contextmanager
+    def instrument_connections(self):
+        """Count queries on every DB connection of the current thread."""
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self._execute))
+            yield
+    
+    def fields(self) -> dict:
+        """Structured log fields."""
+        return {
+            'db_queries': self.db_queries,
+            'db_ms': round(self.db_seconds * 1000, 1),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'http_calls': sum(calls for calls, _ in self.http.values()),
+            'http_ms': round(sum(seconds for _, seconds in self.http.values()) * 1000, 1),
+        }
+    
+    def summary(self) -> str:
+        """Short key=value form for the log message."""
+        fields = self.fields()
+        summary = (f"db={fields['db_queries']}q/{fields['db_ms']:.0f}ms "
+                   f"cache={fields['cache_hits']}h/{fields['cache_misses']}m")
+        if fields['http_calls']:
+            summary += f" http={fields['http_calls']}/{fields['http_ms']:.0f}ms"
+        return summary
+    
+    def server_timing(self, total_ms: float) -> str:
+        """Server-Timing header value (durations in milliseconds)."""
+        metrics = [
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_queries} queries"',
+            f'cache;desc="{self.cache_hits} hits {self.cache_misses} misses"',
+        ]
+        for provider, (calls, seconds) in sorted(self.http.items()):
+            metrics.append(f'{provider};dur={seconds * 1000:.1f};desc="{calls} calls"')
+        metrics.append(f'total;dur={total_ms:.1f}')
+        return ', '.join(metrics)
+
+
+def current():
+    """The collector for the request being handled, or None if it isn't sampled."""
+    return _current.get()
+
+
+def sampled() -> bool:
+    """Whether to collect telemetry for a new request."""
+    rate = settings.TELEMETRY_SAMPLE_RATE
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+@contextmanager
+def collect():
+    """Collect telemetry for the code run inside the block."""
+    telemetry = Telemetry()
+    token = _current.set(telemetry)
+    try:
+        with telemetry.instrument_connections():
+            yield telemetry
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def instrument_thread():
+    """In a worker thread run with the request's context: count its own DB connections too."""
+    telemetry = _current.get()
+    if telemetry is None:
+        yield
+        return
+    with telemetry.instrument_connections():
+        yield
+
+
+def record_http(provider: str, seconds: float):
+    telemetry = _current.get()
+    if telemetry is not None:
+        telemetry.record_http(provider, seconds)
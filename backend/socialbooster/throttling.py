@@ -1,19 +1,98 @@
 """
 Custom throttling classes for rate limiting.
+
+The throttles use GCRA (the generic cell rate algorithm) instead of DRF's
+SimpleRateThrottle history. SimpleRateThrottle caches a list of every
+request timestamp in the window, up to 1000 floats per client for
+1000/hour, and pickles it on every request. GCRA stores one float per
+client and scope: the theoretical arrival time (TAT) of the next request.
+A request is allowed while the TAT is at most one period ahead, so
+`num_requests` per `duration` are admitted as before, bursts included.
+Scopes and rates are unchanged (DEFAULT_THROTTLE_RATES).
 """
+import math
+import threading
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache as default_cache, caches
+from django.core.cache.backends.locmem import LocMemCache
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+from .locks import cache_lock
+
+_local_lock = threading.Lock()
+
+
+class GCRAMixin:
+    """
+    Fixed-size GCRA state for a SimpleRateThrottle subclass.
+    
+    The read-modify-write of the TAT is done under a cache lock so
+    concurrent requests sharing the cache can't both take the last slot
+    (a thread lock when the cache is the process-local one).
+    The quota left is recorded on the request for the X-RateLimit-*
+    headers (socialbooster.middleware.ratelimit).
+    """
+    cache_format = 'throttle_gcra_%(scope)s_%(ident)s'
+    
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        
+        interval = self.duration / self.num_requests
+        # Resolve the backend once rather than through the cache proxy per call
+        cache = caches[DEFAULT_CACHE_ALIAS] if self.cache is default_cache else self.cache
+        with self.state_lock(cache):
+            self.now = self.timer()
+            stored = cache.get(self.key)
+            tat = max(stored, self.now) if isinstance(stored, float) else self.now
+            allowed = tat + interval - self.duration <= self.now
+            if allowed:
+                tat += interval
+                # Once the TAT has passed the client is back to a full quota
+                cache.set(self.key, tat, math.ceil(tat - self.now))
+        
+        self.tat = tat
+        self.wait_seconds = 0.0 if allowed else tat + interval - self.duration - self.now
+        self.record_quota(request)
+        return allowed
+    
+    def state_lock(self, cache):
+        if isinstance(cache, LocMemCache):
+            return _local_lock
+        return cache_lock(self.key)
+    
+    def wait(self):
+        return self.wait_seconds
+    
+    def remaining(self) -> int:
+        """Requests still allowed right now."""
+        return max(0, math.floor((self.duration - (self.tat - self.now)) / (self.duration / self.num_requests)))
+    
+    def record_quota(self, request):
+        """Keep the tightest of the request's throttles for the X-RateLimit-* headers."""
+        quota = {
+            'limit': self.num_requests,
+            'remaining': self.remaining(),
+            'reset': math.ceil(max(0.0, self.tat - self.now)),
+            'scope': self.scope,
+        }
+        current = getattr(request._request, 'rate_limit', None)
+        if current is None or quota['remaining'] < current['remaining']:
+            request._request.rate_limit = quota
 
 
-class BurstRateThrottle(AnonRateThrottle):
+class BurstRateThrottle(GCRAMixin, AnonRateThrottle):
     """Burst protection - prevents rapid-fire requests."""
     scope = 'burst'
 
 
-class SustainedRateThrottle(UserRateThrottle):
+class SustainedRateThrottle(GCRAMixin, UserRateThrottle):
     """Sustained rate limit for authenticated users."""
     scope = 'sustained'
 
 
-class AnonSustainedRateThrottle(AnonRateThrottle):
+class AnonSustainedRateThrottle(GCRAMixin, AnonRateThrottle):
     """Sustained rate limit for anonymous users."""
     scope = 'anon_sustained'
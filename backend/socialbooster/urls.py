@@ -6,6 +6,7 @@ from django.urls import path, include, re_path
 from django.http import HttpResponse
 from django.conf import settings
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from .batch import BatchView
 import os
 
 def serve_react(request):
@@ -32,6 +33,7 @@ urlpatterns = [
     path('api/reviews/', include('reviews.urls')),
     path('api/dashboard/', include('dashboard.urls')),
     path('api/integrations/', include('integrations.urls')),
+    path('api/batch/', BatchView.as_view(), name='batch'),
     
     # Serve React app for all other routes (exclude api/, admin/, static/, assets/)
     re_path(r'^(?!api/|admin/|static/|assets/).*$', serve_react),
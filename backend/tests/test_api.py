@@ -45,11 +45,13 @@ class TestBrandAPI:
         assert response.data['name'] == 'Updated Brand'
     
     def test_delete_brand(self, authenticated_client, test_brand):
-        """Test deleting a brand."""
+        """Test deleting a brand: hidden at once, history purged in the background."""
         url = f'/api/brands/{test_brand.id}/'
         response = authenticated_client.delete(url)
-        assert response.status_code == status.HTTP_200_OK
+        assert response.status_code == status.HTTP_202_ACCEPTED
         assert Brand.objects.filter(id=test_brand.id).count() == 0
+        assert authenticated_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+        assert response.data['status_url'] == f"/api/brands/deletions/{response.data['deletion_id']}/"
 
 
 @pytest.mark.django_db
@@ -0,0 +1,80 @@
+"""
+Tests for JWT authentication with the per-process user cache.
+"""
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from users import authentication
+
+
+@pytest.fixture
+def jwt_client(test_user):
+    cache.clear()
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(test_user).access_token}')
+    return client
+
+
+def _user_queries(client, method='get', path='/api/auth/profile/'):
+    with CaptureQueriesContext(connection) as queries:
+        response = getattr(client, method)(path)
+    return response, sum('"auth_user"' in query['sql'] for query in queries.captured_queries)
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    """Users come from the cache after the first request; saves evict them."""
+    
+    def test_second_request_skips_user_lookup(self, jwt_client, test_user):
+        first, first_queries = _user_queries(jwt_client)
+        second, second_queries = _user_queries(jwt_client)
+        
+        assert first.status_code == second.status_code == 200
+        assert second.data['username'] == test_user.username
+        assert (first_queries, second_queries) == (1, 0)
+    
+    def test_deactivation_takes_effect_at_once(self, jwt_client, test_user):
+        assert jwt_client.get('/api/auth/profile/').status_code == 200
+        
+        test_user.is_active = False
+        test_user.save()
+        
+        assert jwt_client.get('/api/auth/profile/').status_code == 401
+    
+    def test_entries_expire(self, jwt_client, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(authentication.time, 'monotonic', lambda: now[0])
+        _user_queries(jwt_client)
+        
+        now[0] += 61
+        
+        assert _user_queries(jwt_client)[1] == 1
+    
+    def test_strict_actions_and_staff_check_database(self, jwt_client, test_user, test_brand):
+        _user_queries(jwt_client)
+        
+        response, queries = _user_queries(jwt_client, 'delete', f'/api/brands/{test_brand.id}/')
+        assert response.status_code == 202
+        assert queries == 1
+        
+        test_user.is_staff = True
+        test_user.save()
+        _user_queries(jwt_client)
+        assert _user_queries(jwt_client)[1] == 1
+    
+    def test_cache_disabled(self, jwt_client, settings):
+        settings.USER_CACHE_TTL_SECONDS = 0
+        _user_queries(jwt_client)
+        
+        assert _user_queries(jwt_client)[1] == 1
+    
+    def test_cached_users_are_copies(self, jwt_client, test_user):
+        authentication.user_cache.put(str(test_user.id), test_user)
+        
+        first = authentication.user_cache.get(str(test_user.id))
+        first.first_name = 'Changed'
+        
+        assert authentication.user_cache.get(str(test_user.id)).first_name == ''
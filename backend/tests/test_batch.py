@@ -0,0 +1,125 @@
+"""
+Tests for POST /api/batch/.
+"""
+import pytest
+from datetime import date
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from brands.models import Brand
+from citations.models import AICitation
+from rankings.models import SearchRanking
+from reviews.models import Review
+from socialbooster.throttling import GCRAMixin
+
+URL = '/api/batch/'
+
+
+@pytest.fixture(autouse=True)
+def sequential_batches(settings):
+    # Worker threads can't see rows inside the test's open transaction
+    settings.BATCH_CONCURRENCY = 1
+    cache.clear()
+
+
+@pytest.fixture
+def history(test_brand):
+    SearchRanking.objects.create(brand=test_brand, keyword='crm', position=3, date=date(2026, 1, 1))
+    AICitation.objects.create(brand=test_brand, ai_model='gemini', query='q', mentioned=True, date=date(2026, 1, 1))
+    Review.objects.create(brand=test_brand, platform='g2', rating=4.5, review_count=10, date=date(2026, 1, 1))
+    return test_brand
+
+
+def _batch(client, requests):
+    return client.post(URL, {'requests': requests}, format='json')
+
+
+@pytest.mark.django_db
+class TestBatch:
+    """Sub-requests run in-process and come back in order."""
+    
+    def test_dashboard_fan_out(self, api_client, history):
+        paths = [
+            '/api/dashboard/overview/', '/api/citations/breakdown/', '/api/citations/timeline/?days=7',
+            '/api/reviews/summary/', '/api/rankings/summary/',
+        ]
+        
+        response = _batch(api_client, [{'id': n, 'path': path} for n, path in enumerate(paths)])
+        
+        assert response.status_code == status.HTTP_200_OK
+        results = response.data['responses']
+        assert [result['id'] for result in results] == list(range(5))
+        assert all(result['status'] == 200 for result in results)
+        cache.clear()  # The sub-requests used up half of the burst allowance
+        for path, result in zip(paths, results):
+            assert result['body'] == api_client.get(path).data
+    
+    def test_params_and_errors_are_per_sub_request(self, api_client, history):
+        response = _batch(api_client, [
+            {'path': '/api/citations/', 'params': {'fields': 'id,mentioned'}},
+            {'path': '/api/rankings/', 'params': {'fields': 'nope'}},
+            {'path': '/api/nowhere/'},
+            {'method': 'POST', 'path': '/api/brands/', 'body': {'name': 'Anon Brand'}},
+        ])
+        
+        statuses = [result['status'] for result in response.data['responses']]
+        assert statuses == [200, 400, 404, 401]
+        assert response.data['responses'][0]['body']['results'][0] == {'id': 1, 'mentioned': True}
+    
+    def test_writes_share_auth_and_run_in_order(self, authenticated_client, test_brand):
+        response = _batch(authenticated_client, [
+            {'method': 'POST', 'path': '/api/rankings/',
+             'body': {'brand': test_brand.id, 'keyword': 'crm', 'position': 2, 'date': '2026-01-02'}},
+            {'path': '/api/rankings/summary/'},
+        ])
+        
+        created, summary = response.data['responses']
+        assert created['status'] == 201
+        assert summary['body']['total_rankings'] == 1
+    
+    def test_sub_requests_share_the_callers_throttles(self, api_client, history, monkeypatch):
+        monkeypatch.setattr(GCRAMixin, 'timer', lambda self: 1_000_000.0, raising=False)
+        # Burst allows 10 requests per second: the batch takes one, its sub-requests the rest
+        response = _batch(api_client, [{'path': '/api/reviews/summary/'}] * 12)
+        
+        statuses = [result['status'] for result in response.data['responses']]
+        assert statuses == [200] * 9 + [429] * 3
+        assert response['X-RateLimit-Remaining'] == '0'
+        assert api_client.get('/api/reviews/summary/').status_code == 429
+    
+    def test_strict_actions_recheck_the_user(self, api_client, test_user, test_brand):
+        token = RefreshToken.for_user(test_user).access_token
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        assert api_client.get('/api/brands/').status_code == 200  # User is now cached
+        # Deactivated without signals: only a database check notices
+        User.objects.filter(id=test_user.id).update(is_active=False)
+        
+        response = _batch(api_client, [{'method': 'DELETE', 'path': f'/api/brands/{test_brand.id}/'}])
+        
+        assert response.data['responses'][0]['status'] == 401
+        assert Brand.objects.filter(id=test_brand.id).exists()
+    
+    def test_rejects_bad_batches(self, api_client, settings):
+        settings.BATCH_MAX_REQUESTS = 2
+        
+        assert _batch(api_client, []).status_code == 400
+        assert _batch(api_client, [{'path': '/api/brands/'}] * 3).status_code == 400
+        assert _batch(api_client, [{'path': '/admin/'}]).status_code == 400
+        assert _batch(api_client, [{'path': '/api/batch/'}]).status_code == 400
+        assert _batch(api_client, [{'path': '/api/brands/', 'method': 'TRACE'}]).status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentBatch:
+    """Read-only batches fan out over worker threads."""
+    
+    def test_reads_run_concurrently(self, api_client, history, settings):
+        settings.BATCH_CONCURRENCY = 4
+        paths = ['/api/citations/breakdown/', '/api/reviews/summary/', '/api/rankings/summary/']
+        
+        response = _batch(api_client, [{'path': path} for path in paths])
+        
+        results = response.data['responses']
+        assert [result['status'] for result in results] == [200, 200, 200]
+        assert results[2]['body']['total_rankings'] == 1
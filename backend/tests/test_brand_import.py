@@ -0,0 +1,93 @@
+"""
+Tests for POST /api/brands/import/.
+"""
+import json
+import pytest
+from datetime import timedelta
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework import status
+from brands.models import Brand, FetchJob
+
+URL = '/api/brands/import/'
+
+
+@pytest.mark.django_db
+class TestBrandImport:
+    """Rows are validated, deduplicated and inserted in bulk."""
+    
+    def test_json_import(self, authenticated_client, test_brand, settings):
+        settings.FETCH_IMPORT_SPACING_SECONDS = 10
+        rows = [
+            {'name': 'Acme', 'category': 'software', 'website': 'https://acme.com'},
+            {'name': 'acme', 'website': 'http://www.acme.com/'},
+            {'name': 'Test Brand', 'website': 'https://testbrand.com'},
+            {'name': 'Globex', 'category': 'not-a-category'},
+            {'name': 'Initech'},
+        ]
+        
+        response = authenticated_client.post(URL, rows, format='json')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['counts'] == {'created': 2, 'duplicate': 1, 'exists': 1, 'error': 1}
+        results = response.data['results']
+        assert [r['status'] for r in results] == ['created', 'duplicate', 'exists', 'error', 'created']
+        assert results[1]['duplicate_of'] == 0
+        assert results[2]['id'] == test_brand.id
+        assert 'category' in results[3]['errors']
+        assert Brand.objects.filter(name__in=['Acme', 'Initech']).count() == 2
+        
+        # Enrichment is queued as a paced backlog, not all at once
+        jobs = list(FetchJob.objects.order_by('run_after'))
+        assert [job.id for job in jobs] == [results[0]['fetch_job_id'], results[4]['fetch_job_id']]
+        assert jobs[1].run_after - jobs[0].run_after == timedelta(seconds=10)
+    
+    def test_csv_upload(self, authenticated_client):
+        upload = SimpleUploadedFile(
+            'brands.csv', b'name,category,website\nAcme,software,https://acme.com\nGlobex,,\n', content_type='text/csv'
+        )
+        
+        response = authenticated_client.post(URL, {'file': upload}, format='multipart')
+        
+        assert response.data['counts'] == {'created': 2}
+        assert Brand.objects.get(name='Globex').category == 'other'
+    
+    def test_csv_body_without_fetch(self, authenticated_client):
+        response = authenticated_client.generic(
+            'POST', f'{URL}?fetch=false', 'name,website\nAcme,https://acme.com\n', content_type='text/csv'
+        )
+        
+        assert response.data['counts'] == {'created': 1}
+        assert 'fetch_job_id' not in response.data['results'][0]
+        assert not FetchJob.objects.exists()
+    
+    def test_streamed_results(self, authenticated_client):
+        rows = [{'name': f'Brand {n}'} for n in range(3)] + [{'name': 'Brand 0'}]
+        
+        response = authenticated_client.post(f'{URL}?stream=true', rows, format='json')
+        
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        assert [line['status'] for line in lines[:-1]] == ['created', 'created', 'created', 'duplicate']
+        assert lines[-1] == {'summary': {'total': 4, 'counts': {'created': 3, 'duplicate': 1}}}
+    
+    def test_stream_not_read_still_imports_everything(self, authenticated_client, settings):
+        settings.BRAND_IMPORT_STREAM_THRESHOLD = 2
+        rows = [{'name': f'Brand {n}'} for n in range(5)]
+        
+        # The client goes away before reading a single line
+        response = authenticated_client.post(f'{URL}?fetch=false', rows, format='json')
+        
+        assert response.streaming
+        assert Brand.objects.count() == 5
+    
+    def test_rejects_bad_payloads(self, authenticated_client, settings):
+        settings.BRAND_IMPORT_MAX_ROWS = 2
+        
+        assert authenticated_client.post(URL, {'name': 'x'}, format='json').status_code == 400
+        assert authenticated_client.post(URL, [{'name': n} for n in 'abc'], format='json').status_code == 400
+        response = authenticated_client.generic('POST', URL, 'website\nhttps://a.com\n', content_type='text/csv')
+        assert response.status_code == 400
+    
+    def test_requires_auth(self, api_client):
+        response = api_client.post(URL, [{'name': 'Acme'}], format='json')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,133 @@
+"""
+Tests for the local brand matcher cascade.
+"""
+import pytest
+from django.core.cache import cache
+from rest_framework import status
+from integrations.brand_matcher import BrandMatcher, matcher_stats
+from integrations.gemini_service import GeminiService
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    cache.clear()
+
+
+@pytest.fixture
+def hubspot():
+    return BrandMatcher('HubSpot', aliases=['HubSpot CRM'], website='https://www.hubspot.com', category='software')
+
+
+class TestBrandMatcher:
+    """Each stage of the cascade decides the cases it is meant for."""
+    
+    @pytest.mark.parametrize('text, stage', [
+        ('We recommend HubSpot CRM for small teams.', 'alias'),
+        ('Try Hub Spot for inbound marketing.', 'token'),
+        ('Hubspott is a popular marketing tool.', 'fuzzy'),
+    ])
+    def test_local_matches(self, hubspot, text, stage):
+        verdict = hubspot.classify(text)
+        assert verdict['outcome'] == BrandMatcher.MATCH
+        assert verdict['stage'] == stage
+    
+    def test_domain_match(self):
+        """A website domain that differs from the name still counts as a mention."""
+        matcher = BrandMatcher('Alphabet', website='https://abc.xyz', category='software')
+        text = 'Investor relations are published on abc.xyz every quarter.'
+        verdict = matcher.classify(text)
+        assert verdict['stage'] == 'domain'
+        start, end = verdict['span']
+        assert text[start:end] == 'abc.xyz'
+    
+    def test_unrelated_text_is_rejected(self, hubspot):
+        """Text sharing nothing with the brand profile never reaches the LLM."""
+        verdict = hubspot.classify('The best pizza in Naples uses a wood-fired oven.')
+        assert verdict['outcome'] == BrandMatcher.NO_MATCH
+        assert verdict['stage'] == 'profile'
+    
+    def test_related_text_is_ambiguous(self, hubspot):
+        """On-topic answers without a mention are left to semantic verification."""
+        verdict = hubspot.classify('Many teams use a software tool to manage their sales pipeline.')
+        assert verdict['outcome'] == BrandMatcher.AMBIGUOUS
+    
+    def test_stats_report_avoided_verifications(self, hubspot):
+        hubspot.classify('Try Hub Spot for inbound marketing.')
+        hubspot.classify('The best pizza in Naples uses a wood-fired oven.')
+        hubspot.classify('Many teams use a software tool to manage their sales pipeline.')
+        
+        stats = matcher_stats()
+        assert stats['checks'] == 3
+        assert stats['llm_verifications'] == 1
+        assert stats['llm_verifications_avoided'] == 2
+        assert stats['stages']['token']['hits'] == 1
+
+
+class TestCitationPrefilter:
+    """check_brand_citation only calls semantic verify for ambiguous answers."""
+    
+    @pytest.mark.django_db
+    def test_unrelated_answer_skips_verify_call(self, fake_api_server):
+        matcher = BrandMatcher('Stripe', website='https://stripe.com', category='finance')
+        result = GeminiService().check_brand_citation('Stripe', 'Best team chat app?', matcher=matcher)
+        
+        assert result['mentioned'] is False
+        assert result['match_stage'] == 'profile'
+        assert 'gemini.generateContent' not in fake_api_server.stats
+    
+    @pytest.mark.django_db
+    def test_metrics_endpoint(self, api_client):
+        response = api_client.get('/api/integrations/metrics/')
+        assert response.status_code == status.HTTP_200_OK
+        assert 'matcher' in response.data
+
+
+@pytest.mark.django_db
+class TestBatchSemanticVerify:
+    """Ambiguous answers are verified many to a prompt."""
+    
+    ITEMS = [
+        ('HubSpot', 'Many teams use a software tool to manage their sales pipeline.'),
+        ('Stripe', 'Online businesses need a reliable way to accept card payments.'),
+        ('Zoom', 'Remote teams rely on video meetings to stay in touch every day.'),
+    ]
+    
+    def test_one_request_for_many_items(self, fake_api_server):
+        assert GeminiService().batch_semantic_verify(self.ITEMS) == [True, True, True]
+        assert fake_api_server.stats['gemini.generateContent'] == {200: 1}
+    
+    def test_unparseable_items_fall_back(self, monkeypatch):
+        service = GeminiService()
+        single_calls = []
+        monkeypatch.setattr(service, '_verify_batch_request', lambda items: {1: True, 3: False})
+        monkeypatch.setattr(
+            service, '_semantic_verify', lambda brand, text: single_calls.append(brand) or True
+        )
+        
+        assert service.batch_semantic_verify(self.ITEMS) == [True, True, False]
+        assert single_calls == ['Stripe']
+    
+    def test_answer_parsing(self, monkeypatch, settings):
+        settings.LLM_CACHE_ENABLED = False
+        service = GeminiService()
+        answer = '1. YES\n**2.** no\n2) YES\n- 3: Yes\n4. NO'
+        monkeypatch.setattr(service, '_make_request', lambda *args, **kwargs: type('Response', (), {
+            'json': lambda self: {'candidates': [{'content': {'parts': [{'text': answer}]}}]}
+        })())
+        
+        # Item 2 answered both ways, item 4 doesn't exist
+        assert service._verify_batch_request(self.ITEMS) == {1: True, 3: True}
+    
+    def test_deferred_results_are_resolved(self, fake_api_server):
+        service = GeminiService()
+        pending = [
+            (brand, {'mentioned': False, 'needs_verification': True, 'response_text': text})
+            for brand, text in self.ITEMS
+        ]
+        service.resolve_verifications(pending)
+        
+        for _, result in pending:
+            assert result['mentioned'] is True
+            assert result['match_stage'] == 'semantic'
+            assert result['needs_verification'] is False
+            assert 'response_text' not in result
@@ -0,0 +1,116 @@
+"""
+Tests for hiding deleted brands and purging their history in chunks.
+"""
+import pytest
+from datetime import date, timedelta
+from io import StringIO
+from django.core.management import call_command
+from brands.jobs import enqueue_fetch, run_job
+from brands.models import Brand, BrandDeletion, FetchJob
+from brands.purge import delete_brand, run_purge
+from citations.models import AICitation
+from rankings.models import SearchRanking
+from reviews.models import Review
+
+
+@pytest.fixture
+def history(test_brand):
+    """A brand with a few days of rankings, citations and reviews."""
+    days = [date(2026, 1, 1) + timedelta(days=n) for n in range(5)]
+    SearchRanking.objects.bulk_create(
+        SearchRanking(brand=test_brand, keyword='crm', position=3, date=day) for day in days
+    )
+    AICitation.objects.bulk_create(
+        AICitation(brand=test_brand, ai_model='gemini', query='q', mentioned=True, date=day) for day in days
+    )
+    Review.objects.bulk_create(
+        Review(brand=test_brand, platform='g2', rating=4.5, review_count=10, date=day) for day in days
+    )
+    return test_brand
+
+
+@pytest.mark.django_db
+class TestBrandPurge:
+    """Deletion hides the brand at once; the purge removes rows chunk by chunk."""
+    
+    def test_delete_hides_brand_and_its_rows(self, api_client, history):
+        other = Brand.objects.create(name='Other Brand')
+        SearchRanking.objects.create(brand=other, keyword='crm', position=1, date=date(2026, 1, 1))
+        
+        deletion = delete_brand(history)
+        
+        assert deletion.status == BrandDeletion.PENDING
+        # Counted by the purge, not during the request
+        assert deletion.progress == {}
+        assert not Brand.objects.filter(id=history.id).exists()
+        assert Brand.all_objects.filter(id=history.id).exists()
+        # Reads skip the hidden brand's rows while they wait to be purged
+        assert api_client.get('/api/rankings/').data['count'] == 1
+        assert api_client.get('/api/citations/').data['count'] == 0
+    
+    def test_purge_in_chunks(self, history, settings):
+        settings.BRAND_PURGE_CHUNK_SIZE = 2
+        settings.BRAND_PURGE_PAUSE_SECONDS = 0
+        deletion = delete_brand(history)
+        
+        assert run_purge(deletion.id) == BrandDeletion.SUCCEEDED
+        
+        deletion.refresh_from_db()
+        assert deletion.progress['reviews.Review'] == {'total': 5, 'deleted': 5}
+        assert deletion.finished_at is not None
+        assert not Brand.all_objects.filter(id=history.id).exists()
+        assert SearchRanking.objects.count() == AICitation.objects.count() == Review.objects.count() == 0
+        # Already finished
+        assert run_purge(deletion.id) is None
+    
+    def test_purge_resumes_with_totals(self, history, settings):
+        settings.BRAND_PURGE_PAUSE_SECONDS = 0
+        deletion = delete_brand(history)
+        # An earlier run deleted two rankings before it was interrupted
+        SearchRanking.objects.filter(id__in=SearchRanking.objects.values('id')[:2]).delete()
+        BrandDeletion.objects.filter(id=deletion.id).update(
+            progress={'rankings.SearchRanking': {'total': 5, 'deleted': 2}}
+        )
+        
+        assert run_purge(deletion.id) == BrandDeletion.SUCCEEDED
+        
+        deletion.refresh_from_db()
+        assert deletion.progress['rankings.SearchRanking'] == {'total': 5, 'deleted': 5}
+        assert deletion.progress['citations.AICitation'] == {'total': 5, 'deleted': 5}
+    
+    def test_hidden_rows_skipped_by_every_read(self, api_client, history):
+        today = date.today()
+        SearchRanking.objects.create(brand=history, keyword='crm', position=3, date=today)
+        AICitation.objects.create(brand=history, ai_model='gemini', query='q', mentioned=True, date=today)
+        delete_brand(history)
+        
+        overview = api_client.get('/api/dashboard/overview/').data
+        assert overview['overview']['total_reviews'] == 0
+        assert overview['charts']['citation_breakdown'] == []
+        export = api_client.get('/api/dashboard/export/', {'brand': history.id}).data
+        assert export['rankings'] == export['citations'] == export['reviews'] == []
+        assert api_client.get('/api/citations/timeline/').data['datasets'] == []
+        assert api_client.get(f'/api/rankings/trends/{history.id}/').data['trends'] == {}
+    
+    def test_deleted_brand_fetch_job_is_skipped(self, test_brand):
+        job = enqueue_fetch(test_brand)
+        delete_brand(test_brand)
+        
+        assert run_job(job.id) == FetchJob.FAILED
+    
+    def test_deletion_status_endpoint(self, authenticated_client, history):
+        response = authenticated_client.delete(f'/api/brands/{history.id}/')
+        status_url = response.data['status_url']
+        
+        before = authenticated_client.get(status_url)
+        assert before.data['status'] == BrandDeletion.PENDING
+        assert (before.data['rows_deleted'], before.data['rows_total']) == (0, 0)
+        
+        out = StringIO()
+        call_command('purge_deleted_brands', stdout=out)
+        assert '1 succeeded' in out.getvalue()
+        
+        after = authenticated_client.get(status_url)
+        assert after.data['status'] == BrandDeletion.SUCCEEDED
+        assert (after.data['rows_deleted'], after.data['rows_total']) == (15, 15)
+        assert authenticated_client.get('/api/brands/deletions/999/').status_code == 404
@@ -0,0 +1,88 @@
+"""
+Tests for the bulk upsert endpoints.
+"""
+import pytest
+from datetime import date
+from rest_framework import status
+from citations.models import AICitation
+from rankings.models import SearchRanking
+from reviews.models import Review
+
+
+@pytest.mark.django_db
+class TestBulkUpsert:
+    """Rows are validated individually and upserted on their natural key."""
+    
+    def test_rankings_created_then_updated(self, authenticated_client, test_brand):
+        rows = [
+            {'brand': test_brand.id, 'keyword': 'crm software', 'position': 4, 'date': '2026-01-02'},
+            {'brand': test_brand.id, 'keyword': 'crm tool', 'position': 9, 'date': '2026-01-02'},
+        ]
+        response = authenticated_client.post('/api/rankings/bulk/', rows, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['counts'] == {'created': 2}
+        
+        rows[0]['position'] = 2
+        response = authenticated_client.post('/api/rankings/bulk/', {'rows': rows[:1]}, format='json')
+        assert response.data['results'] == [{'index': 0, 'status': 'updated'}]
+        assert SearchRanking.objects.get(keyword='crm software').position == 2
+        assert SearchRanking.objects.count() == 2
+    
+    def test_invalid_rows_reported_individually(self, authenticated_client, test_brand):
+        rows = [
+            {'brand': test_brand.id, 'ai_model': 'gemini', 'query': 'What is X?', 'mentioned': True, 'date': '2026-01-02'},
+            {'brand': test_brand.id, 'ai_model': 'bard', 'query': 'What is X?', 'date': '2026-01-02'},
+            {'brand': 999999, 'ai_model': 'gemini', 'query': 'What is X?', 'date': '2026-01-02'},
+            {'brand': test_brand.id, 'ai_model': 'gemini', 'query': 'What is X?'},
+        ]
+        response = authenticated_client.post('/api/citations/bulk/', rows, format='json')
+        results = response.data['results']
+        
+        assert results[0] == {'index': 0, 'status': 'created'}
+        assert 'ai_model' in results[1]['errors']
+        assert 'brand' in results[2]['errors']
+        assert 'date' in results[3]['errors']
+        assert AICitation.objects.count() == 1
+    
+    def test_duplicate_keys_in_one_request(self, authenticated_client, test_brand):
+        row = {'brand': test_brand.id, 'platform': 'g2', 'rating': '4.5', 'review_count': 10, 'date': '2026-01-02'}
+        response = authenticated_client.post(
+            '/api/reviews/bulk/', [row, dict(row, rating='4.7')], format='json'
+        )
+        
+        assert [r['status'] for r in response.data['results']] == ['superseded', 'created']
+        assert str(Review.objects.get().rating) == '4.7'
+    
+    def test_requires_authentication(self, api_client):
+        response = api_client.post('/api/rankings/bulk/', [], format='json')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_rejects_oversized_payload(self, authenticated_client, test_brand, settings):
+        settings.BULK_MAX_ROWS = 1
+        rows = [{'brand': test_brand.id, 'keyword': k, 'position': 1, 'date': '2026-01-02'} for k in 'ab']
+        response = authenticated_client.post('/api/rankings/bulk/', rows, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestPlaceholderUpserts:
+    """Placeholder rows never overwrite real data."""
+    
+    def test_placeholder_reviews_keep_existing(self, test_brand):
+        from brands.auto_fetch import auto_fetch_reviews
+        Review.objects.create(brand=test_brand, platform='g2', rating='4.6', review_count=80, date=date.today())
+        auto_fetch_reviews(test_brand)
+        
+        assert Review.objects.count() == 3
+        assert str(Review.objects.get(platform='g2').rating) == '4.6'
+    
+    def test_ranking_refresh_keeps_search_url(self, test_brand):
+        from integrations.views import ranking_row
+        from socialbooster.bulk import upsert_rows
+        SearchRanking.objects.create(
+            brand=test_brand, keyword='crm', position=9, search_url='https://example.com/serp', date=date.today()
+        )
+        upsert_rows(SearchRanking, [ranking_row(test_brand.id, 'crm', 3)], update_fields=['position'])
+        
+        ranking = SearchRanking.objects.get()
+        assert (ranking.position, ranking.search_url) == (3, 'https://example.com/serp')
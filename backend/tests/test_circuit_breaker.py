@@ -0,0 +1,74 @@
+"""
+Tests for the outbound API circuit breaker.
+"""
+import pytest
+from rest_framework import status
+from integrations.circuit_breaker import CircuitBreaker
+from integrations.models import ProviderState
+from integrations.services import SerpAPIService
+
+
+@pytest.fixture
+def breaker_settings(settings):
+    settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD = 2
+    settings.CIRCUIT_BREAKER_RESET_TIMEOUT = 0.2
+    return settings
+
+
+@pytest.mark.django_db
+class TestCircuitBreaker:
+    """Test open, fail-fast and half-open recovery."""
+    
+    def test_opens_after_consecutive_failures(self, fake_api_server, breaker_settings):
+        """Once open, calls fail fast without reaching the provider."""
+        fake_api_server.error_ratio = 1.0
+        service = SerpAPIService()
+        
+        service.search_google('slack')
+        service.search_google('slack')
+        result = service.search_google('slack')
+        
+        assert 'circuit is open' in result['error']
+        assert fake_api_server.stats['serpapi.search'] == {500: 2}
+        assert CircuitBreaker('serpapi').snapshot()['state'] == CircuitBreaker.OPEN
+    
+    def test_half_open_probe_closes_circuit(self, fake_api_server, breaker_settings):
+        """After the reset timeout a successful probe closes the circuit."""
+        breaker = CircuitBreaker('serpapi')
+        breaker.record_failure('boom')
+        breaker.record_failure('boom')
+        assert breaker.snapshot()['state'] == CircuitBreaker.OPEN
+        
+        row = ProviderState.objects.get(key=breaker.key)
+        row.state['opened_at'] -= 1
+        row.save()
+        
+        result = SerpAPIService().search_google('slack')
+        assert 'results' in result
+        assert breaker.snapshot()['state'] == CircuitBreaker.CLOSED
+    
+    def test_state_is_shared_in_the_database(self, breaker_settings):
+        """Every worker sees the same breaker: its state is one ProviderState row."""
+        CircuitBreaker('serpapi').record_failure('boom')
+        CircuitBreaker('serpapi').record_failure('boom')
+        
+        assert CircuitBreaker('serpapi').snapshot()['state'] == CircuitBreaker.OPEN
+        assert ProviderState.objects.get(key='circuit:serpapi').state['failures'] == 2
+    
+    def test_slow_calls_count_as_failures(self, breaker_settings):
+        """Responses slower than the latency threshold trip the breaker."""
+        breaker = CircuitBreaker('gemini')
+        breaker.record_success(elapsed=breaker.latency_threshold + 1)
+        breaker.record_success(elapsed=breaker.latency_threshold + 1)
+        assert breaker.snapshot()['state'] == CircuitBreaker.OPEN
+    
+    def test_health_endpoint(self, api_client, breaker_settings):
+        """Breaker state is exposed per provider."""
+        CircuitBreaker('gemini').record_failure('boom')
+        CircuitBreaker('gemini').record_failure('boom')
+        
+        response = api_client.get('/api/integrations/health/')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['status'] == 'degraded'
+        assert response.data['providers']['gemini']['state'] == 'open'
+        assert response.data['providers']['serpapi']['state'] == 'closed'
@@ -0,0 +1,106 @@
+"""
+Tests for API response compression.
+"""
+import gzip
+import json
+import zlib
+import pytest
+from datetime import date
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory
+from citations.models import AICitation
+from socialbooster.middleware import compression
+from socialbooster.middleware.compression import CompressionMiddleware, negotiate
+
+
+@pytest.fixture
+def citations(test_brand):
+    cache.clear()
+    AICitation.objects.bulk_create(
+        AICitation(brand=test_brand, ai_model='gemini', query='best crm', mentioned=True,
+                   citation_context='Test Brand is a popular choice. ' * 5, date=date(2026, 1, n))
+        for n in range(1, 21)
+    )
+
+
+class TestNegotiation:
+    """Accept-Encoding q-values pick the encoding."""
+    
+    def test_gzip_only(self, monkeypatch):
+        monkeypatch.setattr(compression, 'brotli', None)
+        assert negotiate('gzip, deflate, br') == 'gzip'
+        assert negotiate('*') == 'gzip'
+        assert negotiate('gzip;q=0, br') is None
+        assert negotiate('identity') is None
+        assert negotiate('') is None
+    
+    def test_prefers_brotli(self, monkeypatch):
+        monkeypatch.setattr(compression, 'brotli', object())
+        assert negotiate('gzip, br') == 'br'
+        assert negotiate('gzip;q=1.0, br;q=0.5') == 'gzip'
+        assert negotiate('br;q=0') is None
+
+
+@pytest.mark.django_db
+class TestCompressionMiddleware:
+    """API JSON responses are compressed above the size threshold."""
+    
+    def test_gzip_json(self, api_client, citations):
+        plain = api_client.get('/api/citations/')
+        response = api_client.get('/api/citations/', HTTP_ACCEPT_ENCODING='gzip')
+        
+        assert plain.get('Content-Encoding') is None
+        assert 'Accept-Encoding' in plain['Vary']
+        assert response['Content-Encoding'] == 'gzip'
+        assert int(response['Content-Length']) == len(response.content) < len(plain.content)
+        assert gzip.decompress(response.content) == plain.content
+    
+    def test_small_and_non_api_responses_untouched(self, api_client, citations, settings):
+        response = api_client.get('/api/citations/', {'brand': 999}, HTTP_ACCEPT_ENCODING='gzip')
+        assert response.data['count'] == 0
+        assert response.get('Content-Encoding') is None
+        
+        settings.COMPRESSION_MIN_BYTES = 10 ** 9
+        response = api_client.get('/api/citations/', HTTP_ACCEPT_ENCODING='gzip')
+        assert response.get('Content-Encoding') is None
+        
+        response = api_client.get('/admin/login/', HTTP_ACCEPT_ENCODING='gzip')
+        assert response.get('Content-Encoding') is None
+    
+    def test_configurable_level(self, api_client, citations, settings):
+        settings.GZIP_LEVEL = 1
+        fast = api_client.get('/api/citations/', HTTP_ACCEPT_ENCODING='gzip').content
+        settings.GZIP_LEVEL = 9
+        small = api_client.get('/api/citations/', HTTP_ACCEPT_ENCODING='gzip').content
+        
+        assert len(small) <= len(fast)
+        assert gzip.decompress(small) == gzip.decompress(fast)
+    
+    def test_streaming_is_flushed_per_chunk(self):
+        lines = [json.dumps({'row': n}).encode() + b'\n' for n in range(3)]
+        middleware = CompressionMiddleware(
+            lambda request: StreamingHttpResponse(iter(lines), content_type='application/x-ndjson')
+        )
+        request = RequestFactory().get('/api/brands/import/', HTTP_ACCEPT_ENCODING='gzip')
+        
+        response = middleware(request)
+        
+        assert response['Content-Encoding'] == 'gzip'
+        assert not response.has_header('Content-Length')
+        decoder = zlib.decompressobj(31)
+        chunks = iter(response.streaming_content)
+        # Each line can be decoded as soon as its chunk arrives
+        for line in lines:
+            assert decoder.decompress(next(chunks)) == line
+        assert decoder.decompress(b''.join(chunks)) == b''
+        assert decoder.eof
+    
+    def test_benchmark_command(self, citations):
+        out = StringIO()
+        call_command('benchmark_compression', repeat=1, stdout=out)
+        output = out.getvalue()
+        assert '/api/dashboard/export/' in output
+        assert 'gzip' in output
@@ -0,0 +1,100 @@
+"""
+Tests for bounded fan-out of outbound calls and concurrent onboarding stages.
+"""
+import threading
+import time
+from datetime import timedelta
+import pytest
+from django.utils import timezone
+from brands import jobs
+from brands.models import FetchJob
+from integrations.concurrency import provider_slot, run_concurrently
+
+
+class InFlight:
+    """Callable factory that records the most calls running at once."""
+    
+    def __init__(self, duration=0.05):
+        self.duration = duration
+        self.current = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+    
+    def call(self, value):
+        def run():
+            with self.lock:
+                self.current += 1
+                self.peak = max(self.peak, self.current)
+            time.sleep(self.duration)
+            with self.lock:
+                self.current -= 1
+            return value
+        return run
+
+
+class TestRunConcurrently:
+    """Calls run in parallel, results keep their order and provider limits hold."""
+    
+    def test_results_in_order_and_parallel(self):
+        tracker = InFlight()
+        started = time.monotonic()
+        
+        results = run_concurrently([tracker.call(n) for n in range(4)])
+        
+        assert results == [0, 1, 2, 3]
+        assert tracker.peak == 4
+        assert time.monotonic() - started < 4 * tracker.duration
+    
+    def test_provider_limit(self, settings):
+        settings.PROVIDER_CONCURRENCY = {'test-limit': 2}
+        tracker = InFlight()
+        
+        run_concurrently([tracker.call(n) for n in range(6)], provider='test-limit', max_workers=6)
+        
+        assert tracker.peak == 2
+    
+    def test_limit_is_shared_across_callers(self, settings):
+        settings.PROVIDER_CONCURRENCY = {'test-shared': 1}
+        tracker = InFlight()
+        
+        with provider_slot('test-shared'):
+            # The only slot is taken, so nothing can start until it is released
+            thread = threading.Thread(
+                target=run_concurrently, args=([tracker.call(1), tracker.call(2)],), kwargs={'provider': 'test-shared'}
+            )
+            thread.start()
+            time.sleep(tracker.duration)
+            assert tracker.peak == 0
+        thread.join()
+        assert tracker.peak == 1
+    
+    def test_exceptions_propagate(self):
+        def fail():
+            raise RuntimeError('boom')
+        
+        with pytest.raises(RuntimeError):
+            run_concurrently([lambda: 1, fail])
+
+
+@pytest.mark.django_db
+class TestFetchJobStages:
+    """The three onboarding stages of a fetch job run side by side."""
+    
+    def test_stages_run_concurrently(self, monkeypatch, test_brand):
+        tracker = InFlight(duration=0.1)
+        for name in list(jobs.STAGES):
+            monkeypatch.setitem(jobs.STAGES, name, lambda brand, name=name: {name: tracker.call(name)()})
+        job = jobs.enqueue_fetch(test_brand)
+        FetchJob.objects.filter(id=job.id).update(run_after=timezone.now() - timedelta(seconds=1))
+        started = time.monotonic()
+        
+        assert jobs.run_job(job.id) == FetchJob.SUCCEEDED
+        
+        assert tracker.peak == 3
+        assert time.monotonic() - started < 3 * tracker.duration
+        stages = FetchJob.objects.get(id=job.id).stages
+        assert {name: stage['result'] for name, stage in stages.items()} == {
+            'rankings': {'rankings': 'rankings'},
+            'citations': {'citations': 'citations'},
+            'reviews': {'reviews': 'reviews'},
+        }
@@ -0,0 +1,102 @@
+"""
+Tests for the local SerpAPI/Gemini stand-in server.
+"""
+import io
+import pytest
+import requests
+from django.core.cache import cache
+from integrations.services import SerpAPIService
+from integrations.gemini_service import GeminiService
+
+
+@pytest.mark.django_db
+class TestFakeAPIServer:
+    """The integrations work end to end against the fake server."""
+    
+    def test_serpapi_search_replays_fixture(self, fake_api_server):
+        """Ranking checks resolve positions from the recorded results."""
+        result = SerpAPIService().check_brand_position('Slack', 'team chat app')
+        assert result['found'] is True
+        assert result['position'] == 2
+        assert fake_api_server.stats['serpapi.search'] == {200: 1}
+    
+    def test_serpapi_account_usage(self, fake_api_server):
+        """The account endpoint reports the fixture quota."""
+        usage = SerpAPIService().get_api_usage()
+        assert usage['total_searches_left'] == 5000
+    
+    def test_gemini_citation_check(self, fake_api_server):
+        """Gemini answers echo the prompt, so the brand is a direct mention."""
+        result = GeminiService().check_brand_citation('Notion', 'What is Notion?')
+        assert result['success'] is True
+        assert result['direct_mention'] is True
+    
+    def test_injected_errors(self, fake_api_server):
+        """Injected failures surface as service errors."""
+        fake_api_server.error_ratio = 1.0
+        result = SerpAPIService().search_google('anything')
+        assert 'error' in result
+        assert fake_api_server.stats['serpapi.search'] == {500: 1}
+
+
+@pytest.mark.django_db
+class TestGeminiStreaming:
+    """Streaming citation checks stop reading once the brand is found."""
+    
+    def test_stream_stops_after_mention_context(self, fake_api_server):
+        fake_api_server.chunk_delay_ms = 20
+        result = GeminiService().check_brand_citation('Notion', 'What is Notion?', stream=True)
+        
+        assert result['direct_mention'] is True
+        assert result['stopped_early'] is True
+        assert 'Notion' in result['citation_context']
+        assert result['citation_context'].endswith('...')
+        assert fake_api_server.stats['gemini.streamGenerateContent'] == {200: 1}
+    
+    def test_stream_matches_buffered_result(self, fake_api_server):
+        """Streamed and buffered checks agree on the outcome and context."""
+        streamed = GeminiService().check_brand_citation('Zoom', 'Best video app?', stream=True)
+        buffered = GeminiService().check_brand_citation('Zoom', 'Best video app?', stream=False)
+        
+        assert streamed['direct_mention'] == buffered['direct_mention'] is True
+        assert streamed['citation_context'].rstrip('.') in buffered['citation_context']
+
+
+def _sse_response(status: int, body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.raw = io.BytesIO(body)
+    return response
+
+
+@pytest.mark.django_db
+class TestGeminiStreamFailures:
+    """Broken streams are reported like other failed calls and release their connections."""
+    
+    @pytest.fixture(autouse=True)
+    def gemini_settings(self, settings):
+        settings.GEMINI_API_KEY = 'test-key'
+        settings.GEMINI_RATE_LIMIT_PER_MINUTE = 6000
+        settings.LLM_CACHE_ENABLED = False
+        cache.clear()
+    
+    def test_malformed_chunk_is_an_api_error(self, monkeypatch):
+        body = b'data: {"candidates": [{"content": {"parts": [{"text": "Hello"}]}}]}\n\ndata: {broken\n\n'
+        monkeypatch.setattr(requests, 'post', lambda *args, **kwargs: _sse_response(200, body))
+        
+        result = GeminiService().check_brand_citation('Notion', 'What is Notion?', stream=True)
+        
+        assert result['success'] is False
+        assert 'API error' in result['citation_context']
+    
+    def test_rate_limited_stream_is_closed_before_retrying(self, monkeypatch):
+        limited = _sse_response(429, b'{"error": {"code": 429}}')
+        limited.headers['Retry-After'] = '0'
+        answer = _sse_response(200, b'data: {"candidates": [{"content": {"parts": [{"text": "Notion is"}]}}]}\n\n')
+        responses = iter([limited, answer])
+        monkeypatch.setattr(requests, 'post', lambda *args, **kwargs: next(responses))
+        
+        result = GeminiService().check_brand_citation('Notion', 'What is Notion?', stream=True)
+        
+        assert result['direct_mention'] is True
+        assert limited.raw.closed
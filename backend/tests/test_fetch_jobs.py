@@ -0,0 +1,132 @@
+"""
+Tests for the persisted brand onboarding auto-fetch jobs.
+"""
+import pytest
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.utils import timezone
+from brands import jobs
+from brands.models import FetchJob
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    """Replace the real fetch stages with stubs; set failures[name] = exception to fail one."""
+    calls = {name: [] for name in jobs.STAGES}
+    failures = {}
+    
+    def stub(name):
+        def fetch(brand):
+            calls[name].append(brand.id)
+            if name in failures:
+                raise failures[name]
+            return {f'{name}_fetched': 1, 'results': [{'detail': 'dropped'}]}
+        return fetch
+    
+    for name in list(jobs.STAGES):
+        monkeypatch.setitem(jobs.STAGES, name, stub(name))
+    return calls, failures
+
+
+def make_due(job):
+    FetchJob.objects.filter(id=job.id).update(run_after=timezone.now() - timedelta(seconds=1))
+
+
+@pytest.mark.django_db
+class TestFetchJobs:
+    """Jobs record per-stage progress, retry failed stages and give up eventually."""
+    
+    def test_create_brand_queues_job(self, authenticated_client):
+        response = authenticated_client.post('/api/brands/', {'name': 'Queued'}, format='json')
+        
+        job = FetchJob.objects.get(brand_id=response.data['id'])
+        assert response.data['fetch_job_id'] == job.id
+        assert job.status == FetchJob.PENDING
+        assert set(job.stages) == {'rankings', 'citations', 'reviews'}
+    
+    def test_successful_run(self, stages, test_brand):
+        job = jobs.enqueue_fetch(test_brand)
+        
+        assert jobs.run_job(job.id) == FetchJob.SUCCEEDED
+        
+        job.refresh_from_db()
+        assert job.attempts == 1
+        assert job.stages['citations']['status'] == FetchJob.SUCCEEDED
+        assert job.stages['citations']['result'] == {'citations_fetched': 1}
+        assert job.finished_at is not None
+        # A finished job can't be claimed again
+        assert jobs.run_job(job.id) is None
+    
+    def test_failed_stage_is_retried_alone(self, stages, test_brand, settings):
+        calls, failures = stages
+        settings.FETCH_RETRY_BASE_SECONDS = 60
+        failures['citations'] = RuntimeError('Gemini down')
+        job = jobs.enqueue_fetch(test_brand)
+        
+        assert jobs.run_job(job.id) == FetchJob.PENDING
+        job.refresh_from_db()
+        assert job.run_after > timezone.now() + timedelta(seconds=50)
+        assert job.stages['citations'] == {**job.stages['citations'], 'status': 'failed', 'error': 'Gemini down'}
+        assert 'citations: Gemini down' in job.last_error
+        # Not due yet
+        assert jobs.run_job(job.id) is None
+        
+        del failures['citations']
+        make_due(job)
+        assert jobs.run_job(job.id) == FetchJob.SUCCEEDED
+        assert len(calls['rankings']) == 1
+        assert len(calls['citations']) == 2
+    
+    def test_gives_up_after_max_attempts(self, stages, test_brand, settings):
+        _, failures = stages
+        settings.FETCH_JOB_MAX_ATTEMPTS = 2
+        failures['reviews'] = RuntimeError('boom')
+        job = jobs.enqueue_fetch(test_brand)
+        
+        assert jobs.run_job(job.id) == FetchJob.PENDING
+        make_due(job)
+        assert jobs.run_job(job.id) == FetchJob.FAILED
+    
+    def test_stale_running_job_is_recovered(self, test_brand, settings):
+        settings.FETCH_JOB_STALE_SECONDS = 60
+        job = jobs.enqueue_fetch(test_brand)
+        FetchJob.objects.filter(id=job.id).update(
+            status=FetchJob.RUNNING, heartbeat_at=timezone.now() - timedelta(minutes=5)
+        )
+        
+        assert jobs.recover_stale_jobs() == 1
+        assert jobs.due_jobs() == [job.id]
+    
+    def test_run_fetch_jobs_command(self, stages, test_brand):
+        jobs.enqueue_fetch(test_brand)
+        out = StringIO()
+        
+        call_command('run_fetch_jobs', workers=1, stdout=out)
+        
+        assert '1 succeeded' in out.getvalue()
+        assert FetchJob.objects.get().status == FetchJob.SUCCEEDED
+
+
+@pytest.mark.django_db
+class TestFetchStatusEndpoint:
+    """GET /api/brands/<id>/fetch-status/ reports the latest job stage by stage."""
+    
+    def test_fetch_status(self, api_client, stages, test_brand):
+        _, failures = stages
+        failures['reviews'] = RuntimeError('boom')
+        job = jobs.enqueue_fetch(test_brand)
+        jobs.run_job(job.id)
+        
+        response = api_client.get(f'/api/brands/{test_brand.id}/fetch-status/')
+        
+        assert response.status_code == 200
+        assert response.data['job_id'] == job.id
+        assert response.data['status'] == FetchJob.PENDING
+        assert response.data['progress'] == '2/3'
+        assert response.data['stages']['reviews']['status'] == FetchJob.FAILED
+        assert response.data['next_attempt_at'] is not None
+    
+    def test_no_job(self, api_client, test_brand):
+        response = api_client.get(f'/api/brands/{test_brand.id}/fetch-status/')
+        assert response.status_code == 404
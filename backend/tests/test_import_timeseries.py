@@ -0,0 +1,128 @@
+"""
+Tests for the import_timeseries command and the merge_rows helper behind it.
+"""
+import json
+import pytest
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+from brands.models import Brand
+from rankings.models import SearchRanking
+from reviews.models import Review
+from socialbooster.bulk import merge_rows
+
+
+def run_import(path, **options):
+    out = StringIO()
+    call_command('import_timeseries', str(path), stdout=out, **options)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+class TestImportTimeseries:
+    """Files are streamed in, brand names resolved, and rows upserted."""
+    
+    def test_csv_rankings(self, tmp_path, test_brand):
+        path = tmp_path / 'rankings.csv'
+        path.write_text(
+            'brand,keyword,position,date\n'
+            f'{test_brand.name.upper()},crm software,4,2026-01-01\n'
+            f'{test_brand.name},crm software,3,2026-01-02\n'
+        )
+        
+        output = run_import(path, kind='rankings', batch_size=1)
+        
+        assert list(SearchRanking.objects.order_by('date').values_list('position', flat=True)) == [4, 3]
+        assert 'rows/s' in output
+        assert '1 rows written' in output
+    
+    def test_ndjson_reviews(self, tmp_path, test_brand):
+        path = tmp_path / 'reviews.ndjson'
+        path.write_text('\n'.join(json.dumps(row) for row in [
+            {'brand': test_brand.name, 'platform': 'g2', 'rating': 4.55, 'review_count': 120, 'date': '2026-01-01'},
+            {'brand': test_brand.name, 'platform': 'g2', 'rating': '4.7', 'date': '2026-01-02T08:00:00'},
+        ]) + '\n')
+        
+        run_import(path, kind='reviews')
+        
+        reviews = list(Review.objects.order_by('date'))
+        assert [r.rating for r in reviews] == [Decimal('4.6'), Decimal('4.7')]
+        assert reviews[1].review_count == 0
+        assert reviews[1].date == date(2026, 1, 2)
+    
+    def test_rerun_updates_existing_rows(self, tmp_path, test_brand):
+        path = tmp_path / 'rankings.csv'
+        path.write_text(f'brand,keyword,position,date\n{test_brand.name},crm,10,2026-01-01\n')
+        run_import(path, kind='rankings')
+        path.write_text(f'brand,keyword,position,date\n{test_brand.name},crm,2,2026-01-01\n')
+        
+        run_import(path, kind='rankings', keep_existing=True)
+        assert SearchRanking.objects.get().position == 10
+        
+        run_import(path, kind='rankings')
+        assert SearchRanking.objects.get().position == 2
+    
+    def test_bad_rows_and_unknown_brands_are_skipped(self, tmp_path, test_brand):
+        path = tmp_path / 'rankings.csv'
+        path.write_text(
+            'brand,keyword,position,date\n'
+            f'{test_brand.name},crm,7,2026-01-01\n'
+            f'{test_brand.name},crm,500,2026-01-02\n'
+            f'{test_brand.name},,1,2026-01-03\n'
+            'Nobody Inc,crm,1,2026-01-01\n'
+        )
+        
+        output = run_import(path, kind='rankings')
+        
+        assert SearchRanking.objects.count() == 1
+        assert 'line 3: position must be between 1 and 100' in output
+        assert 'line 4: missing keyword' in output
+        assert 'Nobody Inc' in output
+        assert '3 skipped' in output
+    
+    def test_non_finite_ratings_are_skipped(self, tmp_path, test_brand):
+        path = tmp_path / 'reviews.csv'
+        path.write_text(
+            'brand,platform,rating,date\n'
+            f'{test_brand.name},g2,NaN,2026-01-01\n'
+            f'{test_brand.name},g2,Infinity,2026-01-02\n'
+            f'{test_brand.name},g2,4.5,2026-01-03\n'
+        )
+        
+        output = run_import(path, kind='reviews')
+        
+        assert Review.objects.get().rating == Decimal('4.5')
+        assert 'line 2: invalid rating "NaN"' in output
+        assert '2 skipped' in output
+    
+    def test_create_brands(self, tmp_path):
+        path = tmp_path / 'rankings.csv'
+        path.write_text('brand,keyword,position,date\nNew Co,crm,1,2026-01-01\nnew co,crm,2,2026-01-02\n')
+        
+        run_import(path, kind='rankings', create_brands=True)
+        
+        assert Brand.objects.get().name == 'New Co'
+        assert SearchRanking.objects.count() == 2
+    
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(CommandError):
+            run_import(tmp_path / 'missing.csv', kind='rankings')
+
+
+@pytest.mark.django_db
+class TestMergeRows:
+    """Duplicate keys within a load collapse to the last row."""
+    
+    def test_last_duplicate_wins(self, test_brand):
+        now = timezone.now()
+        rows = [(test_brand.id, 'crm', position, '', date(2026, 1, 1), now) for position in (5, 6, 7)]
+        
+        processed = merge_rows(
+            SearchRanking, ['brand_id', 'keyword', 'position', 'search_url', 'date', 'created_at'], rows, batch_size=2
+        )
+        
+        assert processed == 3
+        assert SearchRanking.objects.get().position == 7
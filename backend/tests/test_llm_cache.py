@@ -0,0 +1,94 @@
+"""
+Tests for the persistent LLM response cache.
+"""
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from integrations.gemini_service import GeminiService
+from integrations.llm_cache import LLMResponseCache, cache_key, llm_cache_stats
+from integrations.models import LLMResponse
+
+CONFIG = {'temperature': 0.7, 'maxOutputTokens': 1024}
+
+
+@pytest.fixture
+def cached_gemini(fake_api_server, settings):
+    settings.LLM_CACHE_ENABLED = True
+    return fake_api_server
+
+
+@pytest.mark.django_db
+class TestLLMResponseCache:
+    """Answers are addressed by (model, prompt, config) and bounded in size."""
+    
+    def test_key_depends_on_config(self):
+        assert cache_key('m', 'What is Slack?', CONFIG) == cache_key('m', 'What is Slack?', dict(CONFIG))
+        assert cache_key('m', 'What is Slack?', CONFIG) != cache_key('m', 'What is Slack?', {'temperature': 0.1})
+        assert cache_key('m', 'What is Slack?', CONFIG) != cache_key('other', 'What is Slack?', CONFIG)
+    
+    def test_expired_entries_miss(self):
+        cache = LLMResponseCache('m')
+        cache.set('What is Slack?', CONFIG, 'Slack is a messaging app.')
+        assert cache.get('What is Slack?', CONFIG).response_text == 'Slack is a messaging app.'
+        
+        LLMResponse.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        assert cache.get('What is Slack?', CONFIG) is None
+    
+    def test_least_recently_used_evicted(self, settings):
+        settings.LLM_CACHE_MAX_ENTRIES = 2
+        settings.LLM_CACHE_EVICT_EVERY = 1
+        cache = LLMResponseCache('m')
+        cache.set('first', CONFIG, 'one')
+        cache.set('second', CONFIG, 'two')
+        LLMResponse.objects.filter(prompt='first').update(last_used_at=timezone.now() + timedelta(minutes=1))
+        cache.set('third', CONFIG, 'three')
+        
+        assert set(LLMResponse.objects.values_list('prompt', flat=True)) == {'first', 'third'}
+    
+    def test_eviction_is_not_run_on_every_write(self, settings, monkeypatch):
+        settings.LLM_CACHE_MAX_ENTRIES = 1
+        settings.LLM_CACHE_EVICT_EVERY = 100
+        draws = iter([5, 7, 0])
+        monkeypatch.setattr('integrations.llm_cache.random.randrange', lambda n: next(draws))
+        cache = LLMResponseCache('m')
+        
+        cache.set('first', CONFIG, 'one')
+        cache.set('second', CONFIG, 'two')
+        assert LLMResponse.objects.count() == 2
+        cache.set('third', CONFIG, 'three')
+        assert list(LLMResponse.objects.values_list('prompt', flat=True)) == ['third']
+    
+    def test_partial_answer_only_serves_matching_brand(self):
+        cache = LLMResponseCache('m')
+        cache.set('Best team chat?', CONFIG, 'Slack is the most popular...', complete=False)
+        
+        assert cache.get('Best team chat?', CONFIG, contains='slack') is not None
+        assert cache.get('Best team chat?', CONFIG, contains='Zoom') is None
+        # Callers that need the whole answer (group checks) never get a partial one
+        assert cache.get('Best team chat?', CONFIG) is None
+
+
+@pytest.mark.django_db
+class TestCachedCitationChecks:
+    """Repeated prompts don't reach Gemini until the cache is bypassed."""
+    
+    def test_repeat_check_is_served_from_cache(self, cached_gemini):
+        service = GeminiService()
+        first = service.check_brand_citation('Slack', 'Best team chat app?', stream=False)
+        second = service.check_brand_citation('Slack', 'Best team chat app?', stream=False)
+        
+        assert first['cached'] is False
+        assert second['cached'] is True
+        assert second['citation_context'] == first['citation_context']
+        assert cached_gemini.stats['gemini.generateContent'] == {200: 1}
+        
+        stats = llm_cache_stats()
+        assert stats['hits'] == 1
+        assert stats['entries'] == 1
+    
+    def test_fresh_bypasses_cache(self, cached_gemini):
+        GeminiService().check_brand_citation('Slack', 'Best team chat app?', stream=False)
+        result = GeminiService(fresh=True).check_brand_citation('Slack', 'Best team chat app?', stream=False)
+        
+        assert result['cached'] is False
+        assert cached_gemini.stats['gemini.generateContent'] == {200: 2}
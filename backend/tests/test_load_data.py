@@ -0,0 +1,68 @@
+"""
+Tests for the synthetic load data generator.
+"""
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from brands.models import Brand
+from citations.models import AICitation
+from rankings.models import SearchRanking
+from reviews.models import Review
+
+
+def generate(**options):
+    call_command('generate_load_data', stdout=StringIO(), **options)
+
+
+@pytest.mark.django_db
+class TestGenerateLoadData:
+    """Row counts follow the parameters and the seed fixes the values."""
+    
+    def test_row_counts(self):
+        generate(brands=5, days=3, keywords_per_brand=2, models='gemini,claude', batch_size=7)
+        
+        assert Brand.objects.count() == 5
+        assert SearchRanking.objects.count() == 5 * 2 * 3
+        assert AICitation.objects.count() == 5 * 2 * 3
+        assert set(AICitation.objects.values_list('ai_model', flat=True)) == {'gemini', 'claude'}
+        assert Review.objects.count() == 5 * 4 * 3
+        assert not SearchRanking.objects.filter(position__lt=1).exists()
+    
+    def test_seed_is_reproducible(self):
+        def snapshot():
+            return (
+                list(SearchRanking.objects.order_by('brand__name', 'keyword', 'date').values_list('position', flat=True)),
+                list(AICitation.objects.order_by('brand__name', 'ai_model', 'date').values_list('mentioned', flat=True)),
+            )
+        
+        generate(brands=3, days=4, seed=7)
+        first = snapshot()
+        generate(brands=3, days=4, seed=7, clear=True)
+        
+        assert Brand.objects.count() == 3
+        assert snapshot() == first
+    
+    def test_rerun_without_clear_refused(self):
+        generate(brands=2, days=2, seed=7)
+        with pytest.raises(CommandError, match='--clear'):
+            generate(brands=2, days=2, seed=7)
+        
+        # Another seed adds its own brands next to the first ones
+        generate(brands=2, days=2, seed=8)
+        assert Brand.objects.count() == 4
+        assert SearchRanking.objects.count() == 4 * 5 * 2
+    
+    def test_clear_purges_generated_brands_only(self, test_brand, settings):
+        settings.BRAND_PURGE_CHUNK_SIZE = 4
+        generate(brands=3, days=2)
+        generate(brands=2, days=2, clear=True)
+        
+        assert Brand.objects.count() == 3
+        assert Brand.objects.filter(id=test_brand.id).exists()
+        assert SearchRanking.objects.count() == 2 * 5 * 2
+        assert Review.objects.count() == 2 * 4 * 2
+    
+    def test_unknown_model_rejected(self):
+        with pytest.raises(CommandError):
+            generate(brands=1, models='gemini,bard')
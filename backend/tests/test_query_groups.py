@@ -0,0 +1,69 @@
+"""
+Tests for query-centric citation checks.
+"""
+import pytest
+from django.core.cache import cache
+from brands.models import Brand
+from citations.models import AICitation
+from citations.services import CATEGORY_PROMPTS, group_brands, refresh_category_citations
+from integrations.brand_matcher import BrandMatcher, MultiBrandMatcher
+from integrations.gemini_service import GeminiService
+
+
+@pytest.fixture
+def software_brands(db):
+    cache.clear()
+    return [
+        Brand.objects.create(name=name, category='software', website=website)
+        for name, website in [
+            ('Slack', 'https://slack.com'),
+            ('Notion', 'https://notion.so'),
+            ('Asana', 'https://asana.com'),
+        ]
+    ]
+
+
+class TestMultiBrandMatcher:
+    """One pass over the answer finds every brand in the group."""
+    
+    def test_scan_finds_each_brand(self):
+        matchers = {
+            'hubspot': BrandMatcher('HubSpot', aliases=['HubSpot CRM'], website='https://hubspot.com'),
+            'mailchimp': BrandMatcher('Mailchimp'),
+            'zoom': BrandMatcher('Zoom'),
+        }
+        text = 'Teams pair HubSpot CRM with Mail Chimp for campaigns.'
+        found = MultiBrandMatcher(matchers).scan(text)
+        
+        assert set(found) == {'hubspot', 'mailchimp'}
+        assert found['hubspot']['stage'] == 'alias'
+        assert found['mailchimp']['stage'] == 'token'
+        start, end = found['hubspot']['span']
+        assert text[start:end] == 'HubSpot CRM'
+
+
+@pytest.mark.django_db
+class TestCategoryCitations:
+    """Shared prompts are asked once and attributed to every brand in the category."""
+    
+    def test_brands_grouped_by_prompt(self, software_brands):
+        groups = group_brands(software_brands)
+        assert set(groups) == set(CATEGORY_PROMPTS['software'])
+        assert all(len(group) == 3 for group in groups.values())
+    
+    def test_one_call_per_prompt(self, fake_api_server, software_brands):
+        summary = refresh_category_citations(software_brands, GeminiService())
+        
+        prompts = len(CATEGORY_PROMPTS['software'])
+        assert fake_api_server.stats['gemini.generateContent'] == {200: prompts}
+        assert summary['prompts_asked'] == prompts
+        assert summary['citations_created'] == prompts * 3
+        
+        # The stand-in answer names Slack and Notion but not Asana
+        mentioned = set(AICitation.objects.filter(mentioned=True).values_list('brand__name', flat=True))
+        assert mentioned == {'Slack', 'Notion'}
+    
+    def test_rerun_replaces_todays_rows(self, fake_api_server, software_brands):
+        refresh_category_citations(software_brands, GeminiService())
+        refresh_category_citations(software_brands, GeminiService())
+        assert AICitation.objects.count() == len(CATEGORY_PROMPTS['software']) * 3
@@ -0,0 +1,54 @@
+"""
+Tests for outbound Gemini rate limiting.
+"""
+import time
+import pytest
+from integrations.gemini_service import GeminiService
+from integrations.rate_limit import RateLimitExceeded, TokenBucket
+
+
+@pytest.mark.django_db
+class TestTokenBucket:
+    """Test token-bucket pacing."""
+    
+    def test_burst_then_paced(self):
+        """Calls within the burst capacity don't wait; the next one is paced."""
+        bucket = TokenBucket('test', rate_per_minute=60, capacity=2)
+        assert bucket.reserve(max_wait=5) == 0
+        assert bucket.reserve(max_wait=5) == 0
+        assert bucket.reserve(max_wait=5) == pytest.approx(1.0, abs=0.05)
+    
+    def test_deadline_exceeded_reserves_nothing(self):
+        """A wait beyond the deadline fails fast without consuming a slot."""
+        bucket = TokenBucket('test', rate_per_minute=60, capacity=1)
+        bucket.reserve(max_wait=0)
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            bucket.reserve(max_wait=0.5)
+        assert exc_info.value.retry_after == pytest.approx(1.0, abs=0.05)
+        assert bucket.reserve(max_wait=5) == pytest.approx(1.0, abs=0.05)
+    
+    def test_block_honors_retry_after(self):
+        """A provider 429 blocks every caller until Retry-After has passed."""
+        bucket = TokenBucket('test', rate_per_minute=6000, capacity=10)
+        bucket.block(30)
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            bucket.reserve(max_wait=5)
+        assert exc_info.value.retry_after == pytest.approx(30, abs=0.5)
+
+
+@pytest.mark.django_db
+class TestGeminiRateLimiting:
+    """GeminiService returns a retriable error instead of sleeping out 429s."""
+    
+    def test_429_returns_fast_with_retriable_error(self, fake_api_server):
+        fake_api_server.rate_limit_ratio = 1.0
+        fake_api_server.retry_after = 60
+        
+        started = time.monotonic()
+        result = GeminiService(max_wait=2).check_brand_citation('Slack', 'What is Slack?', stream=False)
+        
+        assert time.monotonic() - started < 2
+        assert result['success'] is False
+        assert result['retriable'] is True
+        assert result['retry_after'] == pytest.approx(60, abs=1)
+        assert fake_api_server.stats['gemini.generateContent'] == {429: 1}
@@ -0,0 +1,64 @@
+"""
+Tests for the parallel, checkpointed refresh_citations command.
+"""
+import pytest
+from datetime import date
+from io import StringIO
+from django.core.management import call_command
+from brands.models import Brand
+from citations.models import AICitation, CitationCheckpoint
+from integrations.gemini_service import GeminiService
+
+
+@pytest.fixture
+def brands(db):
+    return [
+        Brand.objects.create(name=name, category='software')
+        for name in ['Slack', 'Notion', 'Figma']
+    ]
+
+
+def refresh(**options):
+    out = StringIO()
+    call_command('refresh_citations', workers=3, stdout=out, **options)
+    return out.getvalue()
+
+
+# Worker threads update the shared Gemini rate limit and circuit breaker rows
+@pytest.mark.django_db(transaction=True)
+class TestRefreshCitations:
+    """Results are bulk written and checkpointed so reruns resume."""
+    
+    def test_refresh_writes_and_checkpoints(self, fake_api_server, brands):
+        refresh()
+        
+        assert AICitation.objects.filter(ai_model='gemini', date=date.today()).count() == 6
+        assert CitationCheckpoint.objects.count() == 6
+        assert fake_api_server.stats['gemini.streamGenerateContent'] == {200: 6}
+    
+    def test_rerun_skips_completed_checks(self, fake_api_server, brands):
+        refresh()
+        output = refresh()
+        
+        assert 'Skipping 6 checks already completed today' in output
+        assert fake_api_server.stats['gemini.streamGenerateContent'] == {200: 6}
+        assert AICitation.objects.count() == 6
+    
+    def test_restart_replaces_rows(self, fake_api_server, brands):
+        refresh()
+        refresh(restart=True)
+        
+        assert fake_api_server.stats['gemini.streamGenerateContent'] == {200: 12}
+        assert AICitation.objects.count() == 6
+    
+    def test_failed_checks_keep_previous_rows(self, fake_api_server, brands, monkeypatch):
+        refresh()
+        monkeypatch.setattr(
+            GeminiService, 'check_brand_citation',
+            lambda self, *args, **kwargs: {'error': '500 Server Error', 'mentioned': False, 'success': False}
+        )
+        output = refresh(restart=True)
+        
+        assert '6 checks failed' in output
+        assert AICitation.objects.count() == 6
+        assert CitationCheckpoint.objects.count() == 0
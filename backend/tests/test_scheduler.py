@@ -0,0 +1,158 @@
+"""
+Tests for the SerpAPI credit scheduler.
+"""
+import pytest
+from datetime import datetime, timedelta, timezone as dt_timezone
+from rest_framework import status
+from brands.models import Brand
+from rankings.models import SearchRanking
+from integrations.models import CreditBudget, KeywordCheck
+from integrations.scheduler import SerpAPICreditScheduler
+from integrations.services import SerpAPIService
+
+
+class StubSerpAPIService:
+    """Stand-in for SerpAPIService that records searches instead of calling the API."""
+    
+    def __init__(self, searches_left=300):
+        self.searches_left = searches_left
+        self.queries = []
+    
+    def get_api_usage(self):
+        return {'total_searches_left': self.searches_left, 'searches_per_month': 1000}
+    
+    def search_google(self, query, num_results=10):
+        self.queries.append(query)
+        return {'results': [{'title': 'Test Brand - official site', 'link': 'https://testbrand.com', 'snippet': ''}]}
+    
+    find_brand_position = staticmethod(SerpAPIService.find_brand_position)
+
+
+@pytest.mark.django_db
+class TestSerpAPICreditScheduler:
+    """Test budget pacing, ordering and keyword dedupe."""
+    
+    def test_allowance_is_released_over_the_day(self):
+        """Half way through the day only half of the daily budget is available."""
+        scheduler = SerpAPICreditScheduler(service=StubSerpAPIService())
+        scheduler.reserve = 0
+        noon = datetime(2026, 3, 11, 12, 0, tzinfo=dt_timezone.utc)
+        budget = CreditBudget(
+            provider='serpapi', searches_left=200, spent_today=0,
+            spent_on=noon.date(), period_resets_on=noon.date() + timedelta(days=20)
+        )
+        assert scheduler.allowance(budget, now=noon) == 5
+        
+        budget.spent_today = 5
+        budget.searches_left = 195
+        assert scheduler.allowance(budget, now=noon) == 0
+    
+    def test_no_credits_spent_without_account_sync(self, test_brand):
+        """If the quota can't be read, nothing is spent."""
+        service = StubSerpAPIService()
+        service.get_api_usage = lambda: {'error': 'SerpAPI key not configured'}
+        scheduler = SerpAPICreditScheduler(service=service)
+        scheduler.track(test_brand, ['test keyword'])
+        
+        result = scheduler.run()
+        assert result['credits_spent'] == 0
+        assert service.queries == []
+    
+    def test_identical_keywords_share_one_search(self, test_brand):
+        """Two brands tracking the same keyword cost a single credit."""
+        other = Brand.objects.create(name='Other Brand', category='software')
+        service = StubSerpAPIService()
+        scheduler = SerpAPICreditScheduler(service=service)
+        scheduler.track(test_brand, ['Best Software'])
+        scheduler.track(other, ['best  software'])
+        
+        result = scheduler.run(limit=5)
+        assert len(service.queries) == 1
+        assert result['credits_spent'] == 1
+        assert SearchRanking.objects.get(brand=test_brand).position == 1
+        assert SearchRanking.objects.get(brand=other).position == 100
+        assert KeywordCheck.objects.filter(last_checked_at__isnull=True).count() == 0
+    
+    def test_stalest_checks_run_first(self, test_brand):
+        """Checks are ordered by staleness weighted by importance."""
+        scheduler = SerpAPICreditScheduler(service=StubSerpAPIService())
+        scheduler.track(test_brand, ['fresh', 'stale'])
+        now = datetime.now(dt_timezone.utc)
+        KeywordCheck.objects.filter(keyword='fresh').update(last_checked_at=now - timedelta(days=1, hours=1))
+        KeywordCheck.objects.filter(keyword='stale').update(last_checked_at=now - timedelta(days=3))
+        
+        planned = scheduler.plan()
+        assert [group['keyword'] for group in planned] == ['stale', 'fresh']
+    
+    def test_plan_endpoint(self, api_client, test_brand):
+        """The plan is exposed through the integrations API."""
+        response = api_client.get('/api/integrations/scheduler/')
+        assert response.status_code == status.HTTP_200_OK
+        assert 'budget' in response.data
+        assert 'plan' in response.data
+        # Reading the plan neither syncs with SerpAPI nor writes the budget
+        assert not CreditBudget.objects.exists()
+        
+        response = api_client.get('/api/integrations/scheduler/', {'limit': 'abc'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_credits_reserved_before_searching(self, test_brand, monkeypatch):
+        """Planned searches are taken from the budget up front; failed ones are refunded."""
+        # Search on the test's thread so it can read the budget inside the test transaction
+        monkeypatch.setattr('integrations.scheduler.run_concurrently', lambda calls, **kwargs: [call() for call in calls])
+        service = StubSerpAPIService()
+        scheduler = SerpAPICreditScheduler(service=service)
+        scheduler.reserve = 0
+        scheduler.track(test_brand, ['first', 'second'])
+        scheduler.sync_budget()
+        CreditBudget.objects.update(spent_today=0, period_resets_on=None)
+        scheduler.allowance = lambda budget, now=None: 2
+        
+        reserved = []
+        
+        def search_google(query, num_results=10):
+            # A concurrent run would see these credits as already spent
+            reserved.append(CreditBudget.objects.get().spent_today)
+            if query == 'second':
+                return {'error': 'timeout'}
+            return StubSerpAPIService.search_google(service, query, num_results)
+        
+        service.search_google = search_google
+        result = scheduler.run()
+        
+        assert reserved == [2, 2]
+        assert result['credits_spent'] == 1
+        budget = CreditBudget.objects.get()
+        assert (budget.spent_today, budget.searches_left) == (1, 299)
+    
+    def test_checks_claimed_before_searching(self, test_brand, monkeypatch):
+        """A concurrent run can't plan checks being searched; failed ones become due again."""
+        monkeypatch.setattr('integrations.scheduler.run_concurrently', lambda calls, **kwargs: [call() for call in calls])
+        service = StubSerpAPIService()
+        scheduler = SerpAPICreditScheduler(service=service)
+        scheduler.track(test_brand, ['first', 'second'])
+        scheduler.allowance = lambda budget, now=None: 2
+        
+        concurrent_plans = []
+        
+        def search_google(query, num_results=10):
+            concurrent_plans.append(scheduler.plan())
+            if query == 'second':
+                return {'error': 'timeout'}
+            return StubSerpAPIService.search_google(service, query, num_results)
+        
+        service.search_google = search_google
+        scheduler.run()
+        
+        assert concurrent_plans == [[], []]
+        assert KeywordCheck.objects.get(keyword='first').last_checked_at is not None
+        assert KeywordCheck.objects.get(keyword='second').last_checked_at is None
+        assert [group['keyword'] for group in scheduler.plan()] == ['second']
+    
+    def test_deleted_brands_are_not_planned(self, test_brand):
+        """Checks of a brand waiting for its purge spend no credits."""
+        scheduler = SerpAPICreditScheduler(service=StubSerpAPIService())
+        scheduler.track(test_brand, ['crm'])
+        Brand.objects.filter(id=test_brand.id).update(deleted_at=datetime.now(dt_timezone.utc))
+        
+        assert scheduler.plan() == []
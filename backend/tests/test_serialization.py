@@ -0,0 +1,136 @@
+"""
+Tests for the fast list serialization path.
+"""
+import pytest
+from datetime import date
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+from brands.models import Brand
+from citations.models import AICitation
+from rankings.models import SearchRanking
+from reviews.models import Review
+from socialbooster.serialization import fast_plan
+
+
+@pytest.fixture(autouse=True)
+def reset_throttles():
+    # These tests make more requests than the burst throttle allows per second
+    cache.clear()
+
+
+@pytest.fixture
+def rows(test_brand):
+    other = Brand.objects.create(name='Ünïcode ☃ Brand')
+    SearchRanking.objects.create(brand=test_brand, keyword='crm', position=3, date=date(2026, 1, 2))
+    SearchRanking.objects.create(brand=other, keyword='naïve “quotes”', position=70, date=date(2026, 1, 1))
+    AICitation.objects.create(
+        brand=other, ai_model='google_ai', query='What is ☃?', mentioned=True,
+        citation_context='line\u2028separator', date=date(2026, 1, 1)
+    )
+    AICitation.objects.create(brand=test_brand, ai_model='claude', query='q', date=date(2026, 1, 1))
+    Review.objects.create(brand=test_brand, platform='g2', rating='4.5', review_count=12, date=date(2026, 1, 1))
+    Review.objects.create(brand=other, platform='glassdoor', rating=3, review_count=0, date=date(2026, 1, 1))
+
+
+@pytest.mark.django_db
+class TestFastListSerialization:
+    """The fast path returns exactly the bytes the serializers would."""
+    
+    @pytest.mark.parametrize('url', ['/api/rankings/', '/api/citations/', '/api/reviews/'])
+    def test_byte_identical(self, api_client, rows, url):
+        fast = api_client.get(url)
+        regular = api_client.get(url, {'fast': 'false'})
+        
+        assert fast.status_code == regular.status_code == 200
+        assert fast['Content-Type'] == regular['Content-Type']
+        assert fast.content == regular.content
+        assert fast.data['count'] == 2
+    
+    def test_filters_and_pages_apply(self, api_client, rows, test_brand):
+        response = api_client.get('/api/citations/', {'brand': test_brand.id})
+        assert [row['ai_model_display'] for row in response.data['results']] == ['Claude']
+    
+    def test_browsable_api_uses_regular_path(self, api_client, rows):
+        response = api_client.get('/api/rankings/', HTTP_ACCEPT='text/html')
+        assert response.status_code == 200
+        assert b'<html' in response.content
+    
+    def test_unsupported_serializer_has_no_plan(self):
+        class WithMethodField(serializers.ModelSerializer):
+            extra = serializers.SerializerMethodField()
+            
+            class Meta:
+                model = Review
+                fields = ['id', 'extra']
+        
+        assert fast_plan(WithMethodField) is None
+    
+    def test_benchmark_command(self, rows):
+        out = StringIO()
+        call_command('benchmark_serialization', rows=10, repeat=1, stdout=out)
+        assert 'byte-identical' in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    """?fields= and ?exclude= trim the response and the query behind it."""
+    
+    @pytest.mark.parametrize('fast', ['true', 'false'])
+    def test_fields_and_exclude(self, api_client, rows, fast):
+        response = api_client.get('/api/reviews/', {'fields': 'rating,date,platform_display', 'fast': fast})
+        assert list(response.data['results'][0]) == ['platform_display', 'rating', 'date']
+        
+        response = api_client.get('/api/citations/', {'exclude': 'query,citation_context', 'fast': fast})
+        assert 'query' not in response.data['results'][0]
+        assert 'brand_name' in response.data['results'][0]
+    
+    def test_brand_join_skipped(self, api_client, rows):
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get('/api/citations/', {'fields': 'date,ai_model,mentioned'})
+        select = queries.captured_queries[-1]['sql']
+        assert 'JOIN' not in select
+        assert 'citation_context' not in select
+        
+        with CaptureQueriesContext(connection) as queries:
+            api_client.get('/api/citations/', {'fields': 'date,brand_name', 'fast': 'false'})
+        assert 'JOIN' in queries.captured_queries[-1]['sql']
+    
+    def test_chart_payload_shrinks(self, api_client, test_brand):
+        AICitation.objects.bulk_create(
+            AICitation(
+                brand=test_brand, ai_model='gemini', query='best crm for small teams ' * 4,
+                mentioned=True, citation_context='Lorem ipsum dolor sit amet. ' * 20, date=date(2026, 1, n)
+            )
+            for n in range(1, 21)
+        )
+        
+        full = api_client.get('/api/citations/')
+        chart = api_client.get('/api/citations/', {'fields': 'date,mentioned'})
+        
+        assert len(chart.content) * 10 < len(full.content)
+    
+    def test_detail_and_brands(self, api_client, test_brand):
+        response = api_client.get(f'/api/brands/{test_brand.id}/', {'fields': 'id,name'})
+        assert response.data == {'id': test_brand.id, 'name': test_brand.name}
+        
+        response = api_client.get('/api/brands/', {'exclude': 'aliases,created_at,updated_at'})
+        assert set(response.data['results'][0]) == {'id', 'name', 'category', 'website'}
+    
+    def test_unknown_or_empty_selection(self, api_client, rows):
+        assert api_client.get('/api/rankings/', {'fields': 'id,nope'}).status_code == 400
+        assert api_client.get('/api/rankings/', {'exclude': 'nope'}).status_code == 400
+        response = api_client.get('/api/reviews/', {'fields': 'id', 'exclude': 'id'})
+        assert response.status_code == 400
+    
+    def test_writes_ignore_fields(self, authenticated_client, test_brand):
+        response = authenticated_client.post(
+            '/api/rankings/?fields=id',
+            {'brand': test_brand.id, 'keyword': 'crm', 'position': 4, 'date': '2026-02-01'},
+            format='json'
+        )
+        assert response.status_code == 201
+        assert response.data['keyword'] == 'crm'
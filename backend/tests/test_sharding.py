@@ -0,0 +1,98 @@
+"""
+Tests for sharded refresh runs.
+"""
+import argparse
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from brands.models import Brand
+from citations.models import AICitation
+from citations.services import group_brands
+from integrations.models import KeywordCheck, ShardProgress
+from integrations.scheduler import normalize_keyword
+from rankings.models import SearchRanking
+from integrations.sharding import parse_shard, shard_brands, shard_of, shard_summary
+
+
+class TestSharding:
+    """Brands map to shards stably and completely."""
+    
+    def test_parse_shard(self):
+        assert parse_shard('2/4') == (2, 4)
+        for value in ['0/4', '5/4', 'two/4', '2']:
+            with pytest.raises(argparse.ArgumentTypeError):
+                parse_shard(value)
+    
+    def test_every_brand_in_exactly_one_shard(self):
+        ids = range(1, 500)
+        shards = [shard_of(pk, 4) for pk in ids]
+        assert set(shards) == {1, 2, 3, 4}
+        assert shards == [shard_of(pk, 4) for pk in ids]
+    
+    @pytest.mark.django_db
+    def test_shard_brands_partition_queryset(self):
+        for i in range(20):
+            Brand.objects.create(name=f'Brand {i}')
+        parts = [set(shard_brands(Brand.objects.all(), (i, 3)).values_list('id', flat=True)) for i in (1, 2, 3)]
+        
+        assert sum(len(part) for part in parts) == 20
+        assert set().union(*parts) == set(Brand.objects.values_list('id', flat=True))
+
+
+# Worker threads update the shared Gemini rate limit and circuit breaker rows
+@pytest.mark.django_db(transaction=True)
+class TestShardedRefresh:
+    """Each shard checks its own brands and reports progress."""
+    
+    def test_citation_shards_cover_all_brands_once(self, fake_api_server):
+        for i in range(6):
+            Brand.objects.create(name=f'Brand {i}', category='software')
+        
+        for shard in ['1/2', '2/2']:
+            call_command('refresh_citations', shard=parse_shard(shard), workers=2, stdout=StringIO())
+        
+        assert fake_api_server.stats['gemini.streamGenerateContent'] == {200: 12}
+        assert AICitation.objects.count() == 12
+        
+        summary = shard_summary(job='refresh_citations')
+        assert summary[0]['finished'] == 2
+        assert sum(shard['done'] for shard in summary[0]['shards']) == 12
+    
+    def test_category_refresh_reports_progress(self, fake_api_server):
+        brands = [Brand.objects.create(name=f'Brand {i}', category='software') for i in range(4)]
+        
+        call_command('refresh_citations', shard=(1, 1), by_category=True, stdout=StringIO())
+        
+        progress = ShardProgress.objects.get(job='refresh_citations')
+        prompts = len(group_brands(brands))
+        assert (progress.total, progress.done, progress.failed) == (prompts, prompts, 0)
+        assert progress.finished_at is not None
+    
+    def test_ranking_shards_search_shared_keywords_once(self, fake_api_server):
+        """A keyword shared across shards is searched by whichever shard plans it first."""
+        brands = [Brand.objects.create(name=f'Brand {i}', category='software') for i in range(6)]
+        # Track every shard's keywords first, as after the first day of runs
+        for shard in ['1/2', '2/2']:
+            call_command('refresh_rankings', shard=parse_shard(shard), limit=0, stdout=StringIO())
+        
+        for shard in ['1/2', '2/2']:
+            call_command('refresh_rankings', shard=parse_shard(shard), limit=50, stdout=StringIO())
+        
+        keywords = {normalize_keyword(check.keyword) for check in KeywordCheck.objects.all()}
+        assert fake_api_server.stats['serpapi.search'] == {200: len(keywords)}
+        assert SearchRanking.objects.filter(keyword__iexact='best software').count() == len(brands)
+        assert not KeywordCheck.objects.filter(last_checked_at__isnull=True).exists()
+    
+    def test_missing_shards_reported(self, fake_api_server):
+        Brand.objects.create(name='Slack', category='software')
+        call_command('refresh_rankings', shard=(1, 3), stdout=StringIO())
+        
+        out = StringIO()
+        call_command('shard_status', job='refresh_rankings', stdout=out)
+        assert ShardProgress.objects.get().finished_at is not None
+        assert '2/3  missing' in out.getvalue()
+    
+    def test_shard_status_endpoint(self, api_client):
+        response = api_client.get('/api/integrations/shards/')
+        assert response.status_code == 200
+        assert response.data == []
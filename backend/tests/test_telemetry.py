@@ -0,0 +1,91 @@
+"""
+Tests for per-request telemetry and the Server-Timing header.
+"""
+import logging
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from integrations.circuit_breaker import CircuitBreaker
+from integrations.concurrency import run_concurrently
+from socialbooster import telemetry
+
+
+@pytest.fixture
+def sampled(settings):
+    cache.clear()
+    settings.TELEMETRY_SAMPLE_RATE = 1.0
+
+
+@pytest.fixture
+def request_log(caplog):
+    logger = logging.getLogger('api.requests')
+    logger.addHandler(caplog.handler)
+    level = logger.level
+    logger.setLevel(logging.INFO)
+    yield caplog
+    logger.setLevel(level)
+    logger.removeHandler(caplog.handler)
+
+
+def _timing(response) -> dict:
+    metrics = {}
+    for metric in response['Server-Timing'].split(', '):
+        name, *params = metric.split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+@pytest.mark.django_db
+class TestRequestTelemetry:
+    """Sampled API requests report DB, cache and provider time."""
+    
+    def test_server_timing_header(self, api_client, test_brand, sampled):
+        response = api_client.get('/api/brands/')
+        
+        metrics = _timing(response)
+        assert set(metrics) == {'db', 'cache', 'total'}
+        assert metrics['db']['desc'] == '"2 queries"'
+        assert float(metrics['total']['dur']) >= float(metrics['db']['dur'])
+    
+    def test_cache_hits_and_misses(self, api_client, test_brand, sampled):
+        first = _timing(api_client.get('/api/dashboard/overview/'))
+        second = _timing(api_client.get('/api/dashboard/overview/'))
+        
+        # The overview is cached after the first request (throttles read the cache too)
+        first_hits, first_misses = first['cache']['desc'].strip('"').split(' ')[::2]
+        second_hits, second_misses = second['cache']['desc'].strip('"').split(' ')[::2]
+        assert int(second_hits) > int(first_hits)
+        assert int(second_misses) < int(first_misses)
+        assert second['db']['desc'] == '"0 queries"'
+    
+    def test_log_fields(self, api_client, test_brand, sampled, request_log):
+        api_client.get('/api/brands/')
+        
+        record = request_log.records[-1]
+        assert record.getMessage().startswith('GET /api/brands/ 200 ')
+        assert 'db=2q/' in record.getMessage()
+        assert record.telemetry['db_queries'] == 2
+        assert set(record.telemetry) >= {'duration_ms', 'db_ms', 'cache_hits', 'cache_misses', 'http_calls', 'http_ms'}
+    
+    def test_unsampled_requests(self, api_client, settings, request_log):
+        settings.TELEMETRY_SAMPLE_RATE = 0
+        
+        response = api_client.get('/api/brands/')
+        
+        assert not response.has_header('Server-Timing')
+        assert not hasattr(request_log.records[-1], 'telemetry')
+    
+    def test_provider_calls_and_worker_threads(self, transactional_db):
+        def search():
+            with CircuitBreaker('serpapi').call():
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+        
+        with telemetry.collect() as collected:
+            run_concurrently([search, search, search])
+        
+        assert collected.http['serpapi'][0] == 3
+        # SELECT 1, plus the breaker reading its shared state before and after each call
+        assert collected.db_queries == 9
+        assert 'serpapi;dur=' in collected.server_timing(10.0)
+        assert telemetry.current() is None
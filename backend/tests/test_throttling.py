@@ -0,0 +1,75 @@
+"""
+Tests for the GCRA request throttles and X-RateLimit-* headers.
+"""
+import pytest
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from rest_framework import status
+from socialbooster.throttling import BurstRateThrottle, GCRAMixin
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A frozen throttle clock the test can move forward."""
+    cache.clear()
+    now = [1_000_000.0]
+    monkeypatch.setattr(GCRAMixin, 'timer', lambda self: now[0], raising=False)
+    return now
+
+
+@pytest.mark.django_db
+class TestGCRAThrottling:
+    """Same scopes and rates as before, one float of state per client."""
+    
+    def test_burst_limit_and_headers(self, api_client, clock):
+        responses = [api_client.get('/api/brands/') for _ in range(11)]
+        
+        assert [r.status_code for r in responses[:10]] == [200] * 10
+        assert responses[0]['X-RateLimit-Limit'] == '10'
+        assert [r['X-RateLimit-Remaining'] for r in responses[:3]] == ['9', '8', '7']
+        assert responses[9]['X-RateLimit-Remaining'] == '0'
+        assert responses[9]['X-RateLimit-Reset'] == '1'
+        
+        throttled = responses[10]
+        assert throttled.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert throttled['Retry-After'] == '1'
+        assert throttled['X-RateLimit-Remaining'] == '0'
+    
+    def test_quota_returns_over_time(self, api_client, clock):
+        for _ in range(10):
+            api_client.get('/api/brands/')
+        assert api_client.get('/api/brands/').status_code == 429
+        
+        clock[0] += 0.1
+        response = api_client.get('/api/brands/')
+        assert response.status_code == 200
+        assert response['X-RateLimit-Remaining'] == '0'
+        
+        clock[0] += 1
+        assert api_client.get('/api/brands/')['X-RateLimit-Remaining'] == '9'
+    
+    def test_state_is_one_float(self, api_client, clock):
+        for _ in range(5):
+            api_client.get('/api/brands/')
+        
+        state = cache.get('throttle_gcra_burst_127.0.0.1')
+        assert state == pytest.approx(clock[0] + 0.5)
+        assert cache.get('throttle_gcra_anon_sustained_127.0.0.1') == pytest.approx(clock[0] + 5 * 36)
+    
+    def test_authenticated_scope(self, authenticated_client, clock):
+        response = authenticated_client.get('/api/brands/')
+        
+        # Burst only applies to anonymous clients; the sustained scope is reported
+        assert response['X-RateLimit-Limit'] == '1000'
+        assert response['X-RateLimit-Remaining'] == '999'
+    
+    def test_burst_rate_unchanged(self):
+        throttle = BurstRateThrottle()
+        assert (throttle.num_requests, throttle.duration) == (10, 1)
+    
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_throttling', rate='20/minute', requests=10, stdout=out)
+        assert 'gcra' in out.getvalue()
+        assert 'history' in out.getvalue()
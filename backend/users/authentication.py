@@ -0,0 +1,114 @@
+"""
+JWT authentication with a short-lived, per-process user cache.
+
+simplejwt's JWTAuthentication loads the token's user from the database on
+every authenticated request, one extra round trip per write on a remote
+database. CachedJWTAuthentication validates the token exactly as before
+and keeps the resolved user for USER_CACHE_TTL_SECONDS. A user's entry is
+dropped as soon as this process saves or deletes them, so deactivation
+and password changes take effect at once here; other processes catch up
+when their entry expires.
+
+Strict requests skip the cache and check the database every time:
+staff and superusers, and views or viewset actions listed in their
+`strict_authentication` attribute.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class UserCache:
+    """Thread-safe LRU of user objects by id, each kept for a fixed TTL."""
+    
+    def __init__(self):
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, user_id):
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._users[user_id]
+                return None
+            self._users.move_to_end(user_id)
+        # Each request gets its own instance, so views can't change another's user
+        return copy.copy(user)
+    
+    def put(self, user_id, user):
+        with self._lock:
+            self._users[user_id] = (copy.copy(user), time.monotonic() + settings.USER_CACHE_TTL_SECONDS)
+            self._users.move_to_end(user_id)
+            while len(self._users) > settings.USER_CACHE_MAX_ENTRIES:
+                self._users.popitem(last=False)
+    
+    def evict(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+    
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+user_cache = UserCache()
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def _evict_user(sender, instance, **kwargs):
+    # Covers deactivation and password changes; queryset.update() bypasses
+    # signals and is only picked up when the entry expires
+    user_cache.evict(str(getattr(instance, api_settings.USER_ID_FIELD)))
+
+
+def _is_strict(request) -> bool:
+    view = (getattr(request, 'parser_context', None) or {}).get('view')
+    strict = getattr(view, 'strict_authentication', False)
+    if isinstance(strict, (list, tuple, set, frozenset)):
+        return getattr(view, 'action', None) in strict
+    return bool(strict)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that reuses recently loaded users (see module docstring)."""
+    
+    def authenticate(self, request):
+        self.strict = _is_strict(request)
+        return super().authenticate(request)
+    
+    def get_user(self, validated_token):
+        if settings.USER_CACHE_TTL_SECONDS <= 0:
+            return super().get_user(validated_token)
+        try:
+            user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+        
+        user = None if self.strict else user_cache.get(user_id)
+        if user is None or user.is_staff or user.is_superuser:
+            # Loads and checks the user (active, password unchanged) from the database
+            user = super().get_user(validated_token)
+            user_cache.put(user_id, user)
+            return user
+        
+        # The checks simplejwt makes after its query, on the cached user
+        if not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)
+        ):
+            raise AuthenticationFailed("The user's password has been changed.", code='password_changed')
+        return user
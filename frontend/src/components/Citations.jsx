@@ -1,8 +1,11 @@
 import { useState, useEffect } from 'react';
 import { Pie, Bar, Line } from 'react-chartjs-2';
-import { citationsAPI } from '../services/api';
+import { batchAPI, citationsAPI } from '../services/api';
 import GlassSurface from './effects/GlassSurface';
 
+// Columns the citations table shows; skips the long citation_context text
+const TABLE_FIELDS = 'id,brand_name,ai_model_display,query,mentioned,date';
+
 function Citations() {
     const [citations, setCitations] = useState([]);
     const [breakdown, setBreakdown] = useState(null);
@@ -24,10 +27,10 @@ function Citations() {
     const fetchData = async () => {
         try {
             setLoading(true);
-            const [citationsRes, breakdownRes, summaryRes] = await Promise.all([
-                citationsAPI.getAll(filter),
-                citationsAPI.getBreakdown(),
-                citationsAPI.getSummary(),
+            const [citationsRes, breakdownRes, summaryRes] = await batchAPI.getAll([
+                { path: '/citations/', params: { ...filter, fields: TABLE_FIELDS } },
+                { path: '/citations/breakdown/' },
+                { path: '/citations/summary/' },
             ]);
             setCitations(citationsRes.data.results || citationsRes.data);
             setBreakdown(breakdownRes.data);
@@ -1,8 +1,11 @@
 import { useState, useEffect } from 'react';
 import { Line } from 'react-chartjs-2';
-import { rankingsAPI, brandsAPI } from '../services/api';
+import { rankingsAPI, batchAPI } from '../services/api';
 import GlassSurface from './effects/GlassSurface';
 
+// Columns the rankings table shows
+const TABLE_FIELDS = 'id,brand_name,keyword,position,date';
+
 function Rankings() {
     const [rankings, setRankings] = useState([]);
     const [brands, setBrands] = useState([]);
@@ -24,10 +27,10 @@ function Rankings() {
     const fetchInitialData = async () => {
         try {
             setLoading(true);
-            const [rankingsRes, brandsRes, summaryRes] = await Promise.all([
-                rankingsAPI.getAll(),
-                brandsAPI.getAll(),
-                rankingsAPI.getSummary(),
+            const [rankingsRes, brandsRes, summaryRes] = await batchAPI.getAll([
+                { path: '/rankings/', params: { fields: TABLE_FIELDS } },
+                { path: '/brands/' },
+                { path: '/rankings/summary/' },
             ]);
             setRankings(rankingsRes.data.results || rankingsRes.data);
             setBrands(brandsRes.data.results || brandsRes.data);
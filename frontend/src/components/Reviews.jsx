@@ -1,8 +1,11 @@
 import { useState, useEffect } from 'react';
 import { Bar } from 'react-chartjs-2';
-import { reviewsAPI } from '../services/api';
+import { batchAPI } from '../services/api';
 import GlassSurface from './effects/GlassSurface';
 
+// Columns the reviews table shows
+const TABLE_FIELDS = 'id,brand_name,platform_display,rating,review_count,date';
+
 function Reviews() {
     const [reviews, setReviews] = useState([]);
     const [summary, setSummary] = useState(null);
@@ -16,9 +19,9 @@ function Reviews() {
     const fetchData = async () => {
         try {
             setLoading(true);
-            const [reviewsRes, summaryRes] = await Promise.all([
-                reviewsAPI.getAll(filter),
-                reviewsAPI.getSummary(),
+            const [reviewsRes, summaryRes] = await batchAPI.getAll([
+                { path: '/reviews/', params: { ...filter, fields: TABLE_FIELDS } },
+                { path: '/reviews/summary/' },
             ]);
             setReviews(reviewsRes.data.results || reviewsRes.data);
             setSummary(summaryRes.data);
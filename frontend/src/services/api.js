@@ -134,6 +134,24 @@ export const reviewsAPI = {
     create: (data) => api.post('/reviews/', data),
 };
 
+// =============================================================================
+// Batch API - several GETs in one round trip
+// =============================================================================
+export const batchAPI = {
+    // [{ path: '/citations/', params }] -> [{ data }], in order, like Promise.all of api.get calls
+    getAll: async (requests) => {
+        const response = await api.post('/batch/', {
+            requests: requests.map(({ path, params }) => ({ path: `${API_BASE_URL}${path}`, params })),
+        });
+        return response.data.responses.map((result, index) => {
+            if (result.status >= 400) {
+                throw new Error(`${requests[index].path} failed with status ${result.status}`);
+            }
+            return { data: result.body };
+        });
+    },
+};
+
 // =============================================================================
 // Dashboard API
 // =============================================================================